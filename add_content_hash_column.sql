@@ -0,0 +1,12 @@
+-- Add content_hash column to email_draft_cache in Supabase
+-- Lets draft migrations skip rows that are already up to date
+-- Run this in the Supabase SQL Editor
+
+ALTER TABLE email_draft_cache
+ADD COLUMN IF NOT EXISTS content_hash TEXT;
+
+-- Verify the column was added
+SELECT column_name, data_type, is_nullable
+FROM information_schema.columns
+WHERE table_name = 'email_draft_cache'
+AND column_name = 'content_hash';
@@ -12,7 +12,7 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database
 from utils.ai_analysis_cache import AIAnalysisCache
 from utils.human_review_cache import HumanReviewCache
 from utils.email_cache import EmailCache
@@ -36,7 +36,7 @@ st.set_page_config(
 
 class CreatorReviewApp:
     def __init__(self):
-        self.content_db = ContentDatabase()
+        self.content_db = open_content_database()
         self.ai_cache = AIAnalysisCache()
         self.human_cache = HumanReviewCache()
         self.email_cache = EmailCache()
@@ -75,6 +75,7 @@ Bio: {profile.get('bio', 'N/A')}
 Recent Posts Summary:
 """
         
+        url_prefix = f"https://www.tiktok.com/@{username}/video/"
         for i, post in enumerate(posts, 1):
             # Filter out None values from tags and ensure they're strings
             raw_tags = post.get('tags', []) or []
@@ -83,7 +84,7 @@ Recent Posts Summary:
             
             # Create TikTok URL for the post
             post_id = post.get('id', '')
-            post_url = f"https://www.tiktok.com/@{username}/video/{post_id}" if post_id else "URL not available"
+            post_url = f"{url_prefix}{post_id}" if post_id else "URL not available"
             
             desc = (post.get('desc', '') or '')[:80]
             summary += f"{i}. {desc}..."
@@ -389,8 +390,7 @@ def main():
     with tab1:
         # Get creators from database
         try:
-            with open("cache/creators_content_database.json", 'r') as f:
-                database = json.load(f)
+            database = app.content_db.load_database()
             creators_data = database.get('creators', {})
             creator_count = len(creators_data)
         except:
@@ -3,7 +3,6 @@ Email Outreach Module for Creator Review App - Redesigned Layout
 Handles bulk email draft generation and sending with expandable views
 """
 import streamlit as st
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
@@ -19,12 +18,12 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.email_tracking_integration import EmailTrackingManager
+from utils.smtp_pool import SMTPPool
 from email_scheduling_ui import render_scheduling_section
 
 # Try to import Supabase cache first, fallback to file cache
 try:
-    from utils.supabase_email_draft_cache import SupabaseEmailDraftCache
-    from supabase import create_client
+    from utils.supabase_singleton import get_supabase_cache, get_supabase_client
     SUPABASE_AVAILABLE = True
 except ImportError:
     SUPABASE_AVAILABLE = False
@@ -33,6 +32,21 @@ from utils.email_draft_cache import EmailDraftCache
 
 load_dotenv()
 
+# HTML version of a tracked email: plain-text body with newlines as <br>, then the pixel
+_HTML_TEMPLATE = "<html>\n<body>\n{body}\n<br>\n{pixel}\n</body>\n</html>\n"
+_NEWLINE_TO_BR = str.maketrans({'\n': '<br>'})
+
+# One tracking manager (and its HTTP session) for every email this process sends
+_tracker = None
+
+
+def _get_tracker():
+    """Shared EmailTrackingManager, created on first use"""
+    global _tracker
+    if _tracker is None:
+        _tracker = EmailTrackingManager()
+    return _tracker
+
 
 class EmailOutreachManager:
     def __init__(self):
@@ -80,11 +94,11 @@ class EmailOutreachManager:
                         self.debug_info['secrets_error'] = str(e)
                 
                 if supabase_url and supabase_key:
-                    self.draft_cache = SupabaseEmailDraftCache()
+                    self.draft_cache = get_supabase_cache()
                     self.use_supabase = True
                     self.cache_status = "supabase"
                     # Initialize Supabase client for sent email tracking
-                    self.supabase = create_client(supabase_url, supabase_key)
+                    self.supabase = get_supabase_client(supabase_url, supabase_key)
                     print("✅ Using Supabase email draft cache (persistent)")
                 else:
                     self.draft_cache = EmailDraftCache()
@@ -305,8 +319,8 @@ Do not include any other text or explanation - just the single sentence.
         
         return personalization
     
-    def send_email(self, to_email, subject, body, from_email=None, from_password=None, attachment_path=None, username=None, campaign=None):
-        """Send email using SMTP with optional attachment and tracking"""
+    def send_email(self, to_email, subject, body, from_email=None, from_password=None, attachment_path=None, username=None, campaign=None, smtp_pool=None):
+        """Send email using SMTP with optional attachment and tracking (reuses smtp_pool's connection if given)"""
         if not from_email:
             from_email = os.getenv('SMTP_EMAIL')
         if not from_password:
@@ -322,18 +336,10 @@ Do not include any other text or explanation - just the single sentence.
         # Add tracking pixel if username and campaign provided
         tracking_id = None
         if username and campaign:
-            tracker = EmailTrackingManager()
+            tracker = _get_tracker()
             pixel_html, tracking_id = tracker.get_tracking_pixel_html(username, campaign, recipient_email=to_email)
             # Convert body to HTML and add tracking pixel
-            html_body = f"""
-            <html>
-            <body>
-            {body.replace(chr(10), '<br>')}
-            <br>
-            {pixel_html}
-            </body>
-            </html>
-            """
+            html_body = _HTML_TEMPLATE.format(body=body.translate(_NEWLINE_TO_BR), pixel=pixel_html)
         else:
             html_body = None
         
@@ -363,15 +369,13 @@ Do not include any other text or explanation - just the single sentence.
                     )
                     message.attach(part)
             
-            # SMTP setup (works for Zoho, Gmail, etc.)
-            server = smtplib.SMTP(smtp_host, smtp_port)
-            server.starttls()
-            server.login(from_email, from_password)
-            
-            # Send email
+            # Send email (one-off connection unless the caller shares a pool)
             text = message.as_string()
-            server.sendmail(from_email, to_email, text)
-            server.quit()
+            if smtp_pool is not None:
+                smtp_pool.send(from_email, to_email, text)
+            else:
+                with SMTPPool(smtp_host, smtp_port, from_email, from_password) as pool:
+                    pool.send(from_email, to_email, text)
             
             # Mark as sent and record in database
             if username and campaign:
@@ -582,20 +586,20 @@ def render_email_outreach_section(app, current_campaign=None):
     
     # Check if drafts already exist in session state or persistent cache
     if f"email_drafts_{current_campaign}" not in st.session_state:
-        # Check if we have cached drafts for all creators
-        cached_drafts_available = 0
-        
-        
-        for username, creator_data in creators_with_emails:
-            has_cached = email_manager.draft_cache.has_draft(username, current_campaign or "default")
-            if has_cached:
-                cached_drafts_available += 1
-        
+        # Check if we have cached drafts for all creators (one bulk lookup, not one per creator)
+        unique_usernames = {username for username, creator_data in creators_with_emails}
+        cached_drafts = email_manager.draft_cache.get_drafts(list(unique_usernames), current_campaign or "default")
+        cached_drafts_available = len(unique_usernames & cached_drafts.keys()) if cached_drafts is not None else 0
         
         # Auto-load cached drafts if all are available, otherwise show generate button
-        missing_drafts = len(creators_with_emails) - cached_drafts_available
+        missing_drafts = len(unique_usernames) - cached_drafts_available
         
-        if missing_drafts == 0 and cached_drafts_available > 0:
+        if cached_drafts is None:
+            # Don't treat an unreachable cache as "nothing cached" - that would regenerate (and pay for) every draft
+            st.warning("⚠️ Couldn't check the draft cache - cached drafts may exist. Retry before generating.")
+            if st.button("🔄 Retry cache check"):
+                st.rerun()
+        elif missing_drafts == 0 and cached_drafts_available > 0:
             # Auto-load all cached drafts
             with st.spinner(f"Loading {cached_drafts_available} cached email drafts..."):
                 all_drafts = []
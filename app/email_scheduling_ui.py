@@ -6,10 +6,12 @@ import streamlit as st
 from datetime import datetime, timedelta, time
 import sys
 import os
+import threading
 from zoneinfo import ZoneInfo
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.smtp_pool import SMTPPool
 try:
     from utils.zoho_native_scheduler import ZohoNativeScheduler as EmailScheduler
 except ImportError:
@@ -17,7 +19,10 @@ except ImportError:
     try:
         from utils.supabase_scheduler import SupabaseEmailScheduler as EmailScheduler
     except ImportError:
-        from utils.email_scheduler import EmailScheduler
+        from utils.sqlite_scheduler import SQLiteEmailScheduler as EmailScheduler
+
+# Due emails sent in parallel by the background scheduler (each worker keeps its own SMTP connection)
+SEND_WORKERS = 2
 
 
 def render_scheduling_section(email_manager, drafts, current_campaign, attachment_path=None, app=None, brand_name="Wonder", your_name="Olivia"):
@@ -632,18 +637,28 @@ Test Timezone: {selected_tz_name}
 # Function to start the scheduler (call from main app)
 def start_email_scheduler(email_manager):
     """Start the background email scheduler"""
+    # Same store render_scheduling_section schedules into, so the loop sees those emails
     scheduler = EmailScheduler()
+    if not hasattr(scheduler, 'start_background_scheduler'):
+        # e.g. Zoho sends its scheduled emails server-side - there is no local queue to drain
+        print(f"📅 {type(scheduler).__name__} has no local send loop - nothing to start")
+        return scheduler
+    # One SMTP connection per send worker instead of a login per email
+    smtp_pools = threading.local()
     
     def send_email_callback(to_email, subject, body, username=None, campaign=None, attachment_path=None):
         """Callback function for scheduler to send emails"""
+        if not hasattr(smtp_pools, 'pool'):
+            smtp_pools.pool = SMTPPool()
         return email_manager.send_email(
             to_email=to_email,
             subject=subject,
             body=body,
             attachment_path=attachment_path,
             username=username,
-            campaign=campaign
+            campaign=campaign,
+            smtp_pool=smtp_pools.pool
         )
     
-    scheduler.start_background_scheduler(send_email_callback)
+    scheduler.start_background_scheduler(send_email_callback, max_workers=SEND_WORKERS)
     return scheduler
\ No newline at end of file
@@ -17,8 +17,10 @@ def render_reply_management_section(app, current_campaign=None):
     """Render the reply management section in Streamlit"""
     st.header("💬 Reply Management")
     
-    # Initialize reply manager
-    reply_manager = ZohoReplyManager()
+    # Initialize reply manager once per session so its SMTP connection survives reruns
+    if 'reply_manager' not in st.session_state:
+        st.session_state.reply_manager = ZohoReplyManager()
+    reply_manager = st.session_state.reply_manager
     
     # Check if email credentials are configured
     if not os.getenv('SMTP_EMAIL') or not os.getenv('SMTP_PASSWORD'):
@@ -5,22 +5,22 @@ Only focuses on top_posts_data - no shoppable filtering or complex processing
 """
 import pandas as pd
 import csv
-import json
 import os
-import subprocess
 import time
 from datetime import datetime
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database
+from clients.creator_data_client import CreatorDataClient
 
 
 class ContentBackfiller:
     def __init__(self, tikapi_key, brightdata_token):
         self.tikapi_key = tikapi_key
         self.brightdata_token = brightdata_token
-        self.content_db = ContentDatabase()
+        self.content_db = open_content_database()
+        self.client = CreatorDataClient(tikapi_key, brightdata_token)
         self.processed_count = 0
         self.failed_count = 0
         self.skipped_count = 0
@@ -59,70 +59,19 @@ class ContentBackfiller:
         
         return list(all_creators)
     
-    def extract_content_brightdata(self, username):
-        """Extract content data using Bright Data MCP"""
-        try:
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "web_data_tiktok_profiles",
-                    "arguments": {"url": f"https://www.tiktok.com/@{username}"}
-                }
-            }
-            request_json = json.dumps(request)
-            cmd = f'echo {repr(request_json)} | API_TOKEN={self.brightdata_token} PRO_MODE=true npx @brightdata/mcp'
-            
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=180  # 3 minutes timeout
-            )
-            
-            if result.returncode != 0:
-                return None, f"MCP failed: {result.stderr[:100]}"
-            
-            # Parse response
-            lines = result.stdout.strip().split('\n')
-            for line in lines:
-                if not line.strip():
-                    continue
-                    
-                try:
-                    parsed = json.loads(line)
-                    
-                    if parsed.get('method') == 'notifications/progress':
-                        continue
-                    
-                    if 'result' in parsed and 'content' in parsed['result']:
-                        content = parsed['result']['content'][0]['text']
-                        
-                        # Handle building status
-                        try:
-                            status_check = json.loads(content)
-                            if isinstance(status_check, dict) and status_check.get('status') == 'building':
-                                return None, f"Building snapshot: {status_check.get('message', 'try again later')}"
-                        except:
-                            pass
-                        
-                        profiles = json.loads(content)
-                        if isinstance(profiles, list) and len(profiles) > 0:
-                            profile_data = profiles[0]
-                            top_posts_data = profile_data.get('top_posts_data', [])
-                            return (profile_data, top_posts_data), None
-                            
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
-            
-            return None, "Could not parse MCP response"
-            
-        except subprocess.TimeoutExpired:
-            return None, "MCP timeout (3 minutes)"
-        except Exception as e:
-            return None, f"MCP error: {str(e)}"
+    def extract_content_brightdata(self, username, use_cache=True, refresh=False):
+        """Extract content data using Bright Data (shared CreatorDataClient fetch + parse)"""
+        result = self.client._get_brightdata_analysis(username, cache=use_cache, refresh=refresh)
+        if not result['success']:
+            return None, result.get('error', 'Unknown Bright Data error')
+        
+        profile_data = result.get('brightdata_profile')
+        if profile_data is None:
+            if use_cache and not refresh:
+                # Cached before raw profile fields were kept - fetch fresh
+                return self.extract_content_brightdata(username, refresh=True)
+            return None, "Bright Data result has no profile data"
+        return (profile_data, result.get('top_posts_data', [])), None
     
     def extract_content_tikapi(self, username):
         """Fallback to TikAPI - but we can't get top_posts_data from TikAPI"""
@@ -180,7 +129,7 @@ class ContentBackfiller:
         print(f"\n📊 Total unique creators to process: {len(all_creators)}")
         
         # Get database stats before starting
-        initial_stats = self.content_db.get_stats()
+        initial_stats = self.content_db.get_stats_cached()
         print(f"📁 Current database: {initial_stats['creator_count']} creators")
         
         print(f"\n🔄 Processing creators...")
@@ -217,7 +166,7 @@ class ContentBackfiller:
         print(f"❌ Failed: {self.failed_count}")
         
         # Final database stats
-        final_stats = self.content_db.get_stats()
+        final_stats = self.content_db.get_stats_cached()
         print(f"📁 Final database: {final_stats['creator_count']} creators, {final_stats['total_posts']} posts")
 
 
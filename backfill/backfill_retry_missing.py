@@ -6,21 +6,102 @@ and retries processing them with better error handling and logging.
 import pandas as pd
 import json
 import os
+import pickle
 import time
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 import logging
 import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from backfill.backfill_content_data import ContentBackfiller
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database
+
+# PyArrow lets us decode just the username column instead of the whole CSV
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Sidecar cache of usernames per input CSV, keyed by filename and invalidated on mtime/size change
+CSV_USERNAME_CACHE = "cache/_csv_usernames.pkl"
+
+
+def _load_csv_username_cache(cache_path=CSV_USERNAME_CACHE):
+    """Load the per-CSV username cache (empty dict if missing or unreadable)"""
+    if not os.path.exists(cache_path):
+        return {}
+    try:
+        with open(cache_path, 'rb') as f:
+            return pickle.load(f)
+    except Exception:
+        return {}
+
+
+def _save_csv_username_cache(cache, cache_path=CSV_USERNAME_CACHE):
+    """Atomically write the per-CSV username cache"""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = f"{cache_path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def _usernames_from_csv(csv_path, header_hint=None):
+    """
+    Read only the username column of a CSV. Returns (columns, username_col, usernames)
+    
+    header_hint is a previously cached (columns, username_col); when the header is unchanged
+    the username column is reused instead of being re-derived from the column names.
+    """
+    if PYARROW_AVAILABLE:
+        reader = pa_csv.open_csv(csv_path, read_options=pa_csv.ReadOptions(block_size=1 << 20))
+        columns = tuple(reader.schema.names)
+        del reader
+    else:
+        columns = tuple(pd.read_csv(csv_path, nrows=0).columns)
+    
+    if header_hint and header_hint[0] == columns:
+        username_col = header_hint[1]
+    else:
+        username_col = next((col for col in columns if 'username' in col.lower()), None)
+    if not username_col:
+        return columns, None, frozenset()
+    
+    if PYARROW_AVAILABLE:
+        table = pa_csv.read_csv(
+            csv_path,
+            convert_options=pa_csv.ConvertOptions(
+                include_columns=[username_col],
+                column_types={username_col: pa.string()},
+                strings_can_be_null=True
+            )
+        )
+        # Null-drop and de-duplicate inside Arrow; only distinct usernames become Python objects
+        unique_usernames = pc.unique(pc.drop_null(table.column(0)))
+        return columns, username_col, frozenset(unique_usernames.to_pylist())
+    
+    df = pd.read_csv(csv_path, usecols=[username_col], dtype=str, engine='c')
+    return columns, username_col, frozenset(df[username_col].dropna().unique())
+
+
+def _scan_csv(csv_path, header_hint=None):
+    """Process-pool worker: returns (columns, username_col, usernames, error) without raising"""
+    try:
+        columns, username_col, usernames = _usernames_from_csv(csv_path, header_hint)
+        return columns, username_col, usernames, None
+    except Exception as e:
+        return None, None, frozenset(), str(e)
 
 
 class MissingCreatorBackfiller:
     def __init__(self, tikapi_key, brightdata_token):
         self.tikapi_key = tikapi_key
         self.brightdata_token = brightdata_token
-        self.content_db = ContentDatabase()
+        self.content_db = open_content_database()
         self.backfiller = ContentBackfiller(tikapi_key, brightdata_token)
         
         # Setup logging
@@ -78,18 +159,63 @@ class MissingCreatorBackfiller:
         all_creators = set()
         input_dir = "data/inputs/"
         
-        for filename in os.listdir(input_dir):
-            if filename.endswith('.csv'):
-                csv_path = os.path.join(input_dir, filename)
-                try:
-                    df = pd.read_csv(csv_path)
-                    username_cols = [col for col in df.columns if 'username' in col.lower()]
-                    if username_cols:
-                        usernames = df[username_cols[0]].dropna().unique()
-                        all_creators.update(usernames)
-                        self.logger.info(f"📁 {filename}: {len(usernames)} creators")
-                except Exception as e:
-                    self.logger.error(f"Error reading {filename}: {e}")
+        # Unchanged files are served from the sidecar cache without touching pandas
+        cache = _load_csv_username_cache()
+        cache_dirty = False
+        seen_files = set()
+        stale_files = []
+        
+        for entry in os.scandir(input_dir):
+            if not entry.name.endswith('.csv'):
+                continue
+            seen_files.add(entry.name)
+            stat = entry.stat()
+            cached = cache.get(entry.name)
+            if not (cached and cached['mtime'] == stat.st_mtime_ns and cached['size'] == stat.st_size):
+                # Changed file: keep its last known header so the username column can be reused
+                header_hint = (cached['columns'], cached['username_col']) if cached and cached.get('columns') else None
+                stale_files.append((entry.name, entry.path, stat, header_hint))
+        
+        # Parse changed files in parallel - each CSV is independent
+        paths = [path for _, path, _, _ in stale_files]
+        hints = [hint for _, _, _, hint in stale_files]
+        if len(stale_files) > 1:
+            with ProcessPoolExecutor(max_workers=min(8, os.cpu_count() or 1)) as executor:
+                results = list(executor.map(_scan_csv, paths, hints, chunksize=4))
+        else:
+            results = [_scan_csv(path, hint) for path, hint in zip(paths, hints)]
+        
+        for (filename, _, stat, _), (columns, username_col, usernames, error) in zip(stale_files, results):
+            if error:
+                self.logger.error(f"Error reading {filename}: {error}")
+                cache.pop(filename, None)
+                cache_dirty = True
+                continue
+            cache[filename] = {
+                'mtime': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'columns': columns,
+                'username_col': username_col,
+                'usernames': usernames
+            }
+            cache_dirty = True
+        
+        for filename in sorted(seen_files):
+            cached = cache.get(filename)
+            if cached and cached['username_col']:
+                all_creators.update(cached['usernames'])
+                self.logger.info(f"📁 {filename}: {len(cached['usernames'])} creators")
+        
+        # Forget files that were removed from the input directory
+        for filename in set(cache) - seen_files:
+            del cache[filename]
+            cache_dirty = True
+        
+        if cache_dirty:
+            try:
+                _save_csv_username_cache(cache)
+            except Exception as e:
+                self.logger.warning(f"Could not save {CSV_USERNAME_CACHE}: {e}")
         
         return all_creators
     
@@ -109,7 +235,8 @@ class MissingCreatorBackfiller:
             while retry_count < self.max_retries and not success:
                 try:
                     # Try to extract content
-                    data, error = self.backfiller.extract_content_brightdata(username)
+                    # Retries skip cached results but still resume a snapshot that was left building
+                    data, error = self.backfiller.extract_content_brightdata(username, refresh=(retry_count > 0))
                     
                     if data is not None:
                         # Save to database
@@ -127,7 +254,7 @@ class MissingCreatorBackfiller:
                         self.logger.warning(f"   ❌ Attempt {retry_count + 1} failed: {error}")
                         
                         # Check if error is retryable
-                        if "Building snapshot" in error:
+                        if "building snapshot" in error.lower():
                             self.logger.info("   ⏳ Waiting 15s for snapshot to build...")
                             time.sleep(15)  # Reduced from 30s
                         elif "timeout" in error.lower():
@@ -230,7 +357,7 @@ class MissingCreatorBackfiller:
         self.save_failed_creators_report()
         
         # Check database stats
-        stats = self.content_db.get_stats()
+        stats = self.content_db.get_stats_cached()
         self.logger.info(f"\n📊 Database now contains:")
         self.logger.info(f"   Creators: {stats['creator_count']}")
         self.logger.info(f"   Total posts: {stats['total_posts']}")
@@ -124,7 +124,7 @@ class MissingCreatorBackfiller:
                         self.logger.warning(f"   ❌ Attempt {retry_count + 1} failed: {error}")
                         
                         # Check if error is retryable
-                        if "Building snapshot" in error:
+                        if "building snapshot" in error.lower():
                             self.logger.info("   ⏳ Waiting 30s for snapshot to build...")
                             time.sleep(30)
                         elif "timeout" in error.lower():
@@ -1,27 +1,295 @@
 """
-Hybrid Creator Data Client - TikAPI + Bright Data MCP Fallback
+Hybrid Creator Data Client - TikAPI + Bright Data Fallback
 Provides unified interface for fetching creator data with automatic fallback
+Bright Data is reached through its datasets API directly (or one long-lived MCP server with BRIGHTDATA_TRANSPORT=mcp)
 Now saves content data (captions, hashtags) to creators_content_database.json
 """
+import asyncio
+import atexit
+import collections
+import hashlib
+import itertools
+import re
 import subprocess
-import json
+import tempfile
+import threading
 import time
 import sys
 import os
-from datetime import datetime
+from concurrent import futures
+from datetime import datetime, timedelta, timezone
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from .tikapi_client import TikAPIClient
 
 # Add utils to path for content database
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.content_database import ContentDatabase
+from utils import fast_json
+from utils.circuit_breaker import CircuitBreaker, backoff_delay
+
+# Module-level alias skips the attribute lookup in the MCP line-scan loop
+_json_loads = fast_json.loads
+
+try:
+    from dateutil.parser import parser as _DateutilParser
+    # One parser instance for the whole process instead of a lookup/construction per post
+    _DT_PARSE = _DateutilParser().parse
+except ImportError:
+    _DT_PARSE = None
+
+# Month lookup for Bright Data create_date, e.g. "Tue Aug 19 2025 14:13:00 GMT+0000 (Coordinated Universal Time)"
+_MONTHS = {
+    'Jan': 1, 'Feb': 2, 'Mar': 3, 'Apr': 4, 'May': 5, 'Jun': 6,
+    'Jul': 7, 'Aug': 8, 'Sep': 9, 'Oct': 10, 'Nov': 11, 'Dec': 12
+}
+# Parsed "+0000"-style offsets, shared across posts
+_BD_OFFSETS = {'+0000': timezone.utc}
+POST_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# On-disk cache of Bright Data MCP results keyed by (username, post_count)
+BRIGHTDATA_CACHE_DIR = "cache/brightdata"
+BRIGHTDATA_CACHE_TTL = 24 * 60 * 60  # 24 hours for successful results
+BRIGHTDATA_BUILDING_TTL = 5 * 60  # 5 minutes for "building snapshot" responses
+BRIGHTDATA_SNAPSHOT_TTL = 24 * 60 * 60  # how long a still-building snapshot_id is resumed instead of re-triggered
+
+BRIGHTDATA_PARSE_ERROR = "Could not parse Bright Data MCP response"
+BRIGHTDATA_MAX_LINE = 64 * 1024 * 1024  # asyncio stream limit - MCP result frames can be several MB
+
+# Bright Data datasets API (what the MCP web_data_tiktok_profiles tool wraps)
+BRIGHTDATA_API_BASE = "https://api.brightdata.com/datasets/v3"
+BRIGHTDATA_TIKTOK_PROFILES_DATASET = "gd_l1villgoiiidt09ci"
+BRIGHTDATA_TIMEOUT = 180  # seconds to wait for a snapshot/MCP call until enough latencies are tracked
+# Adaptive timeout: 1.5x the p95 of recent successful calls, clamped, recomputed every N samples
+BRIGHTDATA_TIMEOUT_MIN = 15
+BRIGHTDATA_TIMEOUT_MAX = 120
+BRIGHTDATA_LATENCY_WINDOW = 200
+BRIGHTDATA_TIMEOUT_RECALC_EVERY = 50
+BRIGHTDATA_POLL_INTERVAL = 2  # seconds between snapshot polls
+
+# The only raw Bright Data fields anything downstream reads (ContentDatabase, backfills) - the rest
+# of the record (music, author blobs, per-post media URLs...) is dropped before results are cached
+BRIGHTDATA_PROFILE_FIELDS = (
+    'account_id', 'nickname', 'biography', 'followers', 'following', 'videos_count',
+    'is_verified', 'secu_id', 'predicted_lang', 'is_commerce_user'
+)
+BRIGHTDATA_TOP_POST_FIELDS = (
+    'post_id', 'post_url', 'description', 'hashtags', 'create_time', 'likes', 'post_type'
+)
+
+# Provider failures that mean "upstream is unhealthy" (vs. a bad username) - these count toward the breaker
+_PROVIDER_DOWN_RE = re.compile(r'time(?:d )?out|connection|rate limit|\b(?:429|5\d\d)\b', re.IGNORECASE)
+# Fast transient errors are retried with jittered backoff; results flagged timed_out are not.
+# The Bright Data datasets API is retried by its HTTP adapter instead, so it gets a single attempt here
+PROVIDER_MAX_ATTEMPTS = 3
+
+
+def _parse_loose_date(date_str):
+    """Parse an arbitrary date string (ISO fast path, then dateutil). Returns (create_time, formatted_date)"""
+    if not date_str:
+        return 0, 'Unknown'
+    try:
+        # top_posts_data create_time is ISO 8601 ("2025-08-19T14:13:00.000Z") - no dateutil needed
+        dt = datetime.fromisoformat(date_str)
+        return int(dt.timestamp()), dt.strftime(POST_DATE_FORMAT)
+    except (TypeError, ValueError):
+        pass
+    if _DT_PARSE is not None:
+        try:
+            dt = _DT_PARSE(date_str)
+            return int(dt.timestamp()), dt.strftime(POST_DATE_FORMAT)
+        except (ValueError, OverflowError):
+            pass
+    return 0, 'Unknown'
+
+
+def _parse_bd_date(date_str):
+    """Parse a Bright Data create_date. Returns (create_time, formatted_date)"""
+    if not date_str:
+        return 0, 'Unknown'
+    # Fixed JS Date.toString() layout - fixed offsets, no split/strptime:
+    # "Tue Aug 19 2025 14:13:00 GMT+0000 (Coordinated Universal Time)"
+    #  0   4   8  11   16 19 22 24  28
+    if date_str[24:28] == ' GMT':
+        try:
+            offset = _BD_OFFSETS.get(date_str[28:33])
+            if offset is None:
+                sign = -1 if date_str[28] == '-' else 1
+                offset = timezone(sign * timedelta(hours=int(date_str[29:31]), minutes=int(date_str[31:33])))
+                _BD_OFFSETS[date_str[28:33]] = offset
+            dt = datetime(
+                int(date_str[11:15]), _MONTHS[date_str[4:7]], int(date_str[8:10]),
+                int(date_str[16:18]), int(date_str[19:21]), int(date_str[22:24]),
+                tzinfo=offset
+            )
+            return int(dt.timestamp()), f"{date_str[11:15]}-{dt.month:02d}-{date_str[8:10]} {date_str[16:24]}"
+        except (KeyError, ValueError):
+            pass
+    return _parse_loose_date(date_str)
+
+
+class _TTLCache:
+    """Small thread-safe LRU cache whose entries expire ttl seconds after being stored"""
+    def __init__(self, maxsize=5000, ttl=3600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = collections.OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return entry[1]
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class _MCPSession:
+    """
+    One long-lived `npx @brightdata/mcp` process shared by every MCP call
+    
+    Requests are written as JSON-RPC frames on stdin; a reader thread hands each
+    response to the Future waiting on its id, so calls can overlap freely.
+    """
+    def __init__(self, env):
+        self.proc = subprocess.Popen(
+            ['npx', '@brightdata/mcp'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env
+        )
+        self._ids = itertools.count(1)
+        self._pending = {}  # JSON-RPC id -> Future
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._reader = threading.Thread(target=self._read_loop, name="brightdata-mcp-reader", daemon=True)
+        self._reader.start()
+        atexit.register(self.close)
+    
+    def alive(self):
+        return self.proc.poll() is None
+    
+    def call(self, request):
+        """Send a JSON-RPC request; returns a Future resolved with the raw response frame"""
+        request_id = next(self._ids)
+        future = futures.Future()
+        future.request_id = request_id
+        with self._pending_lock:
+            self._pending[request_id] = future
+        
+        frame = fast_json.dumps_bytes({**request, 'id': request_id}) + b'\n'
+        try:
+            with self._write_lock:
+                self.proc.stdin.write(frame)
+                self.proc.stdin.flush()
+        except OSError as e:
+            self.forget(future)
+            future.set_exception(RuntimeError(f"Bright Data MCP process is not accepting requests: {e}"))
+        return future
+    
+    def forget(self, future):
+        """Stop waiting for a request (e.g. after a timeout) so a late response is dropped"""
+        with self._pending_lock:
+            self._pending.pop(future.request_id, None)
+    
+    def _read_loop(self):
+        for line in self.proc.stdout:
+            # Progress notifications carry no top-level id - skip them without decoding
+            if b'"notifications/progress"' in line or b'"id"' not in line:
+                continue
+            try:
+                frame = _json_loads(line)
+            except fast_json.JSONDecodeError:
+                continue
+            if not isinstance(frame, dict):
+                continue
+            with self._pending_lock:
+                future = self._pending.pop(frame.get('id'), None)
+            if future is not None and not future.done():
+                future.set_result(frame)
+        
+        # stdout closed - the server exited; fail whatever is still waiting
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(RuntimeError("Bright Data MCP process exited"))
+    
+    def close(self):
+        if self.alive():
+            self.proc.terminate()
+            try:
+                self.proc.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                self.proc.kill()
 
 
 class CreatorDataClient:
-    def __init__(self, tikapi_key, brightdata_token, prefer_brightdata=True):
+    def __init__(self, tikapi_key, brightdata_token, prefer_brightdata=True, brightdata_transport=None,
+                 brightdata_concurrency=16, tikapi_concurrency=8, result_cache_size=5000, result_cache_ttl=3600):
         self.tikapi = TikAPIClient(tikapi_key)
         self.brightdata_token = brightdata_token
         self.prefer_brightdata = prefer_brightdata
         self.content_db = ContentDatabase()
+        
+        # In-process cache of successful analyses keyed by (username, post_count) - reruns skip the network
+        self._result_cache = _TTLCache(maxsize=result_cache_size, ttl=result_cache_ttl)
+        
+        # Async batch limits per provider (semaphores are bound lazily to the running loop)
+        self.brightdata_concurrency = brightdata_concurrency
+        self.tikapi_concurrency = tikapi_concurrency
+        self._semaphore_loop = None
+        self._brightdata_semaphore = None
+        self._tikapi_semaphore = None
+        
+        # 'api' talks to the datasets API directly; 'mcp' shares one long-lived `npx @brightdata/mcp`
+        # process; 'mcp-spawn' starts a fresh MCP process per creator
+        self.brightdata_transport = brightdata_transport or os.getenv('BRIGHTDATA_TRANSPORT', 'api')
+        self._mcp_session = None
+        self._mcp_session_lock = threading.Lock()
+        
+        # Recent successful Bright Data call durations drive the per-call timeout
+        self._latencies = collections.deque(maxlen=BRIGHTDATA_LATENCY_WINDOW)
+        self._latency_samples = 0
+        self._latency_lock = threading.Lock()
+        self._dyn_timeout = float(BRIGHTDATA_TIMEOUT)
+        
+        # One pooled keep-alive session shared by every Bright Data API call. Only snapshot polls (GET)
+        # are retried - each POST /trigger starts a new billed snapshot, so it is never replayed
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.5,
+                status_forcelist=[429, 500, 502, 503, 504],
+                allowed_methods=['GET']
+            ),
+            pool_connections=4,
+            pool_maxsize=20
+        )
+        self._http.mount("https://", adapter)
+        self._http.headers.update({'Authorization': f'Bearer {brightdata_token}'})
+        
+        # One breaker per provider - an open breaker skips straight to the other provider
+        self._brightdata_breaker = CircuitBreaker("Bright Data", fail_threshold=5, reset_after=60)
+        self._tikapi_breaker = CircuitBreaker("TikAPI", fail_threshold=5, reset_after=60)
     
     def get_creator_analysis(self, username, post_count=35):
         """
@@ -34,10 +302,23 @@ class CreatorDataClient:
         Returns:
             dict: Success status, profile data, and posts data (TikAPI-compatible format)
         """
+        key = (username, post_count)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        result = self._get_creator_analysis_uncached(username, post_count)
+        if result['success']:
+            self._result_cache.set(key, result)
+        return result
+    
+    def _get_creator_analysis_uncached(self, username, post_count):
+        """Provider fallback behind get_creator_analysis's in-process cache"""
         # Try preferred service first
         if self.prefer_brightdata:
             pass  # Trying Bright Data MCP
-            brightdata_result = self._get_brightdata_analysis(username, post_count)
+            brightdata_result = self._call_provider(self._brightdata_breaker, self._get_brightdata_analysis,
+                                                    username, post_count)
             
             if brightdata_result['success']:
                 pass  # Bright Data MCP success
@@ -45,17 +326,149 @@ class CreatorDataClient:
             else:
                 # Always fall back to TikAPI when Bright Data MCP fails, regardless of error type
                 pass  # Bright Data failed, falling back to TikAPI
-                return self._try_tikapi_fallback(username, post_count)
+                return self._call_provider(self._tikapi_breaker, self._try_tikapi_fallback, username, post_count)
         else:
             # TikAPI first, then Bright Data fallback
             pass  # Trying TikAPI
-            tikapi_result = self._try_tikapi_fallback(username, post_count)
+            tikapi_result = self._call_provider(self._tikapi_breaker, self._try_tikapi_fallback, username, post_count)
             
             if tikapi_result['success']:
                 return tikapi_result
             else:
                 pass  # TikAPI failed, falling back to Bright Data
-                return self._get_brightdata_analysis(username, post_count)
+                return self._call_provider(self._brightdata_breaker, self._get_brightdata_analysis,
+                                           username, post_count)
+    
+    @staticmethod
+    def _provider_down(result):
+        """True if a failed result looks like an upstream outage rather than a bad creator"""
+        return not result.get('success') and bool(_PROVIDER_DOWN_RE.search(result.get('error', '')))
+    
+    @staticmethod
+    def _circuit_open_result(breaker):
+        return {'success': False, 'error': f"{breaker.name} circuit open - provider skipped"}
+    
+    def _provider_attempts(self, breaker):
+        """How many times _call_provider may try a provider (datasets API retries live in its adapter)"""
+        if breaker is self._brightdata_breaker and self.brightdata_transport == 'api':
+            return 1
+        return PROVIDER_MAX_ATTEMPTS
+    
+    def _should_retry(self, breaker, result, attempt, max_attempts):
+        """
+        Settle one provider attempt: True if the caller should back off and try again
+        
+        Otherwise the breaker is updated - success for a healthy provider (including
+        creator-level failures), failure once an outage-looking error is final.
+        Timeouts already spent their budget, so they are never retried.
+        """
+        if not self._provider_down(result):
+            breaker.record_success()
+            return False
+        if attempt + 1 < max_attempts and not result.get('timed_out'):
+            return True
+        breaker.record_failure()
+        return False
+    
+    def _call_provider(self, breaker, fetch, username, post_count):
+        """Call one provider through its circuit breaker, retrying transient errors with jittered backoff"""
+        if not breaker.allow():
+            return self._circuit_open_result(breaker)
+        
+        max_attempts = self._provider_attempts(breaker)
+        for attempt in range(max_attempts):
+            result = fetch(username, post_count)
+            if not self._should_retry(breaker, result, attempt, max_attempts):
+                return result
+            time.sleep(backoff_delay(attempt))
+    
+    async def _call_provider_async(self, breaker, fetch, username, post_count):
+        """Async variant of _call_provider (fetch is a coroutine function)"""
+        if not breaker.allow():
+            return self._circuit_open_result(breaker)
+        
+        max_attempts = self._provider_attempts(breaker)
+        for attempt in range(max_attempts):
+            result = await fetch(username, post_count)
+            if not self._should_retry(breaker, result, attempt, max_attempts):
+                return result
+            await asyncio.sleep(backoff_delay(attempt))
+    
+    def _provider_semaphores(self):
+        """Per-provider concurrency limits, created for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._semaphore_loop is not loop:
+            self._semaphore_loop = loop
+            self._brightdata_semaphore = asyncio.Semaphore(self.brightdata_concurrency)
+            self._tikapi_semaphore = asyncio.Semaphore(self.tikapi_concurrency)
+        return self._brightdata_semaphore, self._tikapi_semaphore
+    
+    async def _brightdata_limited(self, username, post_count):
+        brightdata_semaphore, _ = self._provider_semaphores()
+        async with brightdata_semaphore:
+            return await self._get_brightdata_analysis_async(username, post_count)
+    
+    async def _tikapi_limited(self, username, post_count):
+        _, tikapi_semaphore = self._provider_semaphores()
+        async with tikapi_semaphore:
+            # TikAPI client is blocking - run it off the event loop
+            return await asyncio.to_thread(self._try_tikapi_fallback, username, post_count)
+    
+    async def get_creator_analysis_async(self, username, post_count=35):
+        """Async variant of get_creator_analysis with the same fallback order and cache"""
+        key = (username, post_count)
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        brightdata = (self._brightdata_breaker, self._brightdata_limited)
+        tikapi = (self._tikapi_breaker, self._tikapi_limited)
+        primary, secondary = (brightdata, tikapi) if self.prefer_brightdata else (tikapi, brightdata)
+        
+        result = await self._call_provider_async(*primary, username, post_count)
+        if not result['success']:
+            result = await self._call_provider_async(*secondary, username, post_count)
+        if result['success']:
+            self._result_cache.set(key, result)
+        return result
+    
+    async def get_creator_analysis_many_async(self, usernames, post_count=35, concurrency=None):
+        """
+        Fetch creator analyses for many usernames concurrently
+        
+        Requests are bounded per provider (brightdata_concurrency / tikapi_concurrency).
+        
+        Args:
+            usernames: Iterable of TikTok usernames (without @)
+            post_count: Number of posts to fetch per creator
+            concurrency: Optional extra cap on creators in flight at once
+            
+        Returns:
+            dict: username -> result dict (same shape as get_creator_analysis)
+        """
+        usernames = list(dict.fromkeys(usernames))
+        
+        if concurrency:
+            semaphore = asyncio.Semaphore(concurrency)
+            async def _analyze(username):
+                async with semaphore:
+                    return await self.get_creator_analysis_async(username, post_count)
+        else:
+            async def _analyze(username):
+                return await self.get_creator_analysis_async(username, post_count)
+        
+        results = await asyncio.gather(*(_analyze(u) for u in usernames), return_exceptions=True)
+        
+        analyses = {}
+        for username, result in zip(usernames, results):
+            if isinstance(result, BaseException):
+                result = {'success': False, 'error': f"Creator analysis error: {str(result)}"}
+            analyses[username] = result
+        return analyses
+    
+    def get_creator_analysis_many(self, usernames, post_count=35, concurrency=None):
+        """Blocking wrapper around get_creator_analysis_many_async for sync callers"""
+        return asyncio.run(self.get_creator_analysis_many_async(usernames, post_count, concurrency))
     
     def _try_tikapi_fallback(self, username, post_count):
         """Try TikAPI with proper error handling"""
@@ -68,229 +481,580 @@ class CreatorDataClient:
             pass  # TikAPI failed
             return tikapi_result
     
-    def _get_brightdata_analysis(self, username, post_count=35):
+    def _brightdata_tool_call(self, username, request_id=1):
+        """JSON-RPC tools/call request for the Bright Data TikTok profiles tool"""
+        return {
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "method": "tools/call",
+            "params": {
+                "name": "web_data_tiktok_profiles",
+                "arguments": {"url": f"https://www.tiktok.com/@{username}"}
+            }
+        }
+    
+    def _brightdata_mcp_env(self):
+        return {**os.environ, 'API_TOKEN': self.brightdata_token, 'PRO_MODE': 'true'}
+    
+    def _build_brightdata_request(self, username):
+        """Build the JSON-RPC request (UTF-8 bytes) and environment for a one-shot Bright Data MCP server"""
+        return fast_json.dumps_bytes(self._brightdata_tool_call(username)), self._brightdata_mcp_env()
+    
+    def _get_mcp_session(self):
+        """The shared MCP process, (re)started if it has not been launched yet or has exited"""
+        with self._mcp_session_lock:
+            if self._mcp_session is None or not self._mcp_session.alive():
+                if self._mcp_session is not None:
+                    # The exited session's exit hook has nothing left to close
+                    atexit.unregister(self._mcp_session.close)
+                self._mcp_session = _MCPSession(self._brightdata_mcp_env())
+            return self._mcp_session
+    
+    def _brightdata_cache_path(self, username, post_count):
+        """Disk cache location for a (username, post_count) Bright Data result"""
+        key = hashlib.sha1(f"{username}|{post_count}".encode()).hexdigest()
+        return os.path.join(BRIGHTDATA_CACHE_DIR, f"{key}.json")
+    
+    def _read_brightdata_cache(self, username, post_count):
+        """Return a cached Bright Data result if it is still fresh, else None"""
+        path = self._brightdata_cache_path(username, post_count)
+        try:
+            age = time.time() - os.path.getmtime(path)
+            with open(path, 'rb') as f:
+                result = fast_json.loads(f.read())
+        except (OSError, ValueError):
+            return None
+        
+        # Successful results live for a day; "building snapshot" misses only briefly, unless they
+        # carry the snapshot_id to resume polling
+        if result.get('success'):
+            ttl = BRIGHTDATA_CACHE_TTL
+        elif result.get('snapshot_id'):
+            ttl = BRIGHTDATA_SNAPSHOT_TTL
+        else:
+            ttl = BRIGHTDATA_BUILDING_TTL
+        return result if age < ttl else None
+    
+    def _write_brightdata_cache(self, username, post_count, result):
+        """Persist a Bright Data result (successes and "building" misses only)"""
+        path = self._brightdata_cache_path(username, post_count)
+        if not result.get('success') and 'building snapshot' not in result.get('error', ''):
+            # Drop any stale entry so a dead snapshot_id isn't resumed again
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return
+        try:
+            os.makedirs(BRIGHTDATA_CACHE_DIR, exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(fast_json.dumps_bytes(result))
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"⚠️ Could not cache Bright Data result for @{username}: {e}")
+    
+    def _get_brightdata_analysis(self, username, post_count=35, cache=True, refresh=False):
         """
         Get creator analysis using Bright Data MCP
         
         Args:
             username: TikTok username (without @)
             post_count: Number of posts to fetch
+            cache: Serve/store results from cache/brightdata (set False to force a fresh MCP call)
+            refresh: Don't serve a cached result, but still resume a snapshot left building
+                     (retries use this so they don't pay for a new snapshot)
             
         Returns:
             dict: Success status, profile data, and posts data (TikAPI-compatible format)
         """
+        snapshot_id = None
+        if cache:
+            cached = self._read_brightdata_cache(username, post_count)
+            if cached is not None:
+                # A snapshot still building last time is polled again rather than triggered (and billed) anew
+                snapshot_id = None if cached.get('success') else cached.get('snapshot_id')
+                if not snapshot_id and not refresh:
+                    return cached
+        
+        result = self._fetch_brightdata_analysis(username, post_count, snapshot_id)
+        if cache:
+            self._write_brightdata_cache(username, post_count, result)
+        return result
+    
+    async def _get_brightdata_analysis_async(self, username, post_count=35, cache=True):
+        """Async variant of _get_brightdata_analysis, sharing the same disk cache"""
+        snapshot_id = None
+        if cache:
+            cached = self._read_brightdata_cache(username, post_count)
+            if cached is not None:
+                snapshot_id = None if cached.get('success') else cached.get('snapshot_id')
+                if not snapshot_id:
+                    return cached
+        
+        result = await self._fetch_brightdata_analysis_async(username, post_count, snapshot_id)
+        if cache:
+            self._write_brightdata_cache(username, post_count, result)
+        return result
+    
+    def _record_brightdata_latency(self, started, result):
+        """Track successful call durations and retune the timeout to 1.5x their p95"""
+        if not result.get('success'):
+            return
+        with self._latency_lock:
+            self._latencies.append(time.monotonic() - started)
+            self._latency_samples += 1
+            if self._latency_samples % BRIGHTDATA_TIMEOUT_RECALC_EVERY:
+                return
+            sorted_lat = sorted(self._latencies)
+            p95 = sorted_lat[int(len(sorted_lat) * 0.95)]
+            self._dyn_timeout = max(BRIGHTDATA_TIMEOUT_MIN, min(BRIGHTDATA_TIMEOUT_MAX, p95 * 1.5))
+    
+    def _fetch_brightdata_analysis(self, username, post_count, snapshot_id=None):
+        """Fetch a creator from Bright Data over the configured transport (uncached)"""
+        started = time.monotonic()
+        if snapshot_id:
+            # Resuming a datasets API snapshot works whatever transport is configured
+            result = self._fetch_brightdata_api(username, post_count, snapshot_id)
+        elif self.brightdata_transport == 'mcp':
+            result = self._fetch_brightdata_mcp_session(username, post_count)
+        elif self.brightdata_transport == 'mcp-spawn':
+            result = self._fetch_brightdata_mcp(username, post_count)
+        else:
+            result = self._fetch_brightdata_api(username, post_count)
+        if not snapshot_id:
+            # A resumed snapshot was mostly built before this call - its duration would drag the p95 down
+            self._record_brightdata_latency(started, result)
+        return result
+    
+    async def _fetch_brightdata_analysis_async(self, username, post_count, snapshot_id=None):
+        """Async variant of _fetch_brightdata_analysis"""
+        started = time.monotonic()
+        if snapshot_id:
+            result = await asyncio.to_thread(self._fetch_brightdata_api, username, post_count, snapshot_id)
+        elif self.brightdata_transport == 'mcp':
+            result = await self._fetch_brightdata_mcp_session_async(username, post_count)
+        elif self.brightdata_transport == 'mcp-spawn':
+            result = await self._fetch_brightdata_mcp_async(username, post_count)
+        else:
+            # The pooled session is blocking but cheap - run it off the event loop
+            result = await asyncio.to_thread(self._fetch_brightdata_api, username, post_count)
+        if not snapshot_id:
+            self._record_brightdata_latency(started, result)
+        return result
+    
+    def _fetch_brightdata_api(self, username, post_count, snapshot_id=None):
+        """
+        Trigger and poll the Bright Data datasets API directly - no Node/MCP process per creator
+        
+        Pass snapshot_id to resume polling a snapshot an earlier call left building.
+        """
+        timeout = self._dyn_timeout
+        deadline = time.monotonic() + timeout
         try:
-            # Prepare JSON-RPC request
-            request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": "web_data_tiktok_profiles",
-                    "arguments": {"url": f"https://www.tiktok.com/@{username}"}
-                }
-            }
-            # Use echo + pipe approach that works
-            request_json = json.dumps(request)
-            cmd = f'echo {repr(request_json)} | API_TOKEN={self.brightdata_token} PRO_MODE=true npx @brightdata/mcp'
-            
-            result = subprocess.run(
-                cmd,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=180  # 3 minutes timeout for MCP
-            )
+            if not snapshot_id:
+                response = self._http.post(
+                    f"{BRIGHTDATA_API_BASE}/trigger",
+                    params={'dataset_id': BRIGHTDATA_TIKTOK_PROFILES_DATASET, 'include_errors': 'true'},
+                    json=[{'url': f"https://www.tiktok.com/@{username}"}],
+                    timeout=30
+                )
+                if response.status_code != 200:
+                    return {
+                        'success': False,
+                        'error': f"Bright Data API trigger failed ({response.status_code}): {response.text[:200]}"
+                    }
+                snapshot_id = fast_json.loads(response.content).get('snapshot_id')
+                if not snapshot_id:
+                    return {
+                        'success': False,
+                        'error': f"Bright Data API returned no snapshot_id: {response.text[:200]}"
+                    }
             
-            if result.returncode != 0:
+            # Poll until the snapshot is ready; 202 + {"status": "running"} means not yet
+            while True:
+                snapshot = self._http.get(
+                    f"{BRIGHTDATA_API_BASE}/snapshot/{snapshot_id}",
+                    params={'format': 'json'},
+                    timeout=60
+                )
+                if snapshot.status_code not in (200, 202):
+                    return {
+                        'success': False,
+                        'error': f"Bright Data API snapshot failed ({snapshot.status_code}): {snapshot.text[:200]}"
+                    }
+                
+                decoded = fast_json.loads(snapshot.content)
+                if not (isinstance(decoded, dict) and decoded.get('status') in ('starting', 'running', 'building')):
+                    result = self._result_from_snapshot(decoded, username, post_count)
+                    return result or {'success': False, 'error': BRIGHTDATA_PARSE_ERROR}
+                
+                if time.monotonic() >= deadline:
+                    # Not a bad username - report it like a building snapshot so retries come back later
+                    return {
+                        'success': False,
+                        'error': f"Bright Data is building snapshot: {snapshot_id} not ready after {timeout:.0f}s",
+                        'snapshot_id': snapshot_id,
+                        'timed_out': True
+                    }
+                time.sleep(BRIGHTDATA_POLL_INTERVAL)
+        
+        except requests.Timeout:
+            return {
+                'success': False,
+                'error': "Bright Data API request timed out",
+                'timed_out': True
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Bright Data API error: {str(e)}"
+            }
+    
+    def _fetch_brightdata_mcp_session(self, username, post_count):
+        """Send the request to the shared MCP process and wait for its response"""
+        timeout = self._dyn_timeout
+        try:
+            session = self._get_mcp_session()
+            future = session.call(self._brightdata_tool_call(username))
+            try:
+                frame = future.result(timeout=timeout)
+            except futures.TimeoutError:
+                session.forget(future)
                 return {
                     'success': False,
-                    'error': f"Bright Data MCP failed: {result.stderr[:200]}"
+                    'error': f"Bright Data MCP timeout ({timeout:.0f}s)",
+                    'timed_out': True
                 }
-            
-            # Parse the response - look for the result line (ignore progress notifications)
-            lines = result.stdout.strip().split('\n')
-            profile_data = None
-            
-            for line in lines:
-                if not line.strip():
-                    continue
-                    
-                try:
-                    parsed = json.loads(line)
-                    
-                    # Skip progress notifications
-                    if parsed.get('method') == 'notifications/progress':
-                        continue
-                    
-                    # Look for the actual result
-                    if 'result' in parsed and 'content' in parsed['result']:
-                        content = parsed['result']['content'][0]['text']
-                        
-                        # Handle building status response
-                        try:
-                            status_check = json.loads(content)
-                            if isinstance(status_check, dict) and status_check.get('status') == 'building':
-                                return {
-                                    'success': False,
-                                    'error': f"Bright Data is building snapshot: {status_check.get('message', 'try again later')}"
-                                }
-                        except:
-                            pass
-                        
-                        # Parse the actual profile data
-                        profiles = json.loads(content)
-                        if isinstance(profiles, list) and len(profiles) > 0:
-                            profile_data = profiles[0]
-                            break
-                            
-                except (json.JSONDecodeError, KeyError, IndexError):
-                    continue
-            
-            if not profile_data:
+            return self._result_from_frame(frame, username, post_count)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Bright Data MCP error: {str(e)}"
+            }
+    
+    async def _fetch_brightdata_mcp_session_async(self, username, post_count):
+        """Async variant of _fetch_brightdata_mcp_session - awaits the response without a thread"""
+        timeout = self._dyn_timeout
+        try:
+            session = self._get_mcp_session()
+            future = session.call(self._brightdata_tool_call(username))
+            try:
+                frame = await asyncio.wait_for(asyncio.wrap_future(future), timeout=timeout)
+            except asyncio.TimeoutError:
+                session.forget(future)
                 return {
                     'success': False,
-                    'error': "Could not parse Bright Data MCP response"
+                    'error': f"Bright Data MCP timeout ({timeout:.0f}s)",
+                    'timed_out': True
                 }
-            
-            # IMPORTANT: Despite the confusing naming from Bright Data:
-            # - top_videos = RECENT posts (chronologically ordered) with playcount values
-            # - top_posts_data = TOP PERFORMING posts (by engagement) for content enrichment
-            # We use top_videos for recent post stats, top_posts_data for content analysis
-            
-            # Note: Content database saving moved to screening script
-            # This allows the screening script to control when/how to save
-            top_posts_data = profile_data.get('top_posts_data', [])
-            
-            # Convert to TikAPI-compatible format
-            profile = {
-                'username': profile_data.get('account_id', username),
-                'nickname': profile_data.get('nickname', ''),
-                'signature': profile_data.get('biography', ''),
-                'followers': profile_data.get('followers', 0),
-                'following': profile_data.get('following', 0),
-                'videos': profile_data.get('videos_count', 0),
-                'verified': profile_data.get('is_verified', False),
-                'sec_uid': profile_data.get('secu_id', '')
+            return self._result_from_frame(frame, username, post_count)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Bright Data MCP error: {str(e)}"
             }
+    
+    def _fetch_brightdata_mcp(self, username, post_count):
+        """Run a one-off Bright Data MCP server for this creator and parse its response (uncached)"""
+        try:
+            # Pipe the request straight into the MCP server's stdin - no shell, no echo
+            request_json, env = self._build_brightdata_request(username)
             
-            # Convert posts data - use top_videos for recent posts with view counts
-            posts = []
+            # stderr goes to a temp file so a chatty server can't block on a full pipe
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = subprocess.Popen(
+                    ['npx', '@brightdata/mcp'],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=stderr_file,
+                    env=env
+                )
+                
+                # Adaptive timeout (3 minutes until enough calls have been measured)
+                timeout = self._dyn_timeout
+                timed_out = threading.Event()
+                def _kill():
+                    timed_out.set()
+                    proc.kill()
+                timer = threading.Timer(timeout, _kill)
+                timer.start()
+                
+                try:
+                    proc.stdin.write(request_json)
+                    proc.stdin.close()
+                    # Stream stdout and stop reading as soon as the JSON-RPC result shows up
+                    result = self._parse_brightdata_output(proc.stdout, username, post_count)
+                finally:
+                    timer.cancel()
+                    if proc.poll() is None:
+                        proc.terminate()
+                    try:
+                        proc.wait(timeout=10)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        proc.wait()
+                
+                if timed_out.is_set():
+                    return {
+                        'success': False,
+                        'error': f"Bright Data MCP timeout ({timeout:.0f}s)",
+                        'timed_out': True
+                    }
+                
+                # No result line and a failing exit code - surface the server's stderr instead
+                if result.get('error') == BRIGHTDATA_PARSE_ERROR and proc.returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read(200).decode(errors='replace')
+                    return {
+                        'success': False,
+                        'error': f"Bright Data MCP failed: {stderr}"
+                    }
+                
+                return result
             
-            # Get both fields from Bright Data response
-            top_videos = profile_data.get('top_videos', [])  # Recent posts (chronological)
-            top_posts_data = profile_data.get('top_posts_data', [])  # Top performing posts
+        except Exception as e:
+            return {
+                'success': False,
+                'error': f"Bright Data MCP error: {str(e)}"
+            }
+    
+    async def _fetch_brightdata_mcp_async(self, username, post_count):
+        """Async variant of _fetch_brightdata_mcp - streams the MCP server's stdout without blocking the event loop"""
+        try:
+            request_json, env = self._build_brightdata_request(username)
             
-            if top_videos:
-                # Process recent videos from top_videos (has view counts)
-                for video in top_videos[:post_count]:
-                    video_id = video.get('video_id', '')
-                    tiktok_url = video.get('video_url', '')
-                    if not tiktok_url and video_id:
-                        tiktok_url = f"https://www.tiktok.com/@{username}/video/{video_id}"
-                    
-                    # Parse create_date from Bright Data format
-                    # Format: "Tue Aug 19 2025 14:13:00 GMT+0000 (Coordinated Universal Time)"
-                    create_time = 0
-                    formatted_date = 'Unknown'
-                    create_date_str = video.get('create_date', '')
-                    if create_date_str:
-                        try:
-                            # Remove the timezone description in parentheses
-                            if 'GMT' in create_date_str:
-                                date_part = create_date_str.split(' GMT')[0] + ' GMT'
-                                # Parse the date
-                                from datetime import datetime
-                                dt = datetime.strptime(date_part.replace(' GMT', ''), '%a %b %d %Y %H:%M:%S')
-                                create_time = int(dt.timestamp())
-                                formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except Exception as e:
-                            # Fallback to dateutil parser
-                            try:
-                                from dateutil import parser
-                                dt = parser.parse(create_date_str)
-                                create_time = int(dt.timestamp())
-                                formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                            except:
-                                pass
-                    
-                    post_data = {
-                        'id': video_id,
-                        'description': video.get('description', ''),
-                        'create_time': create_time,
-                        'formatted_date': formatted_date,
-                        'duration': 0,
-                        'is_photo_post': False,  # top_videos are videos
-                        'content_type': 'video',
-                        'tiktok_url': tiktok_url,
-                        'stats': {
-                            'views': video.get('playcount', 0),  # Proper view counts from top_videos
-                            'likes': video.get('diggcount', 0),
-                            'comments': video.get('commentcount', 0),
-                            'shares': video.get('share_count', 0)
-                        }
+            with tempfile.TemporaryFile() as stderr_file:
+                proc = await asyncio.create_subprocess_exec(
+                    'npx', '@brightdata/mcp',
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    stderr=stderr_file,
+                    env=env,
+                    limit=BRIGHTDATA_MAX_LINE  # the result frame is one (large) line
+                )
+                proc.stdin.write(request_json)
+                proc.stdin.close()
+                
+                async def _read_result():
+                    # Stop at the first frame that yields a result
+                    async for raw_line in proc.stdout:
+                        result = self._result_from_line(raw_line, username, post_count)
+                        if result is not None:
+                            return result
+                    return {
+                        'success': False,
+                        'error': BRIGHTDATA_PARSE_ERROR
+                    }
+                
+                timeout = self._dyn_timeout
+                try:
+                    result = await asyncio.wait_for(_read_result(), timeout=timeout)
+                except asyncio.TimeoutError:
+                    return {
+                        'success': False,
+                        'error': f"Bright Data MCP timeout ({timeout:.0f}s)",
+                        'timed_out': True
                     }
-                    
-                    posts.append(post_data)
-            elif top_posts_data:
-                # Fallback: Use top_posts_data if no top_videos (rare case)
-                # WARNING: top_posts_data doesn't have view counts (playcount=0)
-                for post in top_posts_data[:post_count]:
-                    post_id = post.get('post_id', '')
-                    tiktok_url = post.get('post_url', '')
-                    if not tiktok_url and post_id:
-                        tiktok_url = f"https://www.tiktok.com/@{username}/video/{post_id}"
-                    
-                    # Parse create_time
-                    create_time = 0
-                    formatted_date = 'Unknown'
-                    create_time_str = post.get('create_time', '')
-                    if create_time_str:
-                        try:
-                            from dateutil import parser
-                            dt = parser.parse(create_time_str)
-                            create_time = int(dt.timestamp())
-                            formatted_date = dt.strftime('%Y-%m-%d %H:%M:%S')
-                        except:
-                            pass
-                    
-                    post_data = {
-                        'id': post_id,
-                        'description': post.get('description', ''),
-                        'create_time': create_time,
-                        'formatted_date': formatted_date,
-                        'duration': 0,
-                        'is_photo_post': post.get('post_type') == 'photo',
-                        'content_type': post.get('post_type', 'video'),
-                        'tiktok_url': tiktok_url,
-                        'stats': {
-                            'views': 0,  # top_posts_data doesn't have view counts
-                            'likes': post.get('likes', 0),
-                            'comments': 0,
-                            'shares': 0
-                        }
+                finally:
+                    if proc.returncode is None:
+                        proc.kill()
+                    await proc.wait()
+                
+                if result.get('error') == BRIGHTDATA_PARSE_ERROR and proc.returncode != 0:
+                    stderr_file.seek(0)
+                    stderr = stderr_file.read(200).decode(errors='replace')
+                    return {
+                        'success': False,
+                        'error': f"Bright Data MCP failed: {stderr}"
                     }
-                    
-                    posts.append(post_data)
+                return result
             
+        except Exception as e:
             return {
-                'success': True,
-                'profile': profile,
-                'posts': posts,
-                'top_posts_data': profile_data.get('top_posts_data', [])  # Include top_posts_data in response
+                'success': False,
+                'error': f"Bright Data MCP error: {str(e)}"
             }
-            
-        except subprocess.TimeoutExpired:
+    
+    def _parse_brightdata_output(self, lines, username, post_count):
+        """Convert MCP stdout byte lines (any iterable, consumed only up to the result) into a TikAPI-compatible result"""
+        for line in lines:
+            result = self._result_from_line(line, username, post_count)
+            if result is not None:
+                return result
+
+        return {
+            'success': False,
+            'error': BRIGHTDATA_PARSE_ERROR
+        }
+
+    def _result_from_line(self, line, username, post_count):
+        """Result for one raw MCP stdout line (bytes), or None for progress notifications and other frames"""
+        # Progress notifications are the bulk of a long scrape's output - skip them without decoding
+        if b'"notifications/progress"' in line or b'"result"' not in line:
+            return None
+
+        try:
+            parsed = _json_loads(line)
+
+            # Look for the actual result
+            if 'result' in parsed and 'content' in parsed['result']:
+                content = parsed['result']['content'][0]['text']
+                return self._result_from_snapshot(_json_loads(content), username, post_count)
+
+        except (fast_json.JSONDecodeError, KeyError, IndexError, TypeError):
+            pass
+        return None
+
+    def _result_from_frame(self, frame, username, post_count):
+        """Result for a JSON-RPC response frame from the shared MCP process"""
+        if 'error' in frame:
+            error = frame['error']
+            message = error.get('message') if isinstance(error, dict) else error
             return {
                 'success': False,
-                'error': "Bright Data MCP timeout (3 minutes)"
+                'error': f"Bright Data MCP error: {message}"
             }
-        except Exception as e:
+        try:
+            content = frame['result']['content'][0]['text']
+            result = self._result_from_snapshot(_json_loads(content), username, post_count)
+        except (fast_json.JSONDecodeError, KeyError, IndexError, TypeError):
+            result = None
+        return result or {
+            'success': False,
+            'error': BRIGHTDATA_PARSE_ERROR
+        }
+
+    def _result_from_snapshot(self, decoded, username, post_count):
+        """Turn decoded Bright Data snapshot JSON into a result dict (None if it isn't a snapshot)"""
+        # Handle building status response
+        if isinstance(decoded, dict) and decoded.get('status') == 'building':
             return {
                 'success': False,
-                'error': f"Bright Data MCP error: {str(e)}"
+                'error': f"Bright Data is building snapshot: {decoded.get('message', 'try again later')}"
+            }
+
+        # Otherwise it's the list of profiles
+        if not (isinstance(decoded, list) and decoded):
+            return None
+        profile_data = decoded[0]
+
+        # include_errors=true puts per-URL failures (dead page, private account...) in the record
+        if profile_data.get('error') and not profile_data.get('account_id'):
+            return {
+                'success': False,
+                'error': f"Bright Data error: {profile_data['error']}"
             }
+
+        return self._convert_brightdata_profile(profile_data, username, post_count)
+
+    def _convert_brightdata_profile(self, profile_data, username, post_count):
+        """Convert one Bright Data profile record into a TikAPI-compatible result"""
+        # IMPORTANT: Despite the confusing naming from Bright Data:
+        # - top_videos = RECENT posts (chronologically ordered) with playcount values
+        # - top_posts_data = TOP PERFORMING posts (by engagement) for content enrichment
+        # We use top_videos for recent post stats, top_posts_data for content analysis
+
+        # Note: Content database saving moved to screening script
+        # This allows the screening script to control when/how to save
+        top_posts_data = profile_data.get('top_posts_data', [])
+
+        # Convert to TikAPI-compatible format
+        profile = {
+            'username': profile_data.get('account_id', username),
+            'nickname': profile_data.get('nickname', ''),
+            'signature': profile_data.get('biography', ''),
+            'followers': profile_data.get('followers', 0),
+            'following': profile_data.get('following', 0),
+            'videos': profile_data.get('videos_count', 0),
+            'verified': profile_data.get('is_verified', False),
+            'sec_uid': profile_data.get('secu_id', '')
+        }
+
+        # Get both fields from Bright Data response
+        top_videos = profile_data.get('top_videos', [])  # Recent posts (chronological)
+        top_posts_data = profile_data.get('top_posts_data') or []  # Top performing posts
+
+        # Fallback URL prefix for posts without a URL - built once per creator
+        url_prefix = f"https://www.tiktok.com/@{username}/video/"
+
+        # Convert posts data - use top_videos for recent posts with view counts
+        if top_videos:
+            posts = [self._video_to_post(video, url_prefix) for video in top_videos[:post_count]]
+        elif top_posts_data:
+            # Fallback: Use top_posts_data if no top_videos (rare case)
+            posts = [self._top_post_to_post(post, url_prefix) for post in top_posts_data[:post_count]]
+        else:
+            posts = []
+
+        return {
+            'success': True,
+            'profile': profile,
+            'posts': posts,
+            # Include top_posts_data in response, projected to the fields ContentDatabase stores
+            'top_posts_data': [
+                {field: post[field] for field in BRIGHTDATA_TOP_POST_FIELDS if field in post}
+                for post in top_posts_data
+            ],
+            # Raw Bright Data profile fields (bio, language, commerce flag...) for ContentDatabase
+            'brightdata_profile': {
+                field: profile_data[field] for field in BRIGHTDATA_PROFILE_FIELDS if field in profile_data
+            }
+        }
     
+    @staticmethod
+    def _video_to_post(video, url_prefix):
+        """One top_videos entry (recent post, has view counts) as a TikAPI-compatible post"""
+        video_id = video.get('video_id', '')
+        tiktok_url = video.get('video_url') or (f"{url_prefix}{video_id}" if video_id else '')
+
+        # Parse create_date from Bright Data format
+        create_time, formatted_date = _parse_bd_date(video.get('create_date', ''))
+
+        return {
+            'id': video_id,
+            'description': video.get('description', ''),
+            'create_time': create_time,
+            'formatted_date': formatted_date,
+            'duration': 0,
+            'is_photo_post': False,  # top_videos are videos
+            'content_type': 'video',
+            'tiktok_url': tiktok_url,
+            'stats': {
+                'views': video.get('playcount', 0),  # Proper view counts from top_videos
+                'likes': video.get('diggcount', 0),
+                'comments': video.get('commentcount', 0),
+                'shares': video.get('share_count', 0)
+            }
+        }
+
+    @staticmethod
+    def _top_post_to_post(post, url_prefix):
+        """One top_posts_data entry as a TikAPI-compatible post"""
+        # WARNING: top_posts_data doesn't have view counts (playcount=0)
+        post_id = post.get('post_id', '')
+        tiktok_url = post.get('post_url') or (f"{url_prefix}{post_id}" if post_id else '')
+
+        # Parse create_time
+        create_time, formatted_date = _parse_loose_date(post.get('create_time', ''))
+
+        return {
+            'id': post_id,
+            'description': post.get('description', ''),
+            'create_time': create_time,
+            'formatted_date': formatted_date,
+            'duration': 0,
+            'is_photo_post': post.get('post_type') == 'photo',
+            'content_type': post.get('post_type', 'video'),
+            'tiktok_url': tiktok_url,
+            'stats': {
+                'views': 0,  # top_posts_data doesn't have view counts
+                'likes': post.get('likes', 0),
+                'comments': 0,
+                'shares': 0
+            }
+        }
+
     def set_tikapi_preferred(self):
         """Switch to TikAPI-first strategy"""
         self.prefer_brightdata = False
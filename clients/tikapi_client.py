@@ -154,9 +154,10 @@ class TikAPIClient:
                 'profile': profile
             }
         
-        # Add TikTok URLs to posts
+        # Add TikTok URLs to posts - the @username/video/ prefix is the same for every post
+        url_prefix = self.get_tiktok_url(username, '')
         for post in posts['posts']:
-            post['tiktok_url'] = self.get_tiktok_url(username, post['id'])
+            post['tiktok_url'] = f"{url_prefix}{post['id']}"
         
         return {
             'success': True,
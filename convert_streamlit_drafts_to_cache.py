@@ -3,7 +3,7 @@
 Convert Streamlit Cloud email drafts to cache format for Supabase migration
 Takes the downloaded JSON from Streamlit and converts it to the cache format
 """
-import json
+import argparse
 import sys
 import os
 from datetime import datetime
@@ -12,10 +12,26 @@ from dotenv import load_dotenv
 # Add current directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from utils.supabase_email_draft_cache import SupabaseEmailDraftCache
+from utils.supabase_singleton import enable_http2, get_supabase_cache
+from utils import fast_json
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
 
 load_dotenv()
 
+def _iter_drafts(drafts_json_file):
+    """Yield drafts from the Streamlit export one at a time (streamed with ijson when installed)"""
+    with open(drafts_json_file, 'rb') as f:
+        if IJSON_AVAILABLE:
+            # Top-level array parsed incrementally - only one draft is in memory at a time
+            yield from ijson.items(f, 'item', use_float=True)
+        else:
+            yield from fast_json.loads(f.read())
+
 def convert_streamlit_drafts_to_cache_format(drafts_json_file, campaign_name):
     """Convert Streamlit drafts JSON to cache format"""
     
@@ -23,54 +39,56 @@ def convert_streamlit_drafts_to_cache_format(drafts_json_file, campaign_name):
     print(f"📁 Input file: {drafts_json_file}")
     print(f"📋 Campaign: {campaign_name}")
     
-    # Load the downloaded drafts
+    # Convert to cache format while reading the downloaded drafts
+    cache_data = {}
+    converted_count = 0
+    draft_count = 0
+    
+    # One shared string object for every entry's campaign / generated_at instead of a copy per draft
+    campaign_name = sys.intern(campaign_name)
+    generated_at = datetime.now().isoformat()
+    
     try:
-        with open(drafts_json_file, 'r') as f:
-            drafts = json.load(f)
-        print(f"📊 Loaded {len(drafts)} drafts from Streamlit export")
+        for draft in _iter_drafts(drafts_json_file):
+            draft_count += 1
+            try:
+                username = draft.get('username')
+                if not username:
+                    print(f"⚠️  Skipping draft without username")
+                    continue
+                
+                # Create cache key
+                cache_key = f"{campaign_name}_{username}"
+                
+                # Convert to cache format
+                cache_entry = {
+                    'username': username,
+                    'campaign': campaign_name,
+                    'subject': draft.get('subject'),
+                    'body': draft.get('body'),
+                    'email': draft.get('email', draft.get('to_email')),
+                    'personalization': draft.get('personalization'),
+                    'generated_at': generated_at,
+                    'version': 1
+                }
+                
+                cache_data[cache_key] = cache_entry
+                converted_count += 1
+                
+            except Exception as e:
+                print(f"⚠️  Error converting draft for {draft.get('username', 'unknown')}: {str(e)}")
     except Exception as e:
         print(f"❌ Error loading drafts file: {str(e)}")
         return None
     
-    # Convert to cache format
-    cache_data = {}
-    converted_count = 0
-    
-    for draft in drafts:
-        try:
-            username = draft.get('username')
-            if not username:
-                print(f"⚠️  Skipping draft without username")
-                continue
-            
-            # Create cache key
-            cache_key = f"{campaign_name}_{username}"
-            
-            # Convert to cache format
-            cache_entry = {
-                'username': username,
-                'campaign': campaign_name,
-                'subject': draft.get('subject'),
-                'body': draft.get('body'),
-                'email': draft.get('email', draft.get('to_email')),
-                'personalization': draft.get('personalization'),
-                'generated_at': datetime.now().isoformat(),
-                'version': 1
-            }
-            
-            cache_data[cache_key] = cache_entry
-            converted_count += 1
-            
-        except Exception as e:
-            print(f"⚠️  Error converting draft for {draft.get('username', 'unknown')}: {str(e)}")
-    
+    print(f"📊 Loaded {draft_count} drafts from Streamlit export")
     print(f"✅ Converted {converted_count} drafts to cache format")
     
     # Save converted cache data
     cache_file = f"streamlit_cache_export_{campaign_name}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
     try:
-        with open(cache_file, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        with open(cache_file, 'wb') as f:
+            f.write(fast_json.dumps_bytes(cache_data, pretty=True))
         print(f"💾 Saved cache data to: {cache_file}")
     except Exception as e:
         print(f"❌ Error saving cache file: {str(e)}")
@@ -78,14 +96,17 @@ def convert_streamlit_drafts_to_cache_format(drafts_json_file, campaign_name):
     
     return cache_data, cache_file
 
-def migrate_to_supabase(cache_data):
+def migrate_to_supabase(cache_data, batch_size=1000):
     """Migrate cache data directly to Supabase"""
     
     print("\n🚀 Migrating to Supabase...")
     
     try:
-        supabase_cache = SupabaseEmailDraftCache()
+        supabase_cache = get_supabase_cache()
         print("✅ Connected to Supabase")
+        # Parallel batch upserts share one multiplexed connection
+        if enable_http2(supabase_cache.supabase):
+            print("⚡ Using HTTP/2 for migration requests")
     except Exception as e:
         print(f"❌ Error connecting to Supabase: {str(e)}")
         return False
@@ -95,13 +116,23 @@ def migrate_to_supabase(cache_data):
     print(f"📊 Current Supabase cache: {current_stats['total_drafts']} drafts")
     
     # Perform migration
-    migration_result = supabase_cache.migrate_from_file_cache(cache_data)
+    migration_result = supabase_cache.bulk_migrate(cache_data, batch_size=batch_size)
     
     print("\n📈 Migration Results:")
     print(f"  ✅ Successfully migrated: {migration_result['migrated']}")
+    print(f"  ⏭️ Already up to date: {migration_result.get('skipped', 0)}")
     print(f"  ❌ Failed: {migration_result['failed']}")
     print(f"  📊 Total processed: {migration_result['total']}")
     
+    # Spot-check what landed (bulk reads, not one request per draft)
+    verification = supabase_cache.verify_migration(cache_data)
+    print("\n🔍 Verification:")
+    print(f"  ✅ Matching: {verification['matched']}")
+    print(f"  ⚠️ Different: {verification['mismatched']}")
+    print(f"  ❌ Missing: {verification['missing']}")
+    if verification['unverified']:
+        print(f"  🔌 Not checked (lookup failed): {verification['unverified']}")
+    
     # Final stats
     final_stats = supabase_cache.get_stats()
     print(f"\n📊 Final Supabase cache: {final_stats['total_drafts']} drafts")
@@ -113,21 +144,37 @@ def migrate_to_supabase(cache_data):
     
     return migration_result['migrated'] > 0
 
+def parse_args(argv=None):
+    """Command line options (positional file/campaign still work for older invocations)"""
+    parser = argparse.ArgumentParser(
+        description="Convert Streamlit Cloud email drafts to cache format and optionally migrate them to Supabase",
+        epilog="Example: python3 convert_streamlit_drafts_to_cache.py --drafts-file streamlit_drafts.json "
+               "--campaign wonder_fall2025_nonshop --migrate"
+    )
+    parser.add_argument('drafts_file_arg', nargs='?', metavar='drafts_json_file', help=argparse.SUPPRESS)
+    parser.add_argument('campaign_arg', nargs='?', metavar='campaign_name', help=argparse.SUPPRESS)
+    parser.add_argument('--drafts-file', help="Drafts JSON downloaded from Streamlit Cloud")
+    parser.add_argument('--campaign', help="Campaign name (default: wonder_fall2025_nonshop)")
+    parser.add_argument('--migrate', action=argparse.BooleanOptionalAction, default=None,
+                        help="Migrate to Supabase after converting (default: ask in a terminal, skip otherwise)")
+    parser.add_argument('--batch-size', type=int, default=1000, help="Rows per Supabase upsert (default: 1000)")
+    args = parser.parse_args(argv)
+    
+    args.drafts_file = args.drafts_file or args.drafts_file_arg
+    args.campaign = args.campaign or args.campaign_arg or "wonder_fall2025_nonshop"
+    if not args.drafts_file:
+        parser.error("a drafts JSON file is required (--drafts-file)")
+    return args
+
 def main():
     """Main conversion and migration process"""
     
     print("🚀 Streamlit Cloud Drafts Recovery Tool")
     print("=" * 50)
     
-    # Get input parameters
-    if len(sys.argv) < 2:
-        print("Usage: python3 convert_streamlit_drafts_to_cache.py <drafts_json_file> [campaign_name]")
-        print("\nExample:")
-        print("  python3 convert_streamlit_drafts_to_cache.py streamlit_drafts.json wonder_fall2025_nonshop")
-        return
-    
-    drafts_file = sys.argv[1]
-    campaign_name = sys.argv[2] if len(sys.argv) > 2 else "wonder_fall2025_nonshop"
+    args = parse_args()
+    drafts_file = args.drafts_file
+    campaign_name = args.campaign
     
     if not os.path.exists(drafts_file):
         print(f"❌ File not found: {drafts_file}")
@@ -141,13 +188,15 @@ def main():
     
     cache_data, cache_file = result
     
-    # Ask if user wants to migrate to Supabase
     print(f"\n📋 Converted {len(cache_data)} drafts for campaign '{campaign_name}'")
     
-    migrate = input("\n🚀 Migrate to Supabase now? (y/n): ").lower().strip()
+    # Only prompt when run interactively - cron/CI runs go by the flag (no flag = don't migrate)
+    migrate = args.migrate
+    if migrate is None and sys.stdin.isatty():
+        migrate = input("\n🚀 Migrate to Supabase now? (y/n): ").lower().strip() in ('y', 'yes')
     
-    if migrate == 'y' or migrate == 'yes':
-        success = migrate_to_supabase(cache_data)
+    if migrate:
+        success = migrate_to_supabase(cache_data, batch_size=args.batch_size)
         if success:
             print("\n🎉 Recovery completed successfully!")
             print("Your Streamlit Cloud drafts are now safely stored in Supabase")
@@ -155,7 +204,7 @@ def main():
             print("\n⚠️  Migration had issues - check the output above")
     else:
         print(f"\n💾 Cache data saved to: {cache_file}")
-        print("You can migrate later using: python3 migrate_email_cache_to_supabase.py")
+        print(f"You can migrate later using: python3 convert_streamlit_drafts_to_cache.py --drafts-file {drafts_file} --campaign {campaign_name} --migrate")
     
     print("\n✅ Process complete!")
 
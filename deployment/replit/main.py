@@ -1,22 +1,49 @@
 #!/usr/bin/env python
 """
 Simple entry point for Replit - alternative to run_app.py
+Runs Streamlit inside this interpreter; pass --subprocess to launch it as a child process instead
 """
 import os
 import sys
 import subprocess
 
+APP_SCRIPT = "app/creator_review_app.py"
+
 # Set up environment
 os.environ['STREAMLIT_SERVER_PORT'] = '8501'
 os.environ['STREAMLIT_SERVER_ADDRESS'] = '0.0.0.0'
 os.environ['STREAMLIT_SERVER_HEADLESS'] = 'true'
 
-# Run streamlit directly
-subprocess.run([
-    sys.executable, "-m", "streamlit", "run",
-    "app/creator_review_app.py",
-    "--server.port", "8501",
-    "--server.address", "0.0.0.0",
-    "--server.headless", "true",
-    "--browser.gatherUsageStats", "false"
-])
\ No newline at end of file
+
+def run_in_process():
+    """Start Streamlit's server in this interpreter (same as `streamlit run`, minus a second Python startup)"""
+    from streamlit.web import bootstrap
+
+    # Keys as the streamlit CLI passes them (section_option)
+    flag_options = {
+        'server_port': 8501,
+        'server_address': '0.0.0.0',
+        'server_headless': True,
+        'browser_gatherUsageStats': False
+    }
+    bootstrap.load_config_options(flag_options=flag_options)
+    bootstrap.run(APP_SCRIPT, False, [], flag_options)
+
+
+def run_subprocess():
+    """Run streamlit as a child process"""
+    subprocess.run([
+        sys.executable, "-m", "streamlit", "run",
+        APP_SCRIPT,
+        "--server.port", "8501",
+        "--server.address", "0.0.0.0",
+        "--server.headless", "true",
+        "--browser.gatherUsageStats", "false"
+    ])
+
+
+if __name__ == "__main__":
+    if '--subprocess' in sys.argv[1:]:
+        run_subprocess()
+    else:
+        run_in_process()
@@ -3,49 +3,134 @@
 Start both Streamlit and Email Scheduler for Replit Deployment
 This ensures both services run when deployed
 """
+import signal
 import subprocess
 import threading
 import time
 import os
 import sys
 
+# Restart backoff for a crashing scheduler (doubles per crash, capped)
+RESTART_DELAY = 5
+MAX_RESTART_DELAY = 300
+# A child that stayed up this long counts as healthy - reset the backoff
+HEALTHY_RUN_SECONDS = 60
+# How long children get to finish (e.g. an in-flight send) after SIGTERM
+SHUTDOWN_GRACE_SECONDS = 20
+
+_stopping = threading.Event()
+_children = []
+_children_lock = threading.RLock()  # re-entered when the signal handler interrupts the main thread
+
+
+def _spawn(cmd):
+    """Start a child process, unless we're already shutting down"""
+    with _children_lock:
+        if _stopping.is_set():
+            return None
+        proc = subprocess.Popen(cmd)
+        _children.append(proc)
+        return proc
+
+
+def _reap(proc):
+    with _children_lock:
+        _children.remove(proc)
+
+
 def run_scheduler():
-    """Run the email scheduler in background"""
+    """Supervise the email scheduler process: restart on exit with exponential backoff"""
     print("🚀 Starting Email Scheduler Service...")
-    while True:
+    delay = RESTART_DELAY
+    while not _stopping.is_set():
+        started = time.monotonic()
         try:
-            # Run the scheduler
-            subprocess.run([sys.executable, "email_scheduler_service.py"])
-        except Exception as e:
-            print(f"Scheduler crashed, restarting in 30s: {e}")
-            time.sleep(30)
+            proc = _spawn([sys.executable, "email_scheduler_service.py"])
+        except OSError as e:
+            proc = None
+            returncode = e
+        if proc is not None:
+            returncode = proc.wait()
+            _reap(proc)
+        if _stopping.is_set():
+            break
+        
+        if time.monotonic() - started >= HEALTHY_RUN_SECONDS:
+            delay = RESTART_DELAY
+        print(f"⚠️ Scheduler exited ({returncode}), restarting in {delay}s")
+        _stopping.wait(delay)
+        delay = min(delay * 2, MAX_RESTART_DELAY)
+
 
-def run_streamlit():
+def run_streamlit(headless=False):
     """Run the Streamlit app"""
     print("🎯 Starting Streamlit App...")
     os.environ['STREAMLIT_SERVER_PORT'] = '8501'
     os.environ['STREAMLIT_SERVER_ADDRESS'] = '0.0.0.0'
     
-    subprocess.run([
+    cmd = [
         sys.executable, "-m", "streamlit", "run",
         "app/creator_review_app.py",
         "--server.port", "8501",
         "--server.address", "0.0.0.0"
-    ])
+    ]
+    if headless:
+        os.environ['STREAMLIT_SERVER_HEADLESS'] = 'true'
+        cmd += ["--server.headless", "true", "--browser.gatherUsageStats", "false"]
+    
+    proc = _spawn(cmd)
+    if proc is not None:
+        proc.wait()
+        _reap(proc)
 
-if __name__ == "__main__":
+
+def shutdown(signum=None, frame=None):
+    """Stop restarting and ask every child to terminate"""
+    _stopping.set()
+    with _children_lock:
+        for proc in _children:
+            if proc.poll() is None:
+                proc.terminate()
+
+
+def _wait_for_children():
+    """Give children the grace period, then kill whatever is left"""
+    deadline = time.monotonic() + SHUTDOWN_GRACE_SECONDS
+    with _children_lock:
+        children = list(_children)
+    for proc in children:
+        try:
+            proc.wait(timeout=max(0, deadline - time.monotonic()))
+        except subprocess.TimeoutExpired:
+            print(f"⚠️ Child {proc.pid} didn't exit in {SHUTDOWN_GRACE_SECONDS}s - killing")
+            proc.kill()
+
+
+def main(headless=False):
+    """Supervise the scheduler process and run Streamlit; returns once everything has stopped"""
     print("="*50)
     print("🎯 Starting Influencer Finder Services")
     print("📧 Email Scheduler + Streamlit App")
     print("="*50)
     
-    # Start scheduler in background thread
-    scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
+    signal.signal(signal.SIGTERM, shutdown)
+    signal.signal(signal.SIGINT, shutdown)
+    
+    # Supervise the scheduler from a regular (non-daemon) thread so shutdown waits for it
+    scheduler_thread = threading.Thread(target=run_scheduler, name="scheduler-supervisor")
     scheduler_thread.start()
     print("✅ Email scheduler started in background")
     
     # Wait a moment for scheduler to initialize
-    time.sleep(3)
+    _stopping.wait(3)
     
-    # Run Streamlit in main thread
-    run_streamlit()
\ No newline at end of file
+    # Run Streamlit in main thread - when it exits, stop everything
+    run_streamlit(headless=headless)
+    shutdown()
+    _wait_for_children()
+    scheduler_thread.join()
+    print("👋 Services stopped")
+
+
+if __name__ == "__main__":
+    main()
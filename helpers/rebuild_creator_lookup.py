@@ -2,53 +2,92 @@
 """
 Rebuild creator_lookup.csv from cached creator data
 """
-import json
 import pandas as pd
 import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import fast_json
+from utils.creator_profiles import profiles_path
+
+# Lookup column -> (profile field, default when missing)
+LOOKUP_COLUMNS = {
+    'username': ('username', None),
+    'nickname': ('nickname', ''),
+    'bio': ('signature', ''),
+    'follower_count': ('followers', 0),
+    'following_count': ('following', 0),
+    'video_count': ('videos', 0),
+    'verified': ('verified', False),
+    'sec_uid': ('sec_uid', ''),
+}
+
+def _lookup_from_profiles_jsonl(jsonl_file):
+    """Lookup DataFrame from the profiles JSONL - parsed and flattened by pandas, no Python row loop"""
+    records = pd.read_json(jsonl_file, lines=True, dtype=False, convert_dates=False)
+    if records.empty:
+        return pd.DataFrame(columns=list(LOOKUP_COLUMNS))
+    profiles = pd.json_normalize(records['profile'].tolist(), max_level=0)
+    
+    df = pd.DataFrame(index=profiles.index)
+    for column, (field, default) in LOOKUP_COLUMNS.items():
+        if column == 'username':
+            # Fall back to the cache key when the profile has no username
+            values = profiles[field] if field in profiles else pd.Series(None, index=profiles.index)
+            df[column] = values.fillna(records['username'])
+        elif field in profiles:
+            df[column] = profiles[field].fillna(default)
+        else:
+            df[column] = default
+    return df
+
+def _lookup_from_cache_json(cache_file):
+    """Lookup DataFrame from creator_cache.json - builds the columns directly in one pass"""
+    with open(cache_file, 'rb') as f:
+        creator_cache = fast_json.loads(f.read())
+    
+    columns = {column: [] for column in LOOKUP_COLUMNS}
+    usernames = columns['username']
+    for username, data in creator_cache.items():
+        if not (data.get('success') and 'profile' in data):
+            continue
+        profile = data['profile']
+        usernames.append(profile.get('username', username))
+        for column, (field, default) in LOOKUP_COLUMNS.items():
+            if column != 'username':
+                columns[column].append(profile.get(field, default))
+    return pd.DataFrame(columns)
 
 def rebuild_creator_lookup(dataset_name="radar_5k_quitmyjob"):
     """Rebuild creator_lookup.csv from dataset-specific creator cache"""
     
-    cache_file = f"cache/screening/{dataset_name}_cache/creator_cache.json"
+    cache_dir = f"cache/screening/{dataset_name}_cache"
+    cache_file = os.path.join(cache_dir, "creator_cache.json")
+    jsonl_file = profiles_path(cache_dir)
     
-    if not os.path.exists(cache_file):
+    # Prefer the line-delimited profiles written alongside the cache, if they're up to date
+    if os.path.exists(jsonl_file) and (
+        not os.path.exists(cache_file) or os.path.getmtime(jsonl_file) >= os.path.getmtime(cache_file)
+    ):
+        df = _lookup_from_profiles_jsonl(jsonl_file)
+    elif os.path.exists(cache_file):
+        df = _lookup_from_cache_json(cache_file)
+    else:
         print("❌ No creator cache found!")
         return
     
-    # Load cached creator data
-    with open(cache_file, 'r') as f:
-        creator_cache = json.load(f)
-    
-    # Extract creator profile data
-    creator_data = []
-    for username, data in creator_cache.items():
-        if data.get('success') and 'profile' in data:
-            profile = data['profile']
-            creator_row = {
-                'username': profile.get('username', username),
-                'nickname': profile.get('nickname', ''),
-                'bio': profile.get('signature', ''),
-                'follower_count': profile.get('followers', 0),
-                'following_count': profile.get('following', 0),
-                'video_count': profile.get('videos', 0),
-                'verified': profile.get('verified', False),
-                'sec_uid': profile.get('sec_uid', '')
-            }
-            creator_data.append(creator_row)
-    
-    if not creator_data:
+    if df.empty:
         print("❌ No valid creator data found in cache!")
         return
     
     # Save to CSV with dataset-specific name
     output_file = f'data/outputs/{dataset_name}_creator_lookup.csv'
     os.makedirs('data/outputs', exist_ok=True)
-    df = pd.DataFrame(creator_data)
     df.to_csv(output_file, index=False)
     
-    print(f"✅ Rebuilt {output_file} with {len(creator_data)} creators:")
-    for creator in creator_data:
-        print(f"   • @{creator['username']} - {creator['follower_count']:,} followers")
+    print(f"✅ Rebuilt {output_file} with {len(df)} creators:")
+    for username, follower_count in zip(df['username'], df['follower_count']):
+        print(f"   • @{username} - {follower_count:,} followers")
 
 if __name__ == "__main__":
-    rebuild_creator_lookup()
\ No newline at end of file
+    rebuild_creator_lookup()
@@ -1,13 +1,174 @@
 #!/usr/bin/env python3
 """
-Rebuild creator_post_lookup.csv from cached shoppable data
+Rebuild the creator post lookup from cached shoppable data
+Writes Parquet (snappy) when pyarrow is installed; pass --csv for a human-readable CSV
 """
-import json
+import csv
 import pandas as pd
 import os
+import sys
 
-def rebuild_post_lookup(dataset_name="radar_5k_quitmyjob"):
-    """Rebuild creator_post_lookup.csv from dataset-specific caches"""
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import fast_json
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+try:
+    import pyarrow  # noqa: F401 - pandas' Parquet engine
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# Lookup column -> (flattened post field, default when missing), in output order
+POST_COLUMNS = {
+    'url': ('tiktok_url', ''),
+    'creator_username': ('creator_username', ''),
+    'is_shoppable': (None, False),  # from the shoppable cache
+    'post_id': ('id', ''),
+    'description': ('description', ''),
+    'create_time': ('create_time', 0),
+    'formatted_date': ('formatted_date', ''),
+    'duration': ('duration', 0),
+    'is_photo_post': ('is_photo_post', False),
+    'content_type': ('content_type', 'video'),
+    'views': ('stats.views', 0),
+    'likes': ('stats.likes', 0),
+    'comments': ('stats.comments', 0),
+    'shares': ('stats.shares', 0),
+}
+
+# Parquet columns that get a tighter type than the default for their kind
+PARQUET_DTYPE_OVERRIDES = {
+    'duration': 'int32',  # seconds - never near 2**31
+    'content_type': 'category',  # a handful of values (video/photo) - stored dictionary-encoded
+}
+
+# Coalesce per-row CSV writes into 1 MiB write() calls
+WRITE_BUFFER_SIZE = 1 << 20
+
+# Tuple rows handed to csv.writer.writerows per call (no per-row dict or DictWriter lookup)
+CSV_BATCH_ROWS = 1000
+
+def _iter_creators(creator_cache_file):
+    """Yield (username, creator_data) from the creator cache one at a time (streamed with ijson when installed)"""
+    with open(creator_cache_file, 'rb') as f:
+        if IJSON_AVAILABLE:
+            # Top-level object parsed incrementally - only one creator is in memory at a time
+            yield from ijson.kvitems(f, '', use_float=True)
+        else:
+            yield from fast_json.loads(f.read()).items()
+
+def _load_shoppable_sets(shoppable_cache_file):
+    """(every checked URL, URLs found shoppable) as frozensets - streamed with ijson so the full dict is never built"""
+    with open(shoppable_cache_file, 'rb') as f:
+        if IJSON_AVAILABLE:
+            items = ijson.kvitems(f, '')
+        else:
+            items = fast_json.loads(f.read()).items()
+        checked = []
+        shoppable = []
+        for url, is_shoppable in items:
+            checked.append(url)
+            if is_shoppable:
+                shoppable.append(url)
+    return frozenset(checked), frozenset(shoppable)
+
+def _iter_matching_posts(creator_cache_file, checked_urls, counts):
+    """Yield (username, post) for every post we checked for shoppable content (counts['creators'] tallies creators)"""
+    for username, creator_data in _iter_creators(creator_cache_file):
+        counts['creators'] += 1
+        if not creator_data.get('success'):
+            continue
+        for post in creator_data.get('posts', []):
+            if post.get('tiktok_url', '') in checked_urls:
+                yield username, post
+
+def _post_values(username, post, shoppable_urls):
+    """One lookup row (POST_COLUMNS order) for a post, as a plain tuple for csv.writer"""
+    url = post.get('tiktok_url', '')
+    stats = post.get('stats', {})
+    return (
+        url,
+        username,
+        url in shoppable_urls,
+        post.get('id', ''),
+        post.get('description', ''),
+        post.get('create_time', 0),
+        post.get('formatted_date', ''),
+        post.get('duration', 0),
+        post.get('is_photo_post', False),
+        post.get('content_type', 'video'),
+        stats.get('views', 0),
+        stats.get('likes', 0),
+        stats.get('comments', 0),
+        stats.get('shares', 0)
+    )
+
+def _write_csv(posts, shoppable_urls, output_file):
+    """Stream rows into the CSV in CSV_BATCH_ROWS writerows() batches, keeping only counters. Returns (posts, shoppable, unique creators)"""
+    total_count = 0
+    shoppable_count = 0
+    unique_creators = set()
+    batch = []
+    with open(output_file, 'w', newline='', buffering=WRITE_BUFFER_SIZE) as f:
+        writer = csv.writer(f)
+        writer.writerow(POST_COLUMNS)
+        for username, post in posts:
+            row = _post_values(username, post, shoppable_urls)
+            batch.append(row)
+            shoppable_count += bool(row[2])
+            unique_creators.add(username)
+            if len(batch) >= CSV_BATCH_ROWS:
+                writer.writerows(batch)
+                total_count += len(batch)
+                batch.clear()
+        writer.writerows(batch)
+        total_count += len(batch)
+    return total_count, shoppable_count, len(unique_creators)
+
+def _to_parquet_dtypes(df):
+    """Tight column types for Parquet: bool flags, int64 counters, Arrow-backed strings (plus PARQUET_DTYPE_OVERRIDES)"""
+    types = {}
+    for column, (field, default) in POST_COLUMNS.items():
+        if column in PARQUET_DTYPE_OVERRIDES:
+            types[column] = PARQUET_DTYPE_OVERRIDES[column]
+        elif type(default) is bool:
+            types[column] = bool
+        elif type(default) is int:
+            types[column] = 'int64'
+        else:
+            types[column] = 'string[pyarrow]'
+    return df.astype(types)
+
+def _write_parquet(posts, shoppable_urls, output_file):
+    """Build the columns straight from per-post tuples and write snappy Parquet. Returns (posts, shoppable, unique creators)"""
+    rows = [_post_values(username, post, shoppable_urls) for username, post in posts]
+    if not rows:
+        return 0, 0, 0
+    
+    # Tuples go column-wise into the frame in one step - no per-post dict copy or json_normalize pass
+    df = pd.DataFrame.from_records(rows, columns=list(POST_COLUMNS))
+    # Explicit nulls in the cache get the same defaults as missing fields
+    df = df.fillna({column: default for column, (field, default) in POST_COLUMNS.items()})
+    
+    _to_parquet_dtypes(df).to_parquet(output_file, engine='pyarrow', compression='snappy', index=False)
+    return len(df), int(df['is_shoppable'].astype(bool).sum()), df['creator_username'].nunique()
+
+def rebuild_post_lookup(dataset_name="radar_5k_quitmyjob", output_format=None):
+    """
+    Rebuild the creator post lookup from dataset-specific caches
+    
+    output_format: 'parquet' or 'csv' (default: parquet if pyarrow is installed, else csv)
+    """
+    if output_format is None:
+        output_format = 'parquet' if PYARROW_AVAILABLE else 'csv'
+    elif output_format == 'parquet' and not PYARROW_AVAILABLE:
+        print("⚠️ pyarrow not installed - writing CSV instead")
+        output_format = 'csv'
     
     creator_cache_file = f"cache/screening/{dataset_name}_cache/creator_cache.json"
     shoppable_cache_file = f"cache/screening/{dataset_name}_cache/shoppable_cache.json"
@@ -21,64 +182,40 @@ def rebuild_post_lookup(dataset_name="radar_5k_quitmyjob"):
         return
     
     # Load cached data
-    with open(shoppable_cache_file, 'r') as f:
-        shoppable_cache = json.load(f)
-    
-    with open(creator_cache_file, 'r') as f:
-        creator_cache = json.load(f)
-    
-    print(f"📊 Found {len(shoppable_cache)} cached shoppable posts")
-    print(f"📊 Found {len(creator_cache)} cached creators")
-    
-    # Rebuild detailed post lookup data
-    post_data = []
-    
-    for username, creator_data in creator_cache.items():
-        if creator_data.get('success') and 'posts' in creator_data:
-            for post in creator_data['posts']:
-                url = post.get('tiktok_url', '')
-                if url in shoppable_cache:  # Only include posts we checked for shoppable content
-                    post_row = {
-                        'url': url,
-                        'creator_username': username,
-                        'is_shoppable': shoppable_cache[url],
-                        'post_id': post.get('id', ''),
-                        'description': post.get('description', ''),
-                        'create_time': post.get('create_time', 0),
-                        'formatted_date': post.get('formatted_date', ''),
-                        'duration': post.get('duration', 0),
-                        'is_photo_post': post.get('is_photo_post', False),
-                        'content_type': post.get('content_type', 'video'),
-                        'views': post.get('stats', {}).get('views', 0),
-                        'likes': post.get('stats', {}).get('likes', 0),
-                        'comments': post.get('stats', {}).get('comments', 0),
-                        'shares': post.get('stats', {}).get('shares', 0)
-                    }
-                    post_data.append(post_row)
-    
-    if not post_data:
-        print("❌ No post data found!")
-        return
+    checked_urls, shoppable_urls = _load_shoppable_sets(shoppable_cache_file)
     
-    # Save to CSV
-    output_file = f'data/outputs/{dataset_name}_creator_post_lookup.csv'
+    print(f"📊 Found {len(checked_urls)} cached shoppable posts")
+    
+    output_file = f'data/outputs/{dataset_name}_creator_post_lookup.{output_format}'
     os.makedirs('data/outputs', exist_ok=True)
-    df = pd.DataFrame(post_data)
-    df.to_csv(output_file, index=False)
     
-    print(f"✅ Rebuilt {output_file} with {len(post_data)} posts")
+    # Creators are streamed from the cache straight into the writer
+    counts = {'creators': 0}
+    posts = _iter_matching_posts(creator_cache_file, checked_urls, counts)
+    if output_format == 'parquet':
+        total_count, shoppable_count, unique_creators = _write_parquet(posts, shoppable_urls, output_file)
+    else:
+        total_count, shoppable_count, unique_creators = _write_csv(posts, shoppable_urls, output_file)
+    
+    print(f"📊 Found {counts['creators']} cached creators")
+    
+    if not total_count:
+        if os.path.exists(output_file):
+            os.remove(output_file)
+        print("❌ No post data found!")
+        return
+    
+    print(f"✅ Rebuilt {output_file} with {total_count} posts")
     
     # Show breakdown
-    shoppable_count = sum(1 for row in post_data if row['is_shoppable'])
-    not_shoppable_count = len(post_data) - shoppable_count
     print(f"   ✅ Shoppable posts: {shoppable_count}")
-    print(f"   ❌ Not shoppable: {not_shoppable_count}")
+    print(f"   ❌ Not shoppable: {total_count - shoppable_count}")
     
     # Show creators breakdown
-    unique_creators = len(set(row['creator_username'] for row in post_data))
     print(f"   👥 Unique creators: {unique_creators}")
     
     return output_file
 
 if __name__ == "__main__":
-    rebuild_post_lookup()
\ No newline at end of file
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    rebuild_post_lookup(*args[:1], output_format='csv' if '--csv' in sys.argv else None)
@@ -2,7 +2,7 @@
 """
 Migration script to move AI analyses from creator_reviews.json to ai_analysis_cache.json
 """
-import json
+import functools
 import os
 import sys
 from datetime import datetime
@@ -10,6 +10,34 @@ from datetime import datetime
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from utils.ai_analysis_cache import AIAnalysisCache
+from utils import fast_json
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Both campaigns have similar briefs, so every review is filed under the default campaign
+DEFAULT_CAMPAIGN = "wonder_fall2025"
+
+@functools.lru_cache(maxsize=8)
+def normalize_recommendation(recommendation):
+    """Map a free-form recommendation to Yes/No/Maybe (memoized - reviews reuse a handful of values)"""
+    return {
+        'recommended': 'Yes',
+        'yes': 'Yes',
+        'not recommended': 'No',
+        'no': 'No'
+    }.get(recommendation.lower(), 'Maybe')
+
+def _iter_reviews(reviews_file):
+    """Yield (username, review_data) from creator_reviews.json one at a time (streamed with ijson when installed)"""
+    with open(reviews_file, 'rb') as f:
+        if IJSON_AVAILABLE:
+            yield from ijson.kvitems(f, '', use_float=True)
+        else:
+            yield from fast_json.loads(f.read()).items()
 
 def migrate_analyses():
     """Migrate analyses from creator_reviews.json to AI cache"""
@@ -20,18 +48,18 @@ def migrate_analyses():
         print(f"❌ {reviews_file} not found")
         return
     
-    with open(reviews_file, 'r') as f:
-        reviews = json.load(f)
-    
-    print(f"📁 Found {len(reviews)} entries in creator_reviews.json")
-    
-    # Initialize AI cache
+    # Initialize AI cache - loaded once for every lookup, written once at the end
     ai_cache = AIAnalysisCache()
+    cache_data = ai_cache.load_cache()
+    to_migrate = []
     
     migrated_count = 0
     skipped_count = 0
+    total_count = 0
     
-    for username, review_data in reviews.items():
+    # Reviews are streamed one at a time
+    for username, review_data in _iter_reviews(reviews_file):
+        total_count += 1
         # Extract required fields
         analysis = review_data.get('analysis', '')
         campaign_brief = review_data.get('campaign_brief', '')
@@ -42,45 +70,36 @@ def migrate_analyses():
             skipped_count += 1
             continue
         
-        # Determine campaign name from the brief
-        # Both campaigns have similar briefs, let's map based on timing or default to wonder_fall2025
-        campaign_name = "wonder_fall2025"  # Default
+        campaign_name = DEFAULT_CAMPAIGN
         
         # Check if this analysis already exists in cache
-        existing = ai_cache.get_cached_analysis(username, campaign_name)
+        existing = ai_cache.get_cached_analysis(username, campaign_name, cache=cache_data)
         if existing:
             print(f"✅ {username} already in cache, skipping")
             skipped_count += 1
             continue
         
-        # Normalize recommendation format
-        if recommendation.lower() in ['recommended', 'yes']:
-            recommendation = 'Yes'
-        elif recommendation.lower() in ['not recommended', 'no']:
-            recommendation = 'No'
-        else:
-            recommendation = 'Maybe'
-        
-        try:
-            # Save to AI cache
-            ai_cache.save_analysis(
-                username=username,
-                campaign_name=campaign_name,
-                campaign_brief=campaign_brief.strip(),
-                analysis=analysis,
-                recommendation=recommendation
-            )
-            print(f"✅ Migrated {username} to AI cache")
-            migrated_count += 1
-            
-        except Exception as e:
-            print(f"❌ Failed to migrate {username}: {e}")
-            skipped_count += 1
+        to_migrate.append({
+            'username': username,
+            'campaign_name': campaign_name,
+            'campaign_brief': campaign_brief.strip(),
+            'analysis': analysis,
+            'recommendation': normalize_recommendation(recommendation)
+        })
+        print(f"✅ Queued {username} for AI cache")
+    
+    try:
+        # Save to AI cache in one write
+        ai_cache.save_analyses(to_migrate)
+        migrated_count = len(to_migrate)
+    except Exception as e:
+        print(f"❌ Failed to save {len(to_migrate)} analyses: {e}")
+        skipped_count += len(to_migrate)
     
     print(f"\n📊 Migration complete:")
     print(f"   ✅ Migrated: {migrated_count}")
     print(f"   ⚠️  Skipped: {skipped_count}")
-    print(f"   📁 Total: {len(reviews)}")
+    print(f"   📁 Total: {total_count} entries in {reviews_file}")
     
     # Show cache stats
     cache_data = ai_cache.load_cache()
@@ -1,10 +1,12 @@
 """
 Process the remaining creators that weren't completed in the main batch
 """
+import asyncio
 import csv
-import time
+import sqlite3
 from clients.creator_data_client import CreatorDataClient
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database
+from utils.rate_limiter import TokenBucket
 
 # Initialize clients
 import os
@@ -15,98 +17,169 @@ tikapi_key = "V0XpslK6h17qiYoa1JQq0eM9MdTRhqeY"
 brightdata_token = os.getenv('BRIGHTDATA_TOKEN', '36c74962-d03a-41c1-b261-7ea4109ec8bd')
 
 client = CreatorDataClient(tikapi_key=tikapi_key, brightdata_token=brightdata_token)
-content_db = ContentDatabase()
+content_db = open_content_database()
+
+# Concurrent fetches on one event loop, throttled to REQUESTS_PER_SECOND overall
+MAX_IN_FLIGHT = 8
+REQUESTS_PER_SECOND = 4
+rate_limiter = TokenBucket(rate=REQUESTS_PER_SECOND)
 
 # Read remaining creators
 with open('remaining_creators.csv', 'r') as f:
     reader = csv.DictReader(f)
-    remaining_creators = [row['username'] for row in reader]
+    # Ordered and de-duplicated, so nobody is fetched twice
+    remaining_creators = list(dict.fromkeys(row['username'] for row in reader))
 
-print(f"📦 Processing {len(remaining_creators)} remaining creators")
+print(f"📦 Processing {len(remaining_creators)} remaining creators ({MAX_IN_FLIGHT} in flight, {REQUESTS_PER_SECOND} req/s)")
 print("="*60)
 
-qualified = []
-processed = 0
-errors = 0
 
-for username in remaining_creators:
-    processed += 1
-    print(f"[{processed}/{len(remaining_creators)}] @{username}", end=" - ")
+def evaluate(username, creator_data):
+    """Qualify a fetched creator; returns (qualified dict or None, status line, is_error)"""
+    posts = (creator_data or {}).get('posts') or []
     
-    try:
-        # Fetch creator data
-        creator_data = client.get_creator_analysis(username, post_count=15)
-        
-        if not creator_data or not creator_data.get('posts'):
-            print("❌ Failed to fetch data")
-            errors += 1
-            continue
-            
-        # Check if they have shoppable content
-        has_shop = any(post.get('is_shop', False) for post in creator_data.get('posts', []))
-        
-        avg_views = creator_data.get('avg_video_views', 0)
+    if not posts:
+        return None, "❌ Failed to fetch data", True
         
-        if has_shop and avg_views > 0:
-            print(f"✅ QUALIFIED - {avg_views:,} avg views")
-            qualified.append({
-                'username': username,
-                'avg_views': avg_views,
-                'follower_count': creator_data.get('follower_count', 0),
-                'bio': creator_data.get('biography', ''),
-                'email': creator_data.get('email', '')
-            })
+    # Check if they have shoppable content
+    has_shop = any(post.get('is_shop', False) for post in posts)
+    
+    avg_views = creator_data.get('avg_video_views', 0)
+    
+    if has_shop and avg_views > 0:
+        return {
+            'username': username,
+            'avg_views': avg_views,
+            'follower_count': creator_data.get('follower_count', 0),
+            'bio': creator_data.get('biography', ''),
+            'email': creator_data.get('email', '')
+        }, f"✅ QUALIFIED - {avg_views:,} avg views", False
+    return None, f"❌ Not qualified (shop={has_shop}, views={avg_views})", False
+
+
+async def fetch_all(usernames):
+    """Yield (username, creator_data or exception) as each fetch finishes"""
+    semaphore = asyncio.Semaphore(MAX_IN_FLIGHT)
+    
+    async def fetch_one(username):
+        async with semaphore:
+            await rate_limiter.acquire_async()
+            try:
+                return username, await client.get_creator_analysis_async(username, post_count=15)
+            except Exception as e:
+                return username, e
+    
+    for finished in asyncio.as_completed([fetch_one(u) for u in usernames]):
+        yield await finished
+
+
+async def process_all():
+    """Fetch every remaining creator concurrently; returns (qualified by username, errors)"""
+    qualified = {}
+    errors = 0
+    processed = 0
+    async for username, creator_data in fetch_all(remaining_creators):
+        processed += 1
+        if isinstance(creator_data, Exception):
+            creator, status, is_error = None, f"❌ Error: {str(creator_data)}", True
         else:
-            print(f"❌ Not qualified (shop={has_shop}, views={avg_views})")
-            
-    except Exception as e:
-        print(f"❌ Error: {str(e)}")
-        errors += 1
-        
-    # Small delay to avoid rate limits
-    time.sleep(0.5)
+            creator, status, is_error = evaluate(username, creator_data)
+        print(f"[{processed}/{len(remaining_creators)}] @{username} - {status}")
+        if creator:
+            qualified[username] = creator
+        if is_error:
+            errors += 1
+    return qualified, errors
+
+
+qualified, errors = asyncio.run(process_all())
 
 print("\n" + "="*60)
 print(f"✅ Found {len(qualified)} more qualified creators!")
 print(f"❌ Errors: {errors}")
 
 # Append to existing CSV
+LOOKUP_CSV = 'creator_lookup.csv'
+LOOKUP_INDEX = 'creator_lookup.sqlite'
+LOOKUP_FIELDS = ['username', 'nickname', 'bio', 'follower_count', 'following_count',
+                 'video_count', 'verified', 'sec_uid']
+
+
+def open_lookup_index():
+    """
+    Username index for creator_lookup.csv (SQLite, one PRIMARY KEY column) so duplicate
+    checks don't re-read the whole CSV. Re-seeded from the CSV only when the CSV changed
+    since the index last saw it (screen_creators*.py rewrite it wholesale).
+    """
+    conn = sqlite3.connect(LOOKUP_INDEX)
+    conn.execute("CREATE TABLE IF NOT EXISTS creators (username TEXT PRIMARY KEY)")
+    conn.execute("CREATE TABLE IF NOT EXISTS metadata (key TEXT PRIMARY KEY, value TEXT)")
+    
+    csv_mtime = str(os.path.getmtime(LOOKUP_CSV)) if os.path.exists(LOOKUP_CSV) else ''
+    row = conn.execute("SELECT value FROM metadata WHERE key = 'csv_mtime'").fetchone()
+    if (row[0] if row else None) != csv_mtime:
+        with conn:
+            conn.execute("DELETE FROM creators")
+            if csv_mtime:
+                with open(LOOKUP_CSV, 'r', newline='') as f:
+                    conn.executemany("INSERT OR IGNORE INTO creators (username) VALUES (?)",
+                                     ((r['username'],) for r in csv.DictReader(f)))
+            conn.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('csv_mtime', ?)", (csv_mtime,))
+    return conn
+
+
+def known_usernames(index, usernames, chunk_size=900):
+    """Subset of usernames already in the index (chunked under SQLite's bound-parameter limit)"""
+    usernames = list(usernames)
+    known = set()
+    for i in range(0, len(usernames), chunk_size):
+        chunk = usernames[i:i + chunk_size]
+        known.update(row[0] for row in index.execute(
+            f"SELECT username FROM creators WHERE username IN ({','.join('?' * len(chunk))})", chunk
+        ))
+    return known
+
+
 if qualified:
-    print("\n💾 Appending to creator_lookup.csv...")
+    print(f"\n💾 Appending to {LOOKUP_CSV}...")
     
-    # Read existing data to check for duplicates
-    existing = set()
-    try:
-        with open('creator_lookup.csv', 'r') as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                existing.add(row['username'])
-    except:
-        pass
+    index = open_lookup_index()
+    write_header = not os.path.exists(LOOKUP_CSV) or os.path.getsize(LOOKUP_CSV) == 0
     
-    # Append new qualified creators
-    file_exists = len(existing) > 0
-    with open('creator_lookup.csv', 'a', newline='') as f:
-        fieldnames = ['username', 'nickname', 'bio', 'follower_count', 'following_count', 
-                     'video_count', 'verified', 'sec_uid']
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        
-        for creator in qualified:
-            if creator['username'] not in existing:
-                writer.writerow({
-                    'username': creator['username'],
-                    'nickname': '',
-                    'bio': creator['bio'],
-                    'follower_count': creator['follower_count'],
-                    'following_count': 0,
-                    'video_count': 0,
-                    'verified': False,
-                    'sec_uid': ''
-                })
+    # New qualified creators only - one membership query, then one write pass
+    existing = known_usernames(index, qualified)
+    new_rows = {
+        username: {
+            'username': username,
+            'nickname': '',
+            'bio': creator['bio'],
+            'follower_count': creator['follower_count'],
+            'following_count': 0,
+            'video_count': 0,
+            'verified': False,
+            'sec_uid': ''
+        }
+        for username, creator in qualified.items() if username not in existing
+    }
+    added = len(new_rows)
+    
+    with index, open(LOOKUP_CSV, 'a', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=LOOKUP_FIELDS)
+        if write_header:
+            writer.writeheader()
+        writer.writerows(new_rows.values())
+        index.executemany("INSERT OR IGNORE INTO creators (username) VALUES (?)",
+                          ((username,) for username in new_rows))
+    
+    # Our own append shouldn't force a re-seed next run
+    with index:
+        index.execute("INSERT OR REPLACE INTO metadata (key, value) VALUES ('csv_mtime', ?)",
+                      (str(os.path.getmtime(LOOKUP_CSV)),))
+    index.close()
     
-    print(f"✅ Added {len(qualified)} new qualified creators")
+    print(f"✅ Added {added} new qualified creators ({len(qualified) - added} already in {LOOKUP_CSV})")
     print("\nNew qualified creators:")
-    for creator in qualified:
-        print(f"  @{creator['username']} - {creator['avg_views']:,} avg views")
+    for username, creator in qualified.items():
+        print(f"  @{username} - {creator['avg_views']:,} avg views")
 
 print("\n✨ Processing complete!")
\ No newline at end of file
@@ -7,22 +7,22 @@ from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
 from utils.zoho_native_scheduler import ZohoNativeScheduler
 
+SUBJECT = "TikTok Shop Collab with Wonder ✨"
+ATTACHMENT_PATH = '/Users/oliviachen/influencer_finder/shared_attachments/Wonder_InfluenceKit_fall2025.pdf'
+INTERVAL_MINUTES = 3
+
 # Read the CSV file
-creators_to_email = []
 with open('schedule_batch_emails.csv', 'r') as f:
-    reader = csv.DictReader(f)
-    for row in reader:
-        creators_to_email.append({
-            'username': row['creator_username'],
-            'email': row['email']
-        })
+    creators_to_email = [
+        {'username': row['creator_username'], 'email': row['email']}
+        for row in csv.DictReader(f)
+    ]
 
 print(f"📧 Preparing to schedule {len(creators_to_email)} emails")
 print("="*60)
 
 # Email template - personalized with username
-def create_email_body(username):
-    return f"""
+BODY_TEMPLATE = """
 <html>
 <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
 <p>Hi {username}!</p>
@@ -39,6 +39,11 @@ def create_email_body(username):
 </body>
 </html>
 """
+# Split once around the only placeholder; each body is then a single concat
+BODY_HEAD, BODY_TAIL = BODY_TEMPLATE.split('{username}')
+
+def create_email_body(username):
+    return BODY_HEAD + username + BODY_TAIL
 
 # Initialize scheduler
 scheduler = ZohoNativeScheduler()
@@ -48,19 +53,20 @@ pacific_tz = ZoneInfo("US/Pacific")
 tomorrow = datetime.now(pacific_tz).replace(hour=6, minute=0, second=0, microsecond=0) + timedelta(days=1)
 
 print(f"📅 Scheduling emails starting at: {tomorrow.strftime('%Y-%m-%d %I:%M %p %Z')}")
-print(f"⏰ Interval: 3 minutes between emails")
+print(f"⏰ Interval: {INTERVAL_MINUTES} minutes between emails")
 print("="*60)
 
 # Prepare emails for scheduling
-emails_to_schedule = []
-for creator in creators_to_email:
-    emails_to_schedule.append({
+emails_to_schedule = [
+    {
         'username': creator['username'],
         'email': creator['email'],
-        'subject': "TikTok Shop Collab with Wonder ✨",
+        'subject': SUBJECT,
         'body': create_email_body(creator['username']),
-        'attachment_path': '/Users/oliviachen/influencer_finder/shared_attachments/Wonder_InfluenceKit_fall2025.pdf'
-    })
+        'attachment_path': ATTACHMENT_PATH
+    }
+    for creator in creators_to_email
+]
 
 # Schedule the emails
 print("\nScheduling emails...")
@@ -68,7 +74,7 @@ scheduled_ids = scheduler.schedule_bulk_emails(
     emails=emails_to_schedule,
     campaign="manual_outreach_batch1",
     start_time=tomorrow,
-    interval_minutes=3  # 3 minutes between each email
+    interval_minutes=INTERVAL_MINUTES
 )
 
 # Summary
@@ -77,11 +83,17 @@ print("✅ SCHEDULING COMPLETE!")
 print("="*60)
 print(f"📧 Total scheduled: {len(scheduled_ids)} emails")
 print(f"📅 First email: {tomorrow.strftime('%I:%M %p %Z')}")
-end_time = tomorrow + timedelta(minutes=3 * (len(creators_to_email) - 1))
+total_minutes = INTERVAL_MINUTES * (len(creators_to_email) - 1)
+end_time = tomorrow + timedelta(minutes=total_minutes)
 print(f"📅 Last email: {end_time.strftime('%I:%M %p %Z')}")
-print(f"⏱️ Total duration: {3 * (len(creators_to_email) - 1)} minutes")
+print(f"⏱️ Total duration: {total_minutes} minutes")
 print("\n📋 Creators being emailed:")
+# Step one timedelta instead of rebuilding it per row, and print the list in one write
+step = timedelta(minutes=INTERVAL_MINUTES)
+lines = []
+send_time = tomorrow
 for i, creator in enumerate(creators_to_email, 1):
-    send_time = tomorrow + timedelta(minutes=3 * (i - 1))
-    print(f"  {i}. @{creator['username']} at {send_time.strftime('%I:%M %p')}")
+    lines.append(f"  {i}. @{creator['username']} at {send_time.strftime('%I:%M %p')}")
+    send_time += step
+print("\n".join(lines))
 print("="*60)
\ No newline at end of file
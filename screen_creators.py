@@ -9,15 +9,21 @@ import pandas as pd
 import csv
 import json
 import os
+import re
 from clients.tikapi_client import TikAPIClient
 from clients.creator_data_client import CreatorDataClient
 from utils.filter_shoppable import ShoppableContentFilter
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database, BackgroundContentWriter
+from utils.creator_profiles import write_creator_profiles
 from datetime import datetime
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import threading
 
+# Error classification - matched case-insensitively against the raw error string
+_INVALID_USER_RE = re.compile(r"user not found|user doesn't exist|invalid user|not available", re.IGNORECASE)
+
+
 class CreatorScreener:
     def __init__(self, tikapi_key, brightdata_token=None):
         # Use hybrid client if Bright Data token provided, otherwise TikAPI only
@@ -29,7 +35,9 @@ class CreatorScreener:
             print("🔥 Using TikAPI client only")
         self.shoppable_filter = ShoppableContentFilter()
         # Initialize content database for automatic saving
-        self.content_db = ContentDatabase()
+        self.content_db = open_content_database()
+        # Saves go through one background writer so workers don't block on (or race over) the JSON file
+        self.content_writer = BackgroundContentWriter(self.content_db)
         # Note: engagement filtering removed - downstream processing handles view thresholds
         self.processed_creators = []
         self.failed_creators = []
@@ -44,11 +52,6 @@ class CreatorScreener:
         self.shoppable_cache = {}
         self.invalid_usernames = set()
         self.existing_creators = set()
-        
-        # CSV modification tracking
-        self.input_csv_file = None
-        self.invalid_csv_file = None
-        self.removed_usernames = []
     
     def screen_all_creators(self, csv_file="data/inputs/radar_5k_quitmyjob.csv", output_file=None):
         """Screen all creators from CSV file"""
@@ -67,10 +70,6 @@ class CreatorScreener:
         self.cache_dir = f"cache/screening/{input_basename}_cache"
         os.makedirs(self.cache_dir, exist_ok=True)
         
-        # Set up CSV modification tracking
-        self.input_csv_file = csv_file
-        self.invalid_csv_file = f"data/outputs/{input_basename}_invalid_usernames.csv"
-        
         # Reload caches for this specific dataset
         self.creator_cache = self._load_creator_cache()
         self.shoppable_cache = self._load_shoppable_cache()
@@ -113,6 +112,7 @@ class CreatorScreener:
         # Save results
         self.save_dataframes()
         self._save_caches()
+        self.content_writer.flush()
         self.print_summary()
     
     def screen_creator(self, username, creator_info):
@@ -315,7 +315,7 @@ class CreatorScreener:
                         posts_for_db.append(post_data)
                     
                     # Save to content database
-                    self.content_db.save_creator_content(
+                    self.content_writer.save_creator_content(
                         username=username,
                         profile_data={
                             'username': profile['username'],
@@ -330,7 +330,7 @@ class CreatorScreener:
                         },
                         top_posts_data=posts_for_db
                     )
-                    print(f"   💾 Saved to content database")
+                    print(f"   💾 Queued for content database")
                 except Exception as e:
                     print(f"   ⚠️ Warning: Could not save to content database: {e}")
             
@@ -451,6 +451,7 @@ class CreatorScreener:
             # Save creator cache
             with open(os.path.join(self.cache_dir, "creator_cache.json"), 'w') as f:
                 json.dump(self.creator_cache, f, indent=2)
+            write_creator_profiles(self.creator_cache, self.cache_dir)
             
             # Save shoppable cache
             with open(os.path.join(self.cache_dir, "shoppable_cache.json"), 'w') as f:
@@ -487,42 +488,6 @@ class CreatorScreener:
         except Exception as e:
             print(f"❌ Error saving invalid usernames cache: {e}")
     
-    def _remove_username_from_input_csv(self, username, creator_data):
-        """Remove username from input CSV and add to invalid CSV"""
-        try:
-            # Read current input CSV
-            df = pd.read_csv(self.input_csv_file)
-            
-            # Add to invalid CSV first (before removing from input)
-            invalid_data = creator_data.copy()
-            invalid_data['removal_reason'] = 'Bright Data MCP timeout (3 minutes)'
-            invalid_data['removal_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-            
-            # Create or append to invalid CSV
-            if os.path.exists(self.invalid_csv_file):
-                invalid_df = pd.read_csv(self.invalid_csv_file)
-                invalid_df = pd.concat([invalid_df, pd.DataFrame([invalid_data])], ignore_index=True)
-            else:
-                invalid_df = pd.DataFrame([invalid_data])
-            
-            invalid_df.to_csv(self.invalid_csv_file, index=False)
-            
-            # Remove from input CSV
-            df_filtered = df[df['username'] != username]
-            
-            # Only update the input CSV if we actually removed something
-            if len(df_filtered) < len(df):
-                df_filtered.to_csv(self.input_csv_file, index=False)
-                self.removed_usernames.append(username)
-                print(f"   ✅ Removed @{username} from {self.input_csv_file}")
-                print(f"   📄 Added @{username} to {self.invalid_csv_file}")
-                print(f"   📊 Input dataset now has {len(df_filtered)} creators (was {len(df)})")
-            else:
-                print(f"   ⚠️ Username @{username} not found in input CSV for removal")
-                
-        except Exception as e:
-            print(f"   ❌ Error removing username from CSV: {e}")
-    
     def _load_existing_creators(self):
         """Load existing creators from creator_cache.json to avoid reprocessing"""
         existing_creators = set()
@@ -594,11 +559,10 @@ class CreatorScreener:
                                     print(f"❌ [{processed_count}/{len(creators_to_process)}] @{result['username']} ERROR - {result['error']}")
                                     
                                     # Handle specific errors
-                                    error_msg = result['error'].lower()
-                                    if 'bright data mcp timeout (3 minutes)' in error_msg:
-                                        print(f"   🗑️ Removing @{result['username']} from input dataset")
-                                        self._remove_username_from_input_csv(result['username'], creator)
-                                    elif any(phrase in error_msg for phrase in ['user not found', 'user doesn\'t exist', 'invalid user', 'not available']):
+                                    # Timeouts are left in the input CSV - the adaptive timeout can be short,
+                                    # so one slow call says nothing about the creator
+                                    error_msg = result['error']
+                                    if _INVALID_USER_RE.search(error_msg):
                                         self.invalid_usernames.add(result['username'])
                                         print(f"   🚫 Marking @{result['username']} as invalid")
                                 else:
@@ -645,15 +609,6 @@ class CreatorScreener:
         print(f"❌ No shoppable content: {len([c for c in self.failed_creators if 'No shoppable content' in c.get('failure_reason', '')])}")
         print(f"🔥 API errors: {len([c for c in self.failed_creators if c.get('error')])}")
         
-        # Report CSV modifications
-        if self.removed_usernames:
-            print(f"🗑️ Removed invalid usernames: {len(self.removed_usernames)}")
-            print(f"   📄 Invalid usernames saved to: {self.invalid_csv_file}")
-            for username in self.removed_usernames:
-                print(f"   • @{username} (Bright Data timeout)")
-        else:
-            print(f"🗑️ No usernames removed from input dataset")
-        
         if self.processed_creators:
             print(f"\n🎯 PROCESSED CREATORS:")
             print(f"📊 Use helper functions to generate creator_lookup.csv and creator_post_lookup.csv")
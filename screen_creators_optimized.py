@@ -5,10 +5,12 @@ High-performance screening with thread-safe caching and smart batching
 import pandas as pd
 import json
 import os
+import re
 from clients.tikapi_client import TikAPIClient
 from clients.creator_data_client import CreatorDataClient
 from utils.filter_shoppable import ShoppableContentFilter
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database, BackgroundContentWriter
+from utils.creator_profiles import write_creator_profiles
 from datetime import datetime
 import time
 from concurrent.futures import ThreadPoolExecutor, as_completed
@@ -19,6 +21,10 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 from typing import List, Dict, Tuple
 
+# Error classification - matched case-insensitively against the raw error string
+_RATE_LIMIT_RE = re.compile(r'rate', re.IGNORECASE)
+_INVALID_USER_RE = re.compile(r"user not found|doesn't exist|invalid", re.IGNORECASE)
+
 
 class ThreadSafeCache:
     """Thread-safe cache implementation"""
@@ -116,7 +122,9 @@ class OptimizedCreatorScreener:
         self._setup_http_session()
         
         # Initialize content database for automatic saving
-        self.content_db = ContentDatabase()
+        self.content_db = open_content_database()
+        # Saves go through one background writer so workers don't block on (or race over) the JSON file
+        self.content_writer = BackgroundContentWriter(self.content_db)
         
         # Thread-safe caches
         self.creator_cache = ThreadSafeCache()
@@ -216,6 +224,7 @@ class OptimizedCreatorScreener:
         # Save results
         self.save_dataframes()
         self._save_all_caches()
+        self.content_writer.flush()
         self.print_summary()
     
     def _filter_creators_to_process(self, creators):
@@ -357,13 +366,13 @@ class OptimizedCreatorScreener:
                         'is_commerce': False,  # Will be determined later
                         'last_scraped': datetime.now().isoformat()
                     }
-                    self.content_db.save_creator_content(
+                    self.content_writer.save_creator_content(
                         username=username,
                         profile_data=profile_for_db,
                         top_posts_data=top_posts_data
                     )
                     with self._print_lock:
-                        print(f"   💾 Saved Bright Data content to database")
+                        print(f"   💾 Queued Bright Data content for database")
                 else:
                     # TikAPI result - convert posts to simplified format for content database
                     import re
@@ -402,13 +411,13 @@ class OptimizedCreatorScreener:
                             'last_scraped': datetime.now().isoformat()
                         }
                         
-                        self.content_db.save_creator_content(
+                        self.content_writer.save_creator_content(
                             username=username,
                             profile_data=profile_for_db,
                             top_posts_data=posts_for_db
                         )
                         with self._print_lock:
-                            print(f"   💾 Saved TikAPI data to database")
+                            print(f"   💾 Queued TikAPI data for database")
             except Exception as e:
                 with self._print_lock:
                     print(f"   ⚠️ Warning: Could not save content data: {e}")
@@ -429,14 +438,14 @@ class OptimizedCreatorScreener:
             }
         else:
             # Handle errors
-            error_msg = result.get('error', '').lower()
+            error_msg = result.get('error', '')
             
-            if 'rate' in error_msg:
+            if _RATE_LIMIT_RE.search(error_msg):
                 self.rate_limiter.rate_limited()
                 with self._print_lock:
                     print(f"⚠️ Rate limited on @{username}")
             
-            if any(phrase in error_msg for phrase in ['user not found', 'doesn\'t exist', 'invalid']):
+            if _INVALID_USER_RE.search(error_msg):
                 self.invalid_usernames.add(username)
             
             return None
@@ -652,8 +661,10 @@ class OptimizedCreatorScreener:
         """Save all caches to disk"""
         try:
             # Save creator cache
+            creator_cache = self.creator_cache.to_dict()
             with open(os.path.join(self.cache_dir, "creator_cache.json"), 'w') as f:
-                json.dump(self.creator_cache.to_dict(), f, indent=2)
+                json.dump(creator_cache, f, indent=2)
+            write_creator_profiles(creator_cache, self.cache_dir)
             
             # Save shoppable cache
             with open(os.path.join(self.cache_dir, "shoppable_cache.json"), 'w') as f:
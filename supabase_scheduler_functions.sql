@@ -0,0 +1,35 @@
+-- Database functions used by utils/supabase_scheduler.py
+-- Run this in the Supabase SQL Editor (the scheduler falls back to plain queries until you do)
+
+-- Email count per status in one query (get_schedule_stats)
+CREATE OR REPLACE FUNCTION get_schedule_counts()
+RETURNS TABLE (status TEXT, count BIGINT)
+LANGUAGE sql STABLE
+AS $$
+    SELECT status, COUNT(*) FROM scheduled_emails GROUP BY status;
+$$;
+
+-- Record a sent email and mark it sent in one round-trip / transaction (mark_as_sent)
+-- Rows already marked sent are left alone, so a retried call doesn't record the email twice
+CREATE OR REPLACE FUNCTION mark_email_sent(p_id BIGINT, p_sent_at TIMESTAMPTZ)
+RETURNS VOID
+LANGUAGE plpgsql
+AS $$
+BEGIN
+    INSERT INTO sent_emails (email_id, username, campaign, to_email, subject, body,
+                             scheduled_time, sent_at, attachment_path)
+    SELECT email_id, username, campaign, to_email, subject, body,
+           scheduled_time, p_sent_at, attachment_path
+    FROM scheduled_emails
+    WHERE id = p_id AND status IS DISTINCT FROM 'sent';
+
+    UPDATE scheduled_emails
+    SET status = 'sent', sent_at = p_sent_at
+    WHERE id = p_id AND status IS DISTINCT FROM 'sent';
+END;
+$$;
+
+-- Verify the functions were created
+SELECT routine_name
+FROM information_schema.routines
+WHERE routine_name IN ('get_schedule_counts', 'mark_email_sent');
@@ -4,12 +4,12 @@ Check which creators have extractable emails in their bios
 """
 import json
 import re
-from utils.content_database import ContentDatabase
+from utils.content_database import open_content_database
 
 
 def check_creator_emails():
     """Check how many creators have emails in their bios"""
-    db = ContentDatabase()
+    db = open_content_database()
     data = db.load_database()
     creators = data.get('creators', {})
     
@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Show pending scheduled emails and how long until each one is sent
+Reads the SQLite scheduler index, or the pending-only JSONL sidecar for the JSON-file scheduler
+"""
+import os
+import sqlite3
+import sys
+import time
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import fast_json
+from utils.email_scheduler import EmailScheduler
+
+
+def _format_countdown(seconds: float) -> str:
+    """Human readable countdown, e.g. '2h 05m' or 'overdue 3m'"""
+    prefix = "overdue " if seconds < 0 else ""
+    minutes = int(abs(seconds) // 60)
+    hours, minutes = divmod(minutes, 60)
+    if hours:
+        return f"{prefix}{hours}h {minutes:02d}m"
+    return f"{prefix}{minutes}m"
+
+
+def _iter_pending_sqlite(db_file):
+    """Pending rows straight off the partial (status, scheduled_ts) index"""
+    conn = sqlite3.connect(db_file)
+    conn.row_factory = sqlite3.Row
+    try:
+        for row in conn.execute(
+            "SELECT username, campaign, to_email, scheduled_ts FROM scheduled_emails "
+            "WHERE status = 'pending' ORDER BY scheduled_ts"
+        ):
+            yield dict(row)
+    finally:
+        conn.close()
+
+
+def _iter_pending_jsonl(schedule_file, timezone):
+    """Pending rows from the JSONL sidecar written by the JSON-file scheduler"""
+    pending_file = os.path.splitext(schedule_file)[0] + "_pending.jsonl"
+
+    # Build the sidecar once if the schedule predates it
+    if not os.path.exists(pending_file) and os.path.exists(schedule_file):
+        EmailScheduler(schedule_file, timezone).save_pending_index()
+
+    if not os.path.exists(pending_file):
+        return
+
+    with open(pending_file, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield fast_json.loads(line)
+
+
+def check_scheduler_status(schedule_file="cache/scheduled_emails.json", timezone="US/Pacific",
+                           db_file="cache/scheduler.sqlite"):
+    """Print pending scheduled emails, earliest first"""
+    if os.path.exists(db_file):
+        rows = _iter_pending_sqlite(db_file)
+    else:
+        rows = _iter_pending_jsonl(schedule_file, timezone)
+
+    tz = ZoneInfo(timezone)
+    now_ts = time.time()
+    count = 0
+
+    print(f"📅 Pending scheduled emails (now: {datetime.now(tz).strftime('%Y-%m-%d %H:%M %Z')})")
+    print("=" * 60)
+
+    # Rows arrive sorted by scheduled_ts
+    for row in rows:
+        count += 1
+        send_at = datetime.fromtimestamp(row['scheduled_ts'], tz).strftime('%Y-%m-%d %H:%M')
+        countdown = _format_countdown(row['scheduled_ts'] - now_ts)
+        print(f"   {send_at}  ({countdown})  @{row.get('username')} → {row.get('to_email')} [{row.get('campaign')}]")
+
+    print("=" * 60)
+    print(f"📊 Total pending: {count}")
+
+
+if __name__ == "__main__":
+    check_scheduler_status(*sys.argv[1:2])
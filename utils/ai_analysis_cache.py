@@ -14,6 +14,8 @@ class AIAnalysisCache:
     def __init__(self, cache_path="cache/ai_analysis_cache.json"):
         self.cache_path = cache_path
         self.cache_duration_days = 7
+        # (mtime_ns, size, parsed cache) of the last read/write - reused until the file changes
+        self._memo = None
         self.ensure_cache_exists()
     
     def ensure_cache_exists(self):
@@ -30,10 +32,15 @@ class AIAnalysisCache:
                 json.dump(empty_cache, f, indent=2)
     
     def load_cache(self) -> Dict:
-        """Load the entire cache"""
+        """Load the entire cache (parsed once per file version; callers get their own top-level dict)"""
         try:
+            stat = os.stat(self.cache_path)
+            if self._memo and self._memo[:2] == (stat.st_mtime_ns, stat.st_size):
+                return dict(self._memo[2])
             with open(self.cache_path, 'r') as f:
-                return json.load(f)
+                cache = json.load(f)
+            self._memo = (stat.st_mtime_ns, stat.st_size, cache)
+            return dict(cache)
         except:
             return {}
     
@@ -41,6 +48,8 @@ class AIAnalysisCache:
         """Save the entire cache"""
         with open(self.cache_path, 'w') as f:
             json.dump(cache_data, f, indent=2)
+        stat = os.stat(self.cache_path)
+        self._memo = (stat.st_mtime_ns, stat.st_size, dict(cache_data))
     
     def get_cache_key(self, username: str, campaign_name: str) -> str:
         """Generate a unique cache key for username + campaign combination"""
@@ -48,18 +57,20 @@ class AIAnalysisCache:
         campaign_key = campaign_name.lower().replace(' ', '_')
         return f"{username}_{campaign_key}"
     
-    def get_cached_analysis(self, username: str, campaign_name: str) -> Optional[Dict]:
+    def get_cached_analysis(self, username: str, campaign_name: str, cache: Optional[Dict] = None) -> Optional[Dict]:
         """
         Get cached analysis if it exists and is not expired
         
         Args:
             username: Creator username
             campaign_name: The campaign name (not the full brief)
+            cache: Already-loaded cache dict (from load_cache) for bulk lookups; loaded from disk if None
             
         Returns:
             Cached analysis dict if valid, None otherwise
         """
-        cache = self.load_cache()
+        if cache is None:
+            cache = self.load_cache()
         
         # Try new format first: username_campaignname
         cache_key = self.get_cache_key(username, campaign_name)
@@ -102,9 +113,32 @@ class AIAnalysisCache:
             recommendation: Extracted recommendation (Yes/No/Maybe)
         """
         cache = self.load_cache()
-        cache_key = self.get_cache_key(username, campaign_name)
+        cache[self.get_cache_key(username, campaign_name)] = self._analysis_entry(
+            username, campaign_name, campaign_brief, analysis, recommendation
+        )
+        self.save_cache(cache)
+    
+    def save_analyses(self, analyses: List[Dict]):
+        """
+        Save several analyses with one cache load and one write
         
-        cache[cache_key] = {
+        Args:
+            analyses: dicts with the save_analysis arguments (username, campaign_name,
+                      campaign_brief, analysis, recommendation)
+        """
+        if not analyses:
+            return
+        cache = self.load_cache()
+        for item in analyses:
+            cache[self.get_cache_key(item['username'], item['campaign_name'])] = self._analysis_entry(
+                item['username'], item['campaign_name'], item['campaign_brief'],
+                item['analysis'], item.get('recommendation', '')
+            )
+        self.save_cache(cache)
+    
+    def _analysis_entry(self, username: str, campaign_name: str, campaign_brief: str, analysis: str, recommendation: str) -> Dict:
+        """Cache record for one analysis"""
+        return {
             'username': username,
             'campaign_name': campaign_name,
             'campaign_brief': campaign_brief,  # Store the brief used for reference
@@ -113,8 +147,6 @@ class AIAnalysisCache:
             'analyzed_at': datetime.now().isoformat(),
             'expires_at': (datetime.now() + timedelta(days=self.cache_duration_days)).isoformat()
         }
-        
-        self.save_cache(cache)
     
     def get_all_analyses_for_creator(self, username: str) -> List[Dict]:
         """Get all cached analyses for a specific creator"""
@@ -0,0 +1,65 @@
+"""
+Circuit Breaker - stop calling a provider that keeps failing
+Trips open after N consecutive failures, then lets a single half-open probe through after a cool-down
+"""
+import random
+import threading
+import time
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+def backoff_delay(attempt, base=0.5, cap=30.0):
+    """Exponential backoff with jitter: base * 2**attempt, scaled by a random 0.5-1.5x, capped"""
+    return min(cap, (2 ** attempt) * base * (0.5 + random.random()))
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker"""
+    def __init__(self, name, fail_threshold=5, reset_after=60.0):
+        self.name = name
+        self.fail_threshold = fail_threshold
+        self.reset_after = reset_after
+        self._lock = threading.Lock()
+        self.state = CLOSED
+        self.failure_count = 0
+        self.opened_at = None
+        self._probe_in_flight = False
+
+    def allow(self):
+        """True if a call may go through now (moves OPEN -> HALF_OPEN once the cool-down is over)"""
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_after:
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                # Exactly one probe at a time while half-open
+                self._probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        """Provider answered - close the breaker"""
+        with self._lock:
+            if self.state != CLOSED:
+                print(f"✅ {self.name} circuit closed")
+            self.state = CLOSED
+            self.failure_count = 0
+            self.opened_at = None
+            self._probe_in_flight = False
+
+    def record_failure(self):
+        """Provider failed - open the breaker after fail_threshold in a row (or a failed probe)"""
+        with self._lock:
+            self.failure_count += 1
+            self._probe_in_flight = False
+            if self.state == HALF_OPEN or self.failure_count >= self.fail_threshold:
+                if self.state != OPEN:
+                    print(f"⚡ {self.name} circuit open after {self.failure_count} failures - "
+                          f"skipping for {self.reset_after:.0f}s")
+                self.state = OPEN
+                self.opened_at = time.monotonic()
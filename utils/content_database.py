@@ -4,19 +4,41 @@ Handles saving and loading creator content data (captions, hashtags, etc.)
 """
 import json
 import os
+import queue
 import re
+import threading
+import time
 from datetime import datetime
 from typing import Dict, List, Optional
 
+from utils import fast_json
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 
 class ContentDatabase:
     def __init__(self, db_path="cache/creators_content_database.json"):
         self.db_path = db_path
+        # zstd-compressed copy; once it exists it is the authoritative store
+        self.compressed_path = f"{db_path}.zst"
         self.ensure_db_exists()
     
+    def _use_compressed(self) -> bool:
+        """True when the database lives in the .zst file"""
+        return ZSTD_AVAILABLE and os.path.exists(self.compressed_path)
+    
+    @property
+    def active_path(self) -> str:
+        """Path of the file currently holding the database"""
+        return self.compressed_path if self._use_compressed() else self.db_path
+    
     def ensure_db_exists(self):
         """Create database file if it doesn't exist"""
-        if not os.path.exists(self.db_path):
+        if not os.path.exists(self.db_path) and not self._use_compressed():
             # Create directory if needed
             dir_path = os.path.dirname(self.db_path)
             if dir_path:  # Only create directory if there is one
@@ -37,14 +59,28 @@ class ContentDatabase:
     
     def load_database(self) -> Dict:
         """Load the entire database"""
+        if self._use_compressed():
+            with open(self.compressed_path, 'rb') as f:
+                return fast_json.loads(zstandard.ZstdDecompressor().decompress(f.read()))
         with open(self.db_path, 'r') as f:
             return json.load(f)
     
     def save_database(self, db_data: Dict):
         """Save the entire database"""
+        if self._use_compressed():
+            self._save_compressed(db_data)
+            return
         with open(self.db_path, 'w') as f:
             json.dump(db_data, f, indent=2)
     
+    def _save_compressed(self, db_data: Dict):
+        """Atomically write the database as zstd-compressed JSON"""
+        payload = zstandard.ZstdCompressor(level=3).compress(fast_json.dumps_bytes(db_data))
+        temp_path = f"{self.compressed_path}.tmp"
+        with open(temp_path, 'wb') as f:
+            f.write(payload)
+        os.replace(temp_path, self.compressed_path)
+    
     def save_creator_content(self, username: str, profile_data: Dict, top_posts_data: List[Dict]):
         """
         Save creator content data to the database
@@ -54,8 +90,32 @@ class ContentDatabase:
             profile_data: Profile information 
             top_posts_data: Array of posts with captions/hashtags
         """
+        self.save_many([(username, profile_data, top_posts_data)])
+    
+    def save_many(self, items: List[tuple]):
+        """
+        Save several creators with a single database load and rewrite
+        
+        Args:
+            items: (username, profile_data, top_posts_data) tuples, as for save_creator_content
+        """
+        if not items:
+            return
         db = self.load_database()
         
+        for username, profile_data, top_posts_data in items:
+            db["creators"][username] = self._creator_content(profile_data, top_posts_data)
+        
+        # Update metadata
+        db["metadata"]["last_updated"] = datetime.now().isoformat()
+        db["metadata"]["creator_count"] = len(db["creators"])
+        db["metadata"]["total_posts"] = sum(len(creator["posts"]) for creator in db["creators"].values())
+        
+        # Save updated database
+        self.save_database(db)
+    
+    def _creator_content(self, profile_data: Dict, top_posts_data: List[Dict]) -> Dict:
+        """Database record for one creator"""
         # Extract email from bio
         bio_text = profile_data.get("biography", "") or ""
         email = self._extract_email_from_bio(bio_text)
@@ -87,18 +147,7 @@ class ContentDatabase:
             }
             creator_content["posts"].append(post_data)
         
-        # Update database
-        db["creators"][username] = creator_content
-        
-        # Update metadata
-        db["metadata"]["last_updated"] = datetime.now().isoformat()
-        db["metadata"]["creator_count"] = len(db["creators"])
-        db["metadata"]["total_posts"] = sum(len(creator["posts"]) for creator in db["creators"].values())
-        
-        # Save updated database
-        self.save_database(db)
-        
-        pass  # Saved content data successfully
+        return creator_content
     
     def get_creator_content(self, username: str) -> Optional[Dict]:
         """Get content data for a specific creator"""
@@ -126,14 +175,51 @@ class ContentDatabase:
         stats = db["metadata"].copy()
         
         # Add database file size
-        import os
         if os.path.exists(self.db_path):
             stats["db_size_mb"] = os.path.getsize(self.db_path) / (1024 * 1024)
         else:
             stats["db_size_mb"] = 0
+        if self._use_compressed():
+            stats["compressed_size_mb"] = os.path.getsize(self.compressed_path) / (1024 * 1024)
             
         return stats
     
+    def get_stats_cached(self) -> Dict:
+        """
+        Get database statistics, reusing a small sidecar file while the database is unchanged
+        
+        The sidecar (_db_stats.json next to the database) is keyed by the database file's
+        mtime and size, so repeat progress checks skip re-parsing the full JSON database.
+        """
+        stats_path = os.path.join(os.path.dirname(self.db_path), "_db_stats.json")
+        try:
+            st = os.stat(self.active_path)
+        except OSError:
+            return self.get_stats()
+        
+        try:
+            with open(stats_path, 'r') as f:
+                cached = json.load(f)
+            if cached.get("src_mtime_ns") == st.st_mtime_ns and cached.get("src_size") == st.st_size:
+                return cached["stats"]
+        except (OSError, ValueError, KeyError):
+            pass
+        
+        stats = self.get_stats()
+        temp_path = f"{stats_path}.tmp"
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump({
+                    "src_mtime_ns": st.st_mtime_ns,
+                    "src_size": st.st_size,
+                    "generated_at": datetime.now().isoformat(),
+                    "stats": stats
+                }, f, indent=2)
+            os.replace(temp_path, stats_path)
+        except OSError:
+            pass  # Stats cache is best-effort
+        return stats
+    
     def search_creators_by_hashtag(self, hashtag: str) -> List[str]:
         """Search creators who use a specific hashtag"""
         db = self.load_database()
@@ -217,12 +303,103 @@ class ContentDatabase:
         self.save_database(db)
         return True
     
-    def save(self):
-        """Save the current database state"""
+    def save(self, compressed: bool = False):
+        """
+        Save the current database state
+        
+        Args:
+            compressed: Write creators_content_database.json.zst (zstd level 3). From then on
+                        the compressed file is what load_database/save_database use.
+        """
         # Database is already saved after each operation, but provide explicit save method
         db = self.load_database()
         db["metadata"]["last_updated"] = datetime.now().isoformat()
-        self.save_database(db)
+        if compressed:
+            if not ZSTD_AVAILABLE:
+                raise RuntimeError("zstandard is not installed - run: pip install zstandard")
+            self._save_compressed(db)
+        else:
+            self.save_database(db)
+
+
+def open_content_database(storage: Optional[str] = None) -> ContentDatabase:
+    """
+    Content database for the configured storage backend
+    
+    Args:
+        storage: 'json' (default, creators_content_database.json) or 'sqlite'
+                 (cache/creators_content.sqlite); defaults to the CONTENT_DB_STORAGE env var
+    """
+    storage = storage or os.getenv('CONTENT_DB_STORAGE', 'json')
+    if storage == 'sqlite':
+        from utils.sqlite_content_database import SQLiteContentDatabase
+        return SQLiteContentDatabase()
+    return ContentDatabase()
+
+
+_FLUSH = object()  # Queue marker: write the current batch now
+
+
+class BackgroundContentWriter:
+    """
+    Single writer thread for ContentDatabase saves
+    
+    Screening workers enqueue (username, profile_data, top_posts_data) and return immediately;
+    one thread applies the saves in order, so concurrent workers never race on the JSON file.
+    Saves are grouped - up to batch_size creators or flush_interval seconds per database rewrite.
+    Call flush() before reading the database back (e.g. for summary stats).
+    """
+    def __init__(self, content_db: ContentDatabase, maxsize: int = 256, batch_size: int = 50,
+                 flush_interval: float = 2.0):
+        self.content_db = content_db
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._thread = threading.Thread(target=self._worker, name="content-db-writer", daemon=True)
+        self._thread.start()
+    
+    def save_creator_content(self, username: str, profile_data: Dict, top_posts_data: List[Dict]):
+        """Queue a save (same arguments as ContentDatabase.save_creator_content)"""
+        # Blocks only when the writer is maxsize saves behind - backpressure rather than dropping content
+        self._queue.put((username, profile_data, top_posts_data))
+    
+    def _next_batch(self):
+        """Block for one item, then gather more until batch_size, flush_interval or a marker"""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size and batch[-1] is not None and batch[-1] is not _FLUSH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+    
+    def _worker(self):
+        while True:
+            batch = self._next_batch()
+            items = [item for item in batch if item is not None and item is not _FLUSH]
+            try:
+                self.content_db.save_many(items)
+            except Exception as e:
+                print(f"⚠️ Could not save content data for {len(items)} creators: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if batch[-1] is None:
+                return
+    
+    def flush(self):
+        """Write any pending batch and wait until every queued save is on disk"""
+        self._queue.put(_FLUSH)
+        self._queue.join()
+    
+    def close(self):
+        """Flush and stop the writer thread"""
+        self._queue.put(None)
+        self._thread.join()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,27 @@
+"""
+Creator Profiles JSONL
+Line-delimited companion to creator_cache.json - one successful creator profile per line,
+so lookup tables can be rebuilt with pandas' C JSON-lines reader instead of a Python loop
+"""
+import os
+
+from utils import fast_json
+
+PROFILES_FILE = "creator_profiles.jsonl"
+
+
+def profiles_path(cache_dir):
+    """Path of the profiles JSONL inside a screening cache directory"""
+    return os.path.join(cache_dir, PROFILES_FILE)
+
+
+def write_creator_profiles(creator_cache, cache_dir):
+    """Rewrite the profiles JSONL from a creator cache dict (written atomically)"""
+    path = profiles_path(cache_dir)
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        for username, data in creator_cache.items():
+            if data.get('success') and 'profile' in data:
+                f.write(fast_json.dumps_bytes({'username': username, 'profile': data['profile']}) + b"\n")
+    os.replace(temp_path, path)
+    return path
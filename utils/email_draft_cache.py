@@ -62,6 +62,15 @@ class EmailDraftCache:
         cache_key = self.get_cache_key(username, campaign)
         return cache_key in self.cache
     
+    def get_drafts(self, usernames: List[str], campaign: str) -> Dict[str, Dict]:
+        """Drafts for many creators in one campaign, keyed by username"""
+        drafts = {}
+        for username in usernames:
+            draft = self.cache.get(self.get_cache_key(username, campaign))
+            if draft is not None:
+                drafts[username] = draft
+        return drafts
+    
     def get_campaign_drafts(self, campaign: str) -> List[Dict]:
         """Get all drafts for a campaign"""
         drafts = []
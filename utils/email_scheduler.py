@@ -3,15 +3,19 @@ Email Scheduler
 Manages scheduled email sending with persistent storage
 Works both locally (while running) and when deployed
 """
-import json
+import bisect
 import os
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from enum import Enum
 from zoneinfo import ZoneInfo  # Python 3.9+ for timezone support
 
+from utils import fast_json
+from utils.circuit_breaker import backoff_delay
+
 
 class ScheduleStatus(Enum):
     PENDING = "pending"
@@ -20,29 +24,209 @@ class ScheduleStatus(Enum):
     CANCELLED = "cancelled"
 
 
+# Fold the transition log back into the schedule file after this many appended state changes
+COMPACT_EVERY = 200
+
+# Background loop poll interval while a burst is being drained
+BUSY_POLL_SECONDS = 5
+# Otherwise the loop sleeps until the next pending email is due, but no longer than this
+# (scheduling from this process wakes it early; this bounds pickup of emails added elsewhere)
+IDLE_POLL_SECONDS = 300
+# First wait after a loop error, doubling per consecutive error up to MAX_ERROR_BACKOFF_SECONDS
+ERROR_RETRY_SECONDS = 60
+MAX_ERROR_BACKOFF_SECONDS = 300
+# How often the background loop logs a stats line
+HEARTBEAT_SECONDS = 180
+
+
 class EmailScheduler:
+    # Sorted (timestamps, schedule_ids) of pending emails; rebuilt when emails are added,
+    # patched in place on status changes
+    _due_index = None
+    # Status changes not yet written to the pending sidecar
+    _pending_index_dirty = False
+    
     def __init__(self, schedule_file="cache/scheduled_emails.json", timezone="US/Pacific"):
         self.schedule_file = schedule_file
+        self._transition_count = 0
+        # Guards scheduled_emails and the pending index between the UI and the background send loop
+        # (re-entrant: saving rebuilds the index, transitions may compact)
+        self._index_lock = threading.RLock()
         self.scheduled_emails = self.load_schedule()
         self.scheduler_thread = None
         self.running = False
+        # Set to cut the background loop's current wait short (new email scheduled, or stopping)
+        self._wake_event = threading.Event()
         self.timezone = ZoneInfo(timezone)  # Default to Pacific Time
         
+        # Fold state changes left in the log by the previous run into the schedule file
+        if self._transition_count:
+            self.save_schedule()
+        
     def load_schedule(self) -> dict:
-        """Load scheduled emails from file"""
+        """Load scheduled emails from file, then replay the transition log on top"""
+        scheduled = {}
         if os.path.exists(self.schedule_file):
             try:
-                with open(self.schedule_file, 'r') as f:
-                    return json.load(f)
+                with open(self.schedule_file, 'rb') as f:
+                    scheduled = fast_json.loads(f.read())
             except:
-                return {}
-        return {}
+                scheduled = {}
+        self._transition_count = self._replay_transitions(scheduled)
+        return scheduled
+    
+    @property
+    def transitions_file(self) -> str:
+        """Append-only JSONL of status changes not yet folded into the schedule file"""
+        return os.path.splitext(self.schedule_file)[0] + "_transitions.jsonl"
+    
+    def _replay_transitions(self, scheduled: dict) -> int:
+        """Apply logged state changes to scheduled (in order). Returns how many were applied"""
+        if not os.path.exists(self.transitions_file):
+            return 0
+        count = 0
+        with open(self.transitions_file, 'rb') as f:
+            for line in f:
+                try:
+                    transition = fast_json.loads(line)
+                except fast_json.JSONDecodeError:
+                    continue  # Torn final line from a crash mid-append
+                if transition.get('id') in scheduled:
+                    scheduled[transition['id']].update(transition.get('changes', {}))
+                    count += 1
+        return count
+    
+    def _record_transition(self, schedule_id: str, **changes):
+        """
+        Apply a state change in memory and append it to the log instead of rewriting the schedule
+        
+        The pending index is patched for this one email; the sidecar is rewritten by
+        flush_pending_index() (once per send batch) or on compaction.
+        """
+        with self._index_lock:
+            email_data = self.scheduled_emails[schedule_id]
+            old_ts = None
+            if self._due_index is not None and email_data.get('status') == ScheduleStatus.PENDING.value:
+                old_ts = self._timestamp(email_data)
+            email_data.update(changes)
+            os.makedirs(os.path.dirname(self.transitions_file), exist_ok=True)
+            with open(self.transitions_file, 'ab') as f:
+                f.write(fast_json.dumps_bytes({'id': schedule_id, 'changes': changes}, default=str) + b"\n")
+            self._transition_count += 1
+            
+            if self._due_index is not None:
+                self._reindex_email(schedule_id, old_ts)
+            if self._transition_count >= COMPACT_EVERY:
+                self.save_schedule(reindex=False)
+            else:
+                self._pending_index_dirty = True
+    
+    def save_schedule(self, reindex=True):
+        """Save schedule to file (compact JSON, written atomically)"""
+        with self._index_lock:
+            os.makedirs(os.path.dirname(self.schedule_file), exist_ok=True)
+            temp_path = f"{self.schedule_file}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(fast_json.dumps_bytes(self.scheduled_emails, default=str))
+            os.replace(temp_path, self.schedule_file)
+            # Everything logged so far is now in the schedule file
+            if self._transition_count:
+                try:
+                    os.remove(self.transitions_file)
+                except FileNotFoundError:
+                    pass
+                self._transition_count = 0
+            if reindex:
+                self._due_index = None
+            self.save_pending_index()
+    
+    @property
+    def pending_index_file(self) -> str:
+        """Sidecar JSONL holding only pending emails, sorted by send time"""
+        return os.path.splitext(self.schedule_file)[0] + "_pending.jsonl"
+    
+    def _pending_index(self):
+        """
+        (timestamps, schedule_ids) of pending emails, sorted by send time
+        
+        Each scheduled_time is parsed once per schedule change instead of on every poll.
+        """
+        with self._index_lock:
+            if self._due_index is None:
+                pending = []
+                for schedule_id, email_data in self.scheduled_emails.items():
+                    if email_data.get('status') != ScheduleStatus.PENDING.value:
+                        continue
+                    scheduled_ts = self._timestamp(email_data)
+                    if scheduled_ts is not None:
+                        pending.append((scheduled_ts, schedule_id))
+                pending.sort()
+                self._due_index = ([ts for ts, _ in pending], [schedule_id for _, schedule_id in pending])
+            return self._due_index
     
-    def save_schedule(self):
-        """Save schedule to file"""
-        os.makedirs(os.path.dirname(self.schedule_file), exist_ok=True)
-        with open(self.schedule_file, 'w') as f:
-            json.dump(self.scheduled_emails, f, indent=2, default=str)
+    def _timestamp(self, email_data) -> Optional[float]:
+        """Epoch seconds of an email's scheduled_time, or None if it can't be parsed"""
+        try:
+            scheduled_time = datetime.fromisoformat(email_data['scheduled_time'])
+        except (KeyError, TypeError, ValueError):
+            return None
+        if scheduled_time.tzinfo is None:
+            # If no timezone, assume it was meant to be Pacific
+            scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
+        return scheduled_time.timestamp()
+    
+    def _reindex_email(self, schedule_id, old_ts):
+        """Move one email within the sorted pending index (old_ts: where it was, None if not pending)"""
+        timestamps, schedule_ids = self._due_index
+        if old_ts is not None:
+            lo = bisect.bisect_left(timestamps, old_ts)
+            hi = bisect.bisect_right(timestamps, old_ts, lo)
+            i = bisect.bisect_left(schedule_ids, schedule_id, lo, hi)
+            if i < hi and schedule_ids[i] == schedule_id:
+                del timestamps[i], schedule_ids[i]
+        
+        email_data = self.scheduled_emails[schedule_id]
+        if email_data.get('status') == ScheduleStatus.PENDING.value:
+            new_ts = self._timestamp(email_data)
+            if new_ts is not None:
+                # Same (timestamp, schedule_id) order a full rebuild produces
+                lo = bisect.bisect_left(timestamps, new_ts)
+                hi = bisect.bisect_right(timestamps, new_ts, lo)
+                i = bisect.bisect_left(schedule_ids, schedule_id, lo, hi)
+                timestamps.insert(i, new_ts)
+                schedule_ids.insert(i, schedule_id)
+    
+    def flush_pending_index(self):
+        """Rewrite the pending sidecar if status changes have been recorded since the last write"""
+        if self._pending_index_dirty:
+            self.save_pending_index()
+    
+    def save_pending_index(self):
+        """Write the pending-only sidecar so status checks don't scan the full history"""
+        with self._index_lock:
+            self._pending_index_dirty = False
+            pending = []
+            for scheduled_ts, schedule_id in zip(*self._pending_index()):
+                email_data = self.scheduled_emails[schedule_id]
+                pending.append({
+                    'schedule_id': schedule_id,
+                    'username': email_data.get('username'),
+                    'campaign': email_data.get('campaign'),
+                    'to_email': email_data.get('to_email'),
+                    'subject': email_data.get('subject'),
+                    'scheduled_time': email_data['scheduled_time'],
+                    'scheduled_ts': scheduled_ts,
+                    'attempts': email_data.get('attempts', 0)
+                })
+            
+            temp_path = f"{self.pending_index_file}.tmp"
+            try:
+                with open(temp_path, 'wb') as f:
+                    for row in pending:
+                        f.write(fast_json.dumps_bytes(row, default=str) + b"\n")
+                os.replace(temp_path, self.pending_index_file)
+            except OSError as e:
+                print(f"⚠️ Could not write pending email index: {e}")
     
     def schedule_email(self, 
                        email_id: str,
@@ -54,7 +238,16 @@ class EmailScheduler:
                        scheduled_time: datetime,
                        attachment_path: str = None) -> str:
         """Schedule an email to be sent at a specific time"""
-        
+        with self._index_lock:
+            schedule_id = self._add_pending(email_id, username, campaign, to_email, subject, body,
+                                            scheduled_time, attachment_path)
+            self.save_schedule()
+            self._wake_event.set()
+            return schedule_id
+    
+    def _add_pending(self, email_id, username, campaign, to_email, subject, body,
+                     scheduled_time: datetime, attachment_path=None) -> str:
+        """Add a pending entry in memory (caller saves); returns its schedule_id"""
         schedule_id = f"{campaign}_{username}_{scheduled_time.isoformat()}"
         
         self.scheduled_emails[schedule_id] = {
@@ -70,8 +263,6 @@ class EmailScheduler:
             'created_at': datetime.now().isoformat(),
             'attempts': 0
         }
-        
-        self.save_schedule()
         return schedule_id
     
     def schedule_bulk_emails(self,
@@ -79,104 +270,113 @@ class EmailScheduler:
                            campaign: str,
                            start_time: datetime,
                            interval_minutes: int = 5) -> List[str]:
-        """Schedule multiple emails with intervals between them"""
-        schedule_ids = []
-        current_time = start_time
-        
-        for email in emails:
-            schedule_id = self.schedule_email(
-                email_id=email.get('email_id', f"{campaign}_{email['username']}"),
-                username=email['username'],
-                campaign=campaign,
-                to_email=email['email'],
-                subject=email['subject'],
-                body=email['body'],
-                scheduled_time=current_time,
-                attachment_path=email.get('attachment_path')
-            )
-            schedule_ids.append(schedule_id)
+        """Schedule multiple emails with intervals between them (one schedule file write for the batch)"""
+        with self._index_lock:
+            schedule_ids = []
+            current_time = start_time
             
-            # Add interval for next email
-            current_time = current_time + timedelta(minutes=interval_minutes)
-        
-        return schedule_ids
+            for email in emails:
+                schedule_id = self._add_pending(
+                    email_id=email.get('email_id', f"{campaign}_{email['username']}"),
+                    username=email['username'],
+                    campaign=campaign,
+                    to_email=email['email'],
+                    subject=email['subject'],
+                    body=email['body'],
+                    scheduled_time=current_time,
+                    attachment_path=email.get('attachment_path')
+                )
+                schedule_ids.append(schedule_id)
+                
+                # Add interval for next email
+                current_time = current_time + timedelta(minutes=interval_minutes)
+            
+            if schedule_ids:
+                self.save_schedule()
+                self._wake_event.set()
+            return schedule_ids
     
     def cancel_scheduled_email(self, schedule_id: str) -> bool:
         """Cancel a scheduled email"""
-        if schedule_id in self.scheduled_emails:
-            self.scheduled_emails[schedule_id]['status'] = ScheduleStatus.CANCELLED.value
-            self.scheduled_emails[schedule_id]['cancelled_at'] = datetime.now().isoformat()
-            self.save_schedule()
-            return True
-        return False
+        with self._index_lock:
+            if schedule_id in self.scheduled_emails:
+                self._record_transition(
+                    schedule_id,
+                    status=ScheduleStatus.CANCELLED.value,
+                    cancelled_at=datetime.now().isoformat()
+                )
+                self.flush_pending_index()
+                return True
+            return False
     
     def get_pending_emails(self) -> List[Dict]:
         """Get all pending scheduled emails"""
-        pending = []
-        now = datetime.now(self.timezone)  # Use timezone-aware now
-        
-        for schedule_id, email_data in self.scheduled_emails.items():
-            if email_data['status'] == ScheduleStatus.PENDING.value:
-                scheduled_time = datetime.fromisoformat(email_data['scheduled_time'])
-                # Ensure scheduled_time has timezone info
-                if scheduled_time.tzinfo is None:
-                    scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
-                
-                # Include if scheduled for the future or within last hour (in case of app restart)
-                if scheduled_time > now - timedelta(hours=1):
-                    email_data['schedule_id'] = schedule_id
-                    email_data['scheduled_datetime'] = scheduled_time
-                    pending.append(email_data)
-        
-        # Sort by scheduled time
-        pending.sort(key=lambda x: x['scheduled_datetime'])
-        return pending
+        with self._index_lock:
+            pending = []
+            timestamps, schedule_ids = self._pending_index()
+            
+            # Include if scheduled for the future or within last hour (in case of app restart)
+            cutoff = (datetime.now(self.timezone) - timedelta(hours=1)).timestamp()
+            start = bisect.bisect_right(timestamps, cutoff)
+            for scheduled_ts, schedule_id in zip(timestamps[start:], schedule_ids[start:]):
+                email_data = self.scheduled_emails[schedule_id]
+                email_data['schedule_id'] = schedule_id
+                email_data['scheduled_datetime'] = datetime.fromtimestamp(scheduled_ts, self.timezone)
+                pending.append(email_data)
+            
+            # Already sorted by scheduled time
+            return pending
+    
+    def next_due_timestamp(self) -> Optional[float]:
+        """Epoch seconds of the earliest pending email (may be in the past), or None if nothing is pending"""
+        with self._index_lock:
+            timestamps, _ = self._pending_index()
+            return timestamps[0] if timestamps else None
     
     def get_emails_to_send_now(self) -> List[Dict]:
-        """Get emails that should be sent now"""
-        emails_to_send = []
-        now = datetime.now(self.timezone)  # Get current time in Pacific
-        
-        for schedule_id, email_data in self.scheduled_emails.items():
-            if email_data['status'] == ScheduleStatus.PENDING.value:
-                # Parse scheduled time and ensure it has timezone info
-                scheduled_time = datetime.fromisoformat(email_data['scheduled_time'])
-                if scheduled_time.tzinfo is None:
-                    # If no timezone, assume it was meant to be Pacific
-                    scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
-                
-                # Send if scheduled time has passed
-                if scheduled_time <= now:
-                    email_data['schedule_id'] = schedule_id
-                    emails_to_send.append(email_data)
-        
-        return emails_to_send
+        """Get emails that should be sent now (oldest first)"""
+        with self._index_lock:
+            emails_to_send = []
+            timestamps, schedule_ids = self._pending_index()
+            
+            # Send if scheduled time has passed - binary search instead of parsing every row each poll
+            due = bisect.bisect_right(timestamps, datetime.now(self.timezone).timestamp())
+            for schedule_id in schedule_ids[:due]:
+                email_data = self.scheduled_emails[schedule_id]
+                email_data['schedule_id'] = schedule_id
+                emails_to_send.append(email_data)
+            
+            return emails_to_send
     
     def mark_as_sent(self, schedule_id: str):
         """Mark email as sent"""
         if schedule_id in self.scheduled_emails:
-            self.scheduled_emails[schedule_id]['status'] = ScheduleStatus.SENT.value
-            self.scheduled_emails[schedule_id]['sent_at'] = datetime.now().isoformat()
-            self.save_schedule()
+            self._record_transition(
+                schedule_id,
+                status=ScheduleStatus.SENT.value,
+                sent_at=datetime.now().isoformat()
+            )
     
     def mark_as_failed(self, schedule_id: str, error: str):
         """Mark email as failed"""
         if schedule_id in self.scheduled_emails:
             email = self.scheduled_emails[schedule_id]
-            email['status'] = ScheduleStatus.FAILED.value
-            email['attempts'] = email.get('attempts', 0) + 1
-            email['last_error'] = error
-            email['failed_at'] = datetime.now().isoformat()
+            changes = {
+                'status': ScheduleStatus.FAILED.value,
+                'attempts': email.get('attempts', 0) + 1,
+                'last_error': error,
+                'failed_at': datetime.now().isoformat()
+            }
             
             # Retry logic: reschedule if less than 3 attempts
-            if email['attempts'] < 3:
+            if changes['attempts'] < 3:
                 # Reschedule for 30 minutes later
                 new_time = datetime.now(self.timezone) + timedelta(minutes=30)
-                email['scheduled_time'] = new_time.isoformat()
-                email['status'] = ScheduleStatus.PENDING.value
-                email['retry_scheduled'] = True
+                changes['scheduled_time'] = new_time.isoformat()
+                changes['status'] = ScheduleStatus.PENDING.value
+                changes['retry_scheduled'] = True
             
-            self.save_schedule()
+            self._record_transition(schedule_id, **changes)
     
     def get_campaign_schedule(self, campaign: str) -> List[Dict]:
         """Get all scheduled emails for a campaign"""
@@ -193,72 +393,108 @@ class EmailScheduler:
     
     def get_schedule_stats(self) -> Dict:
         """Get statistics about scheduled emails"""
-        stats = {
-            'total': len(self.scheduled_emails),
-            'pending': 0,
-            'sent': 0,
-            'failed': 0,
-            'cancelled': 0,
-            'next_scheduled': None
-        }
-        
-        next_time = None
-        now = datetime.now(self.timezone)  # Use timezone-aware now
-        
-        for email_data in self.scheduled_emails.values():
-            status = email_data['status']
-            if status == ScheduleStatus.PENDING.value:
-                stats['pending'] += 1
-                scheduled_time = datetime.fromisoformat(email_data['scheduled_time'])
-                # Ensure scheduled_time has timezone info
-                if scheduled_time.tzinfo is None:
-                    scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
-                if scheduled_time > now:
-                    if next_time is None:
-                        next_time = scheduled_time
-                    else:
-                        # Ensure next_time also has timezone info for comparison
-                        if next_time.tzinfo is None:
-                            next_time = next_time.replace(tzinfo=self.timezone)
-                        if scheduled_time < next_time:
-                            next_time = scheduled_time
-            elif status == ScheduleStatus.SENT.value:
-                stats['sent'] += 1
-            elif status == ScheduleStatus.FAILED.value:
-                stats['failed'] += 1
-            elif status == ScheduleStatus.CANCELLED.value:
-                stats['cancelled'] += 1
-        
-        if next_time:
-            stats['next_scheduled'] = next_time.isoformat()
+        with self._index_lock:
+            stats = {
+                'total': len(self.scheduled_emails),
+                'pending': 0,
+                'sent': 0,
+                'failed': 0,
+                'cancelled': 0,
+                'next_scheduled': None
+            }
+            
+            for email_data in self.scheduled_emails.values():
+                status = email_data['status']
+                if status == ScheduleStatus.PENDING.value:
+                    stats['pending'] += 1
+                elif status == ScheduleStatus.SENT.value:
+                    stats['sent'] += 1
+                elif status == ScheduleStatus.FAILED.value:
+                    stats['failed'] += 1
+                elif status == ScheduleStatus.CANCELLED.value:
+                    stats['cancelled'] += 1
+            
+            # Next future send from the sorted pending index - only that one row is parsed
+            timestamps, schedule_ids = self._pending_index()
+            upcoming = bisect.bisect_right(timestamps, datetime.now(self.timezone).timestamp())
+            if upcoming < len(timestamps):
+                next_time = datetime.fromisoformat(self.scheduled_emails[schedule_ids[upcoming]]['scheduled_time'])
+                if next_time.tzinfo is None:
+                    next_time = next_time.replace(tzinfo=self.timezone)
+                stats['next_scheduled'] = next_time.isoformat()
+            
+            return stats
+    
+    def claim_email(self, schedule_id: str) -> bool:
+        """
+        Reserve a due email for this sender right before sending it
         
-        return stats
+        The JSON schedule belongs to a single process, so there is nothing to race;
+        shared stores override this with an atomic conditional update.
+        """
+        return True
+    
+    def _send_due_email(self, email_data):
+        """Claim and send one due email; returns (success, message), or None if another sender claimed it"""
+        if not self.claim_email(email_data['schedule_id']):
+            return None
+        return self.email_send_callback(
+            to_email=email_data['to_email'],
+            subject=email_data['subject'],
+            body=email_data['body'],
+            username=email_data.get('username'),
+            campaign=email_data.get('campaign'),
+            attachment_path=email_data.get('attachment_path')
+        )
     
-    def start_background_scheduler(self, email_send_callback):
-        """Start background thread to process scheduled emails"""
+    def start_background_scheduler(self, email_send_callback, max_workers: int = 1):
+        """
+        Start background thread to process scheduled emails
+        
+        max_workers > 1 sends due emails in parallel (the callback must then be thread-safe),
+        so one slow SMTP exchange doesn't hold up the rest of the batch. Status updates stay
+        on the scheduler thread.
+        """
         if self.running:
             return
         
         self.running = True
+        self._wake_event.clear()
         self.email_send_callback = email_send_callback
         
         def run_scheduler():
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="email-send") \
+                if max_workers > 1 else None
+            consecutive_errors = 0
+            last_heartbeat = time.monotonic()
             while self.running:
                 try:
+                    # Monotonic deadline, so a long poll wait can't skip a heartbeat
+                    now_monotonic = time.monotonic()
+                    if now_monotonic - last_heartbeat >= HEARTBEAT_SECONDS:
+                        last_heartbeat = now_monotonic
+                        stats = self.get_schedule_stats()
+                        print(f"💓 Scheduler alive - {stats['pending']} pending, {stats['sent']} sent, "
+                              f"{stats['failed']} failed, next: {stats['next_scheduled'] or 'none'}")
+                    
                     # Check for emails to send
                     emails_to_send = self.get_emails_to_send_now()
                     
-                    for email_data in emails_to_send:
+                    if executor:
+                        futures = {executor.submit(self._send_due_email, email_data): email_data
+                                   for email_data in emails_to_send}
+                        outcomes = ((futures[future], future) for future in as_completed(futures))
+                    else:
+                        outcomes = ((email_data, None) for email_data in emails_to_send)
+                    
+                    for email_data, future in outcomes:
                         try:
-                            # Call the email sending callback
-                            success, message = self.email_send_callback(
-                                to_email=email_data['to_email'],
-                                subject=email_data['subject'],
-                                body=email_data['body'],
-                                username=email_data.get('username'),
-                                campaign=email_data.get('campaign'),
-                                attachment_path=email_data.get('attachment_path')
-                            )
+                            # Call the email sending callback (already running on a worker when parallel)
+                            result = future.result() if future is not None else self._send_due_email(email_data)
+                            if result is None:
+                                print(f"⏭️ {email_data['to_email']} already claimed by another sender")
+                                continue
+                            success, message = result
                             
                             if success:
                                 self.mark_as_sent(email_data['schedule_id'])
@@ -270,13 +506,32 @@ class EmailScheduler:
                         except Exception as e:
                             self.mark_as_failed(email_data['schedule_id'], str(e))
                             print(f"❌ Error sending scheduled email: {e}")
+                    # One sidecar rewrite for the whole batch
+                    self.flush_pending_index()
                     
-                    # Sleep for 30 seconds before checking again
-                    time.sleep(30)
+                    consecutive_errors = 0
+                    if emails_to_send:
+                        # Come back soon while there's a burst to drain
+                        wait = BUSY_POLL_SECONDS
+                    else:
+                        # Sleep until the next email is due instead of polling on a fixed interval
+                        next_due = self.next_due_timestamp()
+                        wait = IDLE_POLL_SECONDS if next_due is None else next_due - time.time()
+                        wait = max(1, min(wait, IDLE_POLL_SECONDS,
+                                          last_heartbeat + HEARTBEAT_SECONDS - time.monotonic()))
+                    self._wake_event.wait(wait)
+                    self._wake_event.clear()
                     
                 except Exception as e:
                     print(f"Scheduler error: {e}")
-                    time.sleep(60)  # Wait longer on error
+                    # Wait longer after each consecutive error
+                    self._wake_event.wait(backoff_delay(consecutive_errors, base=ERROR_RETRY_SECONDS,
+                                                        cap=MAX_ERROR_BACKOFF_SECONDS))
+                    consecutive_errors += 1
+            
+            if executor:
+                executor.shutdown(wait=True)
+            self.flush_pending_index()
         
         self.scheduler_thread = threading.Thread(target=run_scheduler, daemon=True)
         self.scheduler_thread.start()
@@ -285,6 +540,7 @@ class EmailScheduler:
     def stop_background_scheduler(self):
         """Stop the background scheduler"""
         self.running = False
+        self._wake_event.set()
         if self.scheduler_thread:
             self.scheduler_thread.join(timeout=5)
         print("📅 Background email scheduler stopped")
@@ -13,6 +13,8 @@ class EmailTrackingManager:
     def __init__(self, tracking_domain="https://tracking.unsettled.xyz"):
         self.tracking_domain = tracking_domain
         self.sent_emails_db = "cache/sent_emails_tracking.json"
+        # Keep-alive connection to the tracking service, reused across emails
+        self.session = requests.Session()
         self.ensure_db_exists()
     
     def ensure_db_exists(self):
@@ -49,7 +51,7 @@ class EmailTrackingManager:
         
         # Also log to remote tracking service
         try:
-            response = requests.post(
+            response = self.session.post(
                 f"{self.tracking_domain}/track/sent",
                 json={
                     "email_id": tracking_id,
@@ -95,7 +97,7 @@ class EmailTrackingManager:
     def fetch_tracking_stats(self):
         """Fetch latest stats from tracking service"""
         try:
-            response = requests.get(f"{self.tracking_domain}/api/stats", timeout=5)
+            response = self.session.get(f"{self.tracking_domain}/api/stats", timeout=5)
             if response.status_code == 200:
                 return response.json()
             else:
@@ -106,7 +108,7 @@ class EmailTrackingManager:
     def fetch_campaign_stats(self, campaign_name):
         """Fetch stats for specific campaign"""
         try:
-            response = requests.get(f"{self.tracking_domain}/api/campaign/{campaign_name}", timeout=5)
+            response = self.session.get(f"{self.tracking_domain}/api/campaign/{campaign_name}", timeout=5)
             if response.status_code == 200:
                 return response.json()
             else:
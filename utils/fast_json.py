@@ -0,0 +1,38 @@
+"""
+Fast JSON helpers
+Uses orjson when it is installed and falls back to the stdlib json module otherwise
+"""
+import json
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep catching the stdlib type
+JSONDecodeError = json.JSONDecodeError
+
+
+# Decode JSON from str or bytes - bound directly so hot loops pay no wrapper call
+loads = orjson.loads if ORJSON_AVAILABLE else json.loads
+
+
+def dumps_bytes(obj, pretty=False, default=None):
+    """Encode obj as UTF-8 JSON bytes (2-space indented when pretty=True, compact otherwise)"""
+    if ORJSON_AVAILABLE:
+        try:
+            option = orjson.OPT_NON_STR_KEYS
+            if pretty:
+                option |= orjson.OPT_INDENT_2
+            return orjson.dumps(obj, default=default, option=option)
+        except TypeError:
+            pass  # Types orjson can't serialize - let the stdlib produce the usual error/output
+    if pretty:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=default).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':'), ensure_ascii=False, default=default).encode('utf-8')
+
+
+def dumps(obj, pretty=False, default=None):
+    """Encode obj as a JSON string"""
+    return dumps_bytes(obj, pretty, default).decode('utf-8')
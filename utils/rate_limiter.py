@@ -0,0 +1,44 @@
+"""
+Token Bucket Rate Limiter
+Caps request rate across worker threads or coroutines while still allowing a short burst
+"""
+import asyncio
+import threading
+import time
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, holding at most `capacity`"""
+    def __init__(self, rate=4.0, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else rate
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self):
+        """Take a token if one is available; returns 0, or the seconds until the next one"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return 0
+            return (1 - self._tokens) / self.rate
+
+    def acquire(self):
+        """Block until a token is available, then take it"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """acquire() for coroutines - waits without blocking the event loop"""
+        while True:
+            wait = self._take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
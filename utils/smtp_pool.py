@@ -0,0 +1,84 @@
+"""
+SMTP Connection Pool
+Keeps one authenticated SMTP connection open across sends instead of paying
+TCP + STARTTLS + AUTH for every message. Reconnects once if the server dropped us.
+"""
+import os
+import smtplib
+import threading
+
+# Errors that mean the connection is gone (not that the message was rejected)
+_DISCONNECT_ERRORS = (smtplib.SMTPServerDisconnected, smtplib.SMTPConnectError, ConnectionError)
+
+
+class SMTPPool:
+    """Lazily-opened, reusable SMTP connection (works for Zoho, Gmail, etc.)"""
+    def __init__(self, host=None, port=None, username=None, password=None, timeout=30):
+        self.host = host or os.getenv('SMTP_HOST', 'smtp.zoho.com')
+        self.port = int(port or os.getenv('SMTP_PORT', '587'))
+        self.username = username or os.getenv('SMTP_EMAIL')
+        self.password = password or os.getenv('SMTP_PASSWORD')
+        self.timeout = timeout
+        self._server = None
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _connect(self):
+        server = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            server.starttls()
+            server.login(self.username, self.password)
+        except Exception:
+            server.close()
+            raise
+        self._server = server
+
+    def _drop(self):
+        if self._server is not None:
+            try:
+                self._server.close()
+            except OSError:
+                pass
+            self._server = None
+
+    def _ensure_connected(self):
+        """Open the connection, or NOOP-check a reused one and reconnect if it was half-closed"""
+        if self._server is None:
+            self._connect()
+            return
+        try:
+            code, _ = self._server.noop()
+            if code == 250:
+                return
+        except _DISCONNECT_ERRORS:
+            pass
+        print("🔄 SMTP connection dropped - reconnecting")
+        self._drop()
+        self._connect()
+
+    def send(self, from_addr, to_addrs, message):
+        """sendmail over the shared connection, reconnecting once on a dropped connection"""
+        with self._lock:
+            self._ensure_connected()
+            try:
+                return self._server.sendmail(from_addr, to_addrs, message)
+            except _DISCONNECT_ERRORS:
+                self._drop()
+                self._connect()
+                return self._server.sendmail(from_addr, to_addrs, message)
+
+    def close(self):
+        """QUIT the connection if one is open"""
+        with self._lock:
+            if self._server is None:
+                return
+            try:
+                self._server.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._drop()
@@ -0,0 +1,223 @@
+"""
+SQLite Content Database
+Drop-in replacement for the JSON-file ContentDatabase backed by a single SQLite file (WAL mode)
+Saving a creator is one row upsert instead of a rewrite of the whole JSON document
+"""
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from typing import Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.content_database import ContentDatabase
+from utils import fast_json
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS creators (
+    username TEXT PRIMARY KEY,
+    profile TEXT NOT NULL,
+    posts TEXT NOT NULL,
+    post_count INTEGER NOT NULL DEFAULT 0,
+    updated_at INTEGER
+);
+CREATE TABLE IF NOT EXISTS metadata (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class SQLiteContentDatabase(ContentDatabase):
+    def __init__(self, db_file="cache/creators_content.sqlite",
+                 json_db_path="cache/creators_content_database.json"):
+        # db_path is what callers print as the database location
+        self.db_path = db_file
+        self.compressed_path = None
+        self._lock = threading.Lock()
+
+        dir_path = os.path.dirname(db_file)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        is_new = not os.path.exists(db_file)
+
+        # Shared by screening workers and the background content writer (guarded by self._lock)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+        if is_new:
+            self._set_metadata(created=datetime.now().isoformat())
+            # First run: carry over the existing JSON database
+            if json_db_path and (os.path.exists(json_db_path) or os.path.exists(f"{json_db_path}.zst")):
+                migrated = migrate_json_to_sqlite(json_db_path, db_file, conn=self.conn)
+                print(f"📦 Migrated {migrated} creators from {json_db_path}")
+
+    def _use_compressed(self) -> bool:
+        return False
+
+    def ensure_db_exists(self):
+        """Schema is created on connect"""
+        pass
+
+    def _set_metadata(self, **values):
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)", values.items()
+            )
+
+    def _metadata(self) -> Dict:
+        with self._lock:
+            metadata = dict(self.conn.execute("SELECT key, value FROM metadata").fetchall())
+            creator_count, total_posts = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(post_count), 0) FROM creators"
+            ).fetchone()
+        metadata["creator_count"] = creator_count
+        metadata["total_posts"] = total_posts
+        return metadata
+
+    @staticmethod
+    def _row(username: str, creator_content: Dict) -> tuple:
+        posts = creator_content.get("posts", [])
+        return (
+            username,
+            fast_json.dumps(creator_content.get("profile", {})),
+            fast_json.dumps(posts),
+            len(posts),
+            int(time.time())
+        )
+
+    def _upsert(self, rows: List[tuple], replace_all: bool = False):
+        with self._lock, self.conn:
+            if replace_all:
+                self.conn.execute("DELETE FROM creators")
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO creators (username, profile, posts, post_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self.conn.execute(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES ('last_updated', ?)",
+                (datetime.now().isoformat(),)
+            )
+
+    def load_database(self) -> Dict:
+        """The whole database in the JSON layout (for code that walks every creator)"""
+        with self._lock:
+            rows = self.conn.execute("SELECT username, profile, posts FROM creators").fetchall()
+        creators = {
+            username: {"profile": fast_json.loads(profile), "posts": fast_json.loads(posts)}
+            for username, profile, posts in rows
+        }
+        return {"metadata": self._metadata(), "creators": creators}
+
+    def save_database(self, db_data: Dict):
+        """Replace the whole database (prefer update_creator for single changes)"""
+        rows = [self._row(username, data) for username, data in db_data.get("creators", {}).items()]
+        self._upsert(rows, replace_all=True)
+
+    def save_many(self, items: List[tuple]):
+        """Upsert several creators in one transaction"""
+        if not items:
+            return
+        self._upsert([
+            self._row(username, self._creator_content(profile_data, top_posts_data))
+            for username, profile_data, top_posts_data in items
+        ])
+
+    def get_creator_content(self, username: str) -> Optional[Dict]:
+        """Get content data for a specific creator"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT profile, posts FROM creators WHERE username = ?", (username,)
+            ).fetchone()
+        if row is None:
+            return None
+        return {"profile": fast_json.loads(row[0]), "posts": fast_json.loads(row[1])}
+
+    def creator_exists(self, username: str) -> bool:
+        """Check if creator already has content data"""
+        with self._lock:
+            return self.conn.execute(
+                "SELECT 1 FROM creators WHERE username = ?", (username,)
+            ).fetchone() is not None
+
+    def update_creator_profile(self, username: str, profile_data: Dict):
+        """Update profile data for an existing creator"""
+        with self._lock, self.conn:
+            updated = self.conn.execute(
+                "UPDATE creators SET profile = ?, updated_at = ? WHERE username = ?",
+                (fast_json.dumps(profile_data), int(time.time()), username)
+            ).rowcount
+        return updated > 0
+
+    def update_creator(self, username: str, creator_data: Dict):
+        """Update a creator's data (adds the creator if missing)"""
+        self._upsert([self._row(username, creator_data)])
+        return True
+
+    def get_all_creators(self) -> Dict:
+        """Get all creators from the database"""
+        return self.load_database()["creators"]
+
+    def get_stats(self) -> Dict:
+        """Get database statistics"""
+        stats = self._metadata()
+        size = sum(
+            os.path.getsize(path) for path in (self.db_path, f"{self.db_path}-wal")
+            if os.path.exists(path)
+        )
+        stats["db_size_mb"] = size / (1024 * 1024)
+        return stats
+
+    def get_stats_cached(self) -> Dict:
+        """Counts come straight off the table - no sidecar needed"""
+        return self.get_stats()
+
+    def save(self, compressed: bool = False):
+        """Writes are committed immediately; checkpoint the WAL into the main file"""
+        with self._lock:
+            self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def migrate_json_to_sqlite(json_db_path="cache/creators_content_database.json",
+                           db_file="cache/creators_content.sqlite", conn=None) -> int:
+    """One-time bulk copy of the JSON content database into SQLite (single transaction). Returns creators copied"""
+    if not (os.path.exists(json_db_path) or os.path.exists(f"{json_db_path}.zst")):
+        return 0
+    db = ContentDatabase(json_db_path).load_database()
+    now = int(time.time())
+    rows = []
+    for username, data in db.get("creators", {}).items():
+        posts = data.get("posts", [])
+        rows.append((username, fast_json.dumps(data.get("profile", {})), fast_json.dumps(posts), len(posts), now))
+
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_file)
+        conn.executescript(SCHEMA)
+    try:
+        with conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO creators (username, profile, posts, post_count, updated_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            metadata = db.get("metadata", {})
+            conn.executemany(
+                "INSERT OR REPLACE INTO metadata (key, value) VALUES (?, ?)",
+                [(key, metadata[key]) for key in ("created", "last_updated") if metadata.get(key)]
+            )
+    finally:
+        if own_conn:
+            conn.close()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    count = migrate_json_to_sqlite()
+    print(f"✅ Migrated {count} creators to SQLite")
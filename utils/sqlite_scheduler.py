@@ -0,0 +1,378 @@
+"""
+SQLite Email Scheduler
+Drop-in replacement for the JSON-file EmailScheduler backed by a single SQLite file
+Pending emails are served from a partial index on (status, scheduled_ts)
+"""
+import os
+import socket
+import sqlite3
+import sys
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.email_scheduler import EmailScheduler, ScheduleStatus
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS scheduled_emails (
+    schedule_id TEXT PRIMARY KEY,
+    email_id TEXT,
+    username TEXT,
+    campaign TEXT,
+    to_email TEXT,
+    subject TEXT,
+    body TEXT,
+    scheduled_time TEXT,
+    scheduled_ts INTEGER,
+    attachment_path TEXT,
+    status TEXT NOT NULL DEFAULT 'pending',
+    created_at TEXT,
+    sent_at TEXT,
+    failed_at TEXT,
+    cancelled_at TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    last_error TEXT,
+    retry_scheduled INTEGER NOT NULL DEFAULT 0,
+    claimed_until INTEGER,
+    claimed_by TEXT
+);
+CREATE INDEX IF NOT EXISTS ix_pending ON scheduled_emails(status, scheduled_ts) WHERE status = 'pending';
+CREATE INDEX IF NOT EXISTS ix_campaign ON scheduled_emails(campaign, scheduled_ts);
+"""
+
+# A sender's claim on an email lapses after this long (covers a process dying mid-send)
+CLAIM_SECONDS = 300
+# Recorded with each claim so a stuck or duplicated sender can be traced to its host/process
+SENDER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+# Columns added after the first release, with their types (ALTERed into older databases)
+ADDED_COLUMNS = {
+    'claimed_until': 'INTEGER',
+    'claimed_by': 'TEXT',
+}
+
+COLUMNS = (
+    'schedule_id', 'email_id', 'username', 'campaign', 'to_email', 'subject', 'body',
+    'scheduled_time', 'scheduled_ts', 'attachment_path', 'status', 'created_at', 'sent_at',
+    'failed_at', 'cancelled_at', 'attempts', 'last_error', 'retry_scheduled'
+)
+
+
+class SQLiteEmailScheduler(EmailScheduler):
+    def __init__(self, db_file="cache/scheduler.sqlite", timezone="US/Pacific",
+                 json_schedule_file="cache/scheduled_emails.json"):
+        self.db_file = db_file
+        self.schedule_file = json_schedule_file
+        self.scheduler_thread = None
+        self.running = False
+        self._wake_event = threading.Event()
+        self.timezone = ZoneInfo(timezone)
+        self._lock = threading.Lock()
+
+        dir_path = os.path.dirname(db_file)
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+        is_new = not os.path.exists(db_file)
+
+        # Shared by the UI thread and the background scheduler thread (guarded by self._lock)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        # Databases created before these columns existed
+        existing = {col['name'] for col in self.conn.execute("PRAGMA table_info(scheduled_emails)")}
+        with self.conn:
+            for column, column_type in ADDED_COLUMNS.items():
+                if column not in existing:
+                    self.conn.execute(f"ALTER TABLE scheduled_emails ADD COLUMN {column} {column_type}")
+        self._release_orphaned_claims()
+
+        # First run: carry over the existing JSON schedule
+        if is_new and json_schedule_file and os.path.exists(json_schedule_file):
+            migrated = migrate_json_to_sqlite(json_schedule_file, db_file, timezone, conn=self.conn)
+            print(f"📦 Migrated {migrated} scheduled emails from {json_schedule_file}")
+
+    @property
+    def scheduled_emails(self) -> Dict:
+        """Full schedule keyed by schedule_id (for code written against the JSON store)"""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM scheduled_emails").fetchall()
+        return {row['schedule_id']: self._row_to_email(row) for row in rows}
+
+    def load_schedule(self) -> dict:
+        return self.scheduled_emails
+
+    def save_schedule(self):
+        """Writes are committed immediately - nothing to flush"""
+        pass
+
+    def save_pending_index(self):
+        """The partial index replaces the JSONL sidecar"""
+        pass
+
+    def _to_epoch(self, scheduled_time: datetime) -> int:
+        if scheduled_time.tzinfo is None:
+            scheduled_time = scheduled_time.replace(tzinfo=self.timezone)
+        return int(scheduled_time.timestamp())
+
+    def _row_to_email(self, row) -> Dict:
+        email = dict(row)
+        email['retry_scheduled'] = bool(email.get('retry_scheduled'))
+        return email
+
+    def _with_datetime(self, row) -> Dict:
+        email = self._row_to_email(row)
+        email['scheduled_datetime'] = datetime.fromtimestamp(email['scheduled_ts'], self.timezone)
+        return email
+
+    def _insert_row(self, email_id, username, campaign, to_email, subject, body,
+                    scheduled_time: datetime, attachment_path) -> tuple:
+        schedule_id = f"{campaign}_{username}_{scheduled_time.isoformat()}"
+        row = (
+            schedule_id, email_id, username, campaign, to_email, subject, body,
+            scheduled_time.isoformat(), self._to_epoch(scheduled_time), attachment_path,
+            ScheduleStatus.PENDING.value, datetime.now().isoformat(), None, None, None, 0, None, 0
+        )
+        return schedule_id, row
+
+    def schedule_email(self,
+                       email_id: str,
+                       username: str,
+                       campaign: str,
+                       to_email: str,
+                       subject: str,
+                       body: str,
+                       scheduled_time: datetime,
+                       attachment_path: str = None) -> str:
+        """Schedule an email to be sent at a specific time"""
+        schedule_id, row = self._insert_row(email_id, username, campaign, to_email, subject, body,
+                                            scheduled_time, attachment_path)
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"INSERT OR REPLACE INTO scheduled_emails ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                row
+            )
+        self._wake_event.set()
+        return schedule_id
+
+    def schedule_bulk_emails(self,
+                             emails: List[Dict],
+                             campaign: str,
+                             start_time: datetime,
+                             interval_minutes: int = 5) -> List[str]:
+        """Schedule multiple emails with intervals between them (single transaction)"""
+        schedule_ids = []
+        rows = []
+        current_time = start_time
+
+        for email in emails:
+            schedule_id, row = self._insert_row(
+                email.get('email_id', f"{campaign}_{email['username']}"),
+                email['username'], campaign, email['email'], email['subject'], email['body'],
+                current_time, email.get('attachment_path')
+            )
+            schedule_ids.append(schedule_id)
+            rows.append(row)
+            current_time = current_time + timedelta(minutes=interval_minutes)
+
+        with self._lock, self.conn:
+            self.conn.executemany(
+                f"INSERT OR REPLACE INTO scheduled_emails ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+        self._wake_event.set()
+        return schedule_ids
+
+    def cancel_scheduled_email(self, schedule_id: str) -> bool:
+        """Cancel a scheduled email"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE scheduled_emails SET status = ?, cancelled_at = ? WHERE schedule_id = ?",
+                (ScheduleStatus.CANCELLED.value, datetime.now().isoformat(), schedule_id)
+            )
+        return cursor.rowcount > 0
+
+    def get_pending_emails(self) -> List[Dict]:
+        """Get pending emails scheduled for the future or within the last hour"""
+        cutoff = int((datetime.now(self.timezone) - timedelta(hours=1)).timestamp())
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM scheduled_emails WHERE status = 'pending' AND scheduled_ts > ? "
+                "ORDER BY scheduled_ts",
+                (cutoff,)
+            ).fetchall()
+        return [self._with_datetime(row) for row in rows]
+
+    def next_due_timestamp(self) -> Optional[float]:
+        """Epoch seconds of the earliest pending email (may be in the past), or None if nothing is pending"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT MIN(scheduled_ts) FROM scheduled_emails WHERE status = 'pending'"
+            ).fetchone()
+        return row[0]
+
+    def get_emails_to_send_now(self, limit: int = 500) -> List[Dict]:
+        """Get emails that should be sent now (oldest first, at most limit per poll)"""
+        now_ts = int(datetime.now(self.timezone).timestamp())
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM scheduled_emails WHERE status = 'pending' AND scheduled_ts <= ? "
+                "AND (claimed_until IS NULL OR claimed_until < ?) "
+                "ORDER BY scheduled_ts LIMIT ?",
+                (now_ts, now_ts, limit)
+            ).fetchall()
+        return [self._row_to_email(row) for row in rows]
+
+    def claim_email(self, schedule_id: str) -> bool:
+        """
+        Atomically reserve a pending email for CLAIM_SECONDS so another process
+        polling the same database file can't send it too
+        """
+        now_ts = int(datetime.now(self.timezone).timestamp())
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "UPDATE scheduled_emails SET claimed_until = ?, claimed_by = ? "
+                "WHERE schedule_id = ? AND status = 'pending' "
+                "AND (claimed_until IS NULL OR claimed_until < ?)",
+                (now_ts + CLAIM_SECONDS, SENDER_ID, schedule_id, now_ts)
+            )
+        return cursor.rowcount == 1
+
+    def _release_orphaned_claims(self):
+        """Clear lapsed claims on still-pending emails (their sender died before finishing)"""
+        now_ts = int(datetime.now(self.timezone).timestamp())
+        with self._lock, self.conn:
+            rows = self.conn.execute(
+                "SELECT claimed_by FROM scheduled_emails "
+                "WHERE status = 'pending' AND claimed_until < ?",
+                (now_ts,)
+            ).fetchall()
+            if not rows:
+                return
+            self.conn.execute(
+                "UPDATE scheduled_emails SET claimed_until = NULL, claimed_by = NULL "
+                "WHERE status = 'pending' AND claimed_until < ?",
+                (now_ts,)
+            )
+        print(f"♻️ Released {len(rows)} orphaned send claims "
+              f"(from {', '.join(sorted({row['claimed_by'] or '?' for row in rows}))})")
+
+    def mark_as_sent(self, schedule_id: str):
+        """Mark email as sent"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE scheduled_emails SET status = ?, sent_at = ? WHERE schedule_id = ?",
+                (ScheduleStatus.SENT.value, datetime.now().isoformat(), schedule_id)
+            )
+
+    def mark_as_failed(self, schedule_id: str, error: str):
+        """Mark email as failed, rescheduling 30 minutes out if fewer than 3 attempts"""
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT attempts FROM scheduled_emails WHERE schedule_id = ?", (schedule_id,)
+            ).fetchone()
+            if row is None:
+                return
+
+            attempts = (row['attempts'] or 0) + 1
+            now = datetime.now().isoformat()
+            if attempts < 3:
+                new_time = datetime.now(self.timezone) + timedelta(minutes=30)
+                self.conn.execute(
+                    "UPDATE scheduled_emails SET status = ?, attempts = ?, last_error = ?, failed_at = ?, "
+                    "scheduled_time = ?, scheduled_ts = ?, retry_scheduled = 1, claimed_until = NULL, claimed_by = NULL "
+                    "WHERE schedule_id = ?",
+                    (ScheduleStatus.PENDING.value, attempts, error, now,
+                     new_time.isoformat(), int(new_time.timestamp()), schedule_id)
+                )
+            else:
+                self.conn.execute(
+                    "UPDATE scheduled_emails SET status = ?, attempts = ?, last_error = ?, failed_at = ? "
+                    "WHERE schedule_id = ?",
+                    (ScheduleStatus.FAILED.value, attempts, error, now, schedule_id)
+                )
+
+    def get_campaign_schedule(self, campaign: str) -> List[Dict]:
+        """Get all scheduled emails for a campaign"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT * FROM scheduled_emails WHERE campaign = ? ORDER BY scheduled_ts", (campaign,)
+            ).fetchall()
+        return [self._with_datetime(row) for row in rows]
+
+    def get_schedule_stats(self) -> Dict:
+        """Get statistics about scheduled emails"""
+        now_ts = int(datetime.now(self.timezone).timestamp())
+        with self._lock:
+            counts = dict(self.conn.execute(
+                "SELECT status, COUNT(*) FROM scheduled_emails GROUP BY status"
+            ).fetchall())
+            next_row = self.conn.execute(
+                "SELECT scheduled_ts FROM scheduled_emails WHERE status = 'pending' AND scheduled_ts > ? "
+                "ORDER BY scheduled_ts LIMIT 1",
+                (now_ts,)
+            ).fetchone()
+
+        return {
+            'total': sum(counts.values()),
+            'pending': counts.get(ScheduleStatus.PENDING.value, 0),
+            'sent': counts.get(ScheduleStatus.SENT.value, 0),
+            'failed': counts.get(ScheduleStatus.FAILED.value, 0),
+            'cancelled': counts.get(ScheduleStatus.CANCELLED.value, 0),
+            'next_scheduled': (
+                datetime.fromtimestamp(next_row[0], self.timezone).isoformat() if next_row else None
+            )
+        }
+
+
+def migrate_json_to_sqlite(json_file="cache/scheduled_emails.json", db_file="cache/scheduler.sqlite",
+                           timezone="US/Pacific", conn=None) -> int:
+    """One-time bulk copy of the JSON schedule into SQLite (single transaction). Returns rows copied"""
+    if not os.path.exists(json_file):
+        return 0
+    # Loading through EmailScheduler also folds in any pending transition log
+    scheduled = EmailScheduler(json_file, timezone).scheduled_emails
+
+    tz = ZoneInfo(timezone)
+    rows = []
+    for schedule_id, email in scheduled.items():
+        try:
+            scheduled_time = datetime.fromisoformat(email['scheduled_time'])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if scheduled_time.tzinfo is None:
+            scheduled_time = scheduled_time.replace(tzinfo=tz)
+        rows.append((
+            schedule_id, email.get('email_id'), email.get('username'), email.get('campaign'),
+            email.get('to_email'), email.get('subject'), email.get('body'),
+            email['scheduled_time'], int(scheduled_time.timestamp()), email.get('attachment_path'),
+            email.get('status', ScheduleStatus.PENDING.value), email.get('created_at'),
+            email.get('sent_at'), email.get('failed_at'), email.get('cancelled_at'),
+            email.get('attempts', 0), email.get('last_error'), int(bool(email.get('retry_scheduled')))
+        ))
+
+    own_conn = conn is None
+    if own_conn:
+        conn = sqlite3.connect(db_file)
+        conn.executescript(SCHEMA)
+    try:
+        with conn:
+            conn.executemany(
+                f"INSERT OR REPLACE INTO scheduled_emails ({', '.join(COLUMNS)}) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))})",
+                rows
+            )
+    finally:
+        if own_conn:
+            conn.close()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    count = migrate_json_to_sqlite()
+    print(f"✅ Migrated {count} scheduled emails to SQLite")
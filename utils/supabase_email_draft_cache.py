@@ -2,14 +2,45 @@
 Supabase Email Draft Cache Manager
 Persistent caching for generated email drafts using Supabase to avoid redundant LLM calls
 """
+import hashlib
 import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
 from typing import Dict, Optional, List
-from supabase import create_client, Client
+from supabase import Client
 from dotenv import load_dotenv
 
+from utils import fast_json
+from utils.circuit_breaker import backoff_delay
+from utils.supabase_singleton import get_supabase_client, reset_supabase_clients
+
 load_dotenv()
 
+# Upper bound on concurrent migration requests (Supabase starts refusing around ~15)
+MAX_MIGRATION_WORKERS = 8
+
+# Transient failures (network blips, 5xx, rate limits) are retried; constraint/RLS errors are not
+_TRANSIENT_ERROR_RE = re.compile(
+    r'time(?:d )?out|connection|disconnect|reset by peer|temporarily|rate limit|\b(?:429|5\d\d)\b',
+    re.IGNORECASE
+)
+UPSERT_MAX_ATTEMPTS = 6
+RECONNECT_AFTER_ATTEMPTS = 4  # rebuild the client (fresh HTTP pool) from this retry on
+
+# Usernames per .in_() lookup - keeps the PostgREST query string well under URL length limits
+HASH_LOOKUP_CHUNK = 500
+
+# Fields that make up a draft's content (generated_at/version change on every conversion)
+CONTENT_HASH_FIELDS = ('subject', 'body', 'email', 'personalization')
+
+
+def draft_content_hash(draft: Dict) -> str:
+    """Short BLAKE2b digest of a draft's content - equality check only, not security"""
+    payload = fast_json.dumps_bytes([draft.get(field) for field in CONTENT_HASH_FIELDS])
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
 
 class SupabaseEmailDraftCache:
     def __init__(self):
@@ -20,7 +51,7 @@ class SupabaseEmailDraftCache:
         if not self.supabase_url or not self.supabase_key:
             raise ValueError("SUPABASE_URL and SUPABASE_KEY must be set")
         
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
+        self.supabase: Client = get_supabase_client(self.supabase_url, self.supabase_key)
     
     def get_cache_key(self, username: str, campaign: str, template: str = None) -> str:
         """Generate unique cache key for a draft (for compatibility with file-based cache)"""
@@ -42,12 +73,24 @@ class SupabaseEmailDraftCache:
                 'generated_at': datetime.now().isoformat(),
                 'version': 1
             }
+            # Keep the hash describing what is stored, so bulk_migrate doesn't skip an edited draft
+            draft_data['content_hash'] = draft_content_hash(draft_data)
             
             # Use upsert to handle both insert and update cases
-            result = self.supabase.table('email_draft_cache').upsert(
-                draft_data,
-                on_conflict='username,campaign'
-            ).execute()
+            try:
+                result = self.supabase.table('email_draft_cache').upsert(
+                    draft_data,
+                    on_conflict='username,campaign'
+                ).execute()
+            except Exception as e:
+                if 'content_hash' not in str(e):
+                    raise
+                # add_content_hash_column.sql hasn't been run - save without the hash
+                draft_data.pop('content_hash')
+                result = self.supabase.table('email_draft_cache').upsert(
+                    draft_data,
+                    on_conflict='username,campaign'
+                ).execute()
             
             return result.data[0] if result.data else None
             
@@ -77,6 +120,28 @@ class SupabaseEmailDraftCache:
         draft = self.get_draft(username, campaign)
         return draft is not None
     
+    def get_drafts(self, usernames: List[str], campaign: str, columns: str = '*') -> Optional[Dict[str, Dict]]:
+        """
+        Drafts for many creators in one campaign, keyed by username (one request per HASH_LOOKUP_CHUNK usernames)
+        
+        Returns None if any lookup fails, so callers can't mistake an outage for missing drafts.
+        """
+        usernames = list(dict.fromkeys(usernames))
+        drafts = {}
+        try:
+            for i in range(0, len(usernames), HASH_LOOKUP_CHUNK):
+                result = self.supabase.table('email_draft_cache').select(columns).eq(
+                    'campaign', campaign
+                ).in_(
+                    'username', usernames[i:i + HASH_LOOKUP_CHUNK]
+                ).execute()
+                for draft in result.data or []:
+                    drafts[draft['username']] = draft
+        except Exception as e:
+            print(f"Error retrieving drafts from Supabase: {str(e)}")
+            return None
+        return drafts
+    
     def get_campaign_drafts(self, campaign: str) -> List[Dict]:
         """Get all drafts for a campaign"""
         try:
@@ -166,50 +231,205 @@ class SupabaseEmailDraftCache:
                 'cache_size_kb': 0
             }
     
-    def migrate_from_file_cache(self, file_cache_data: Dict):
-        """Migrate data from file-based cache to Supabase"""
-        migrated_count = 0
-        failed_count = 0
+    def _draft_row(self, cache_key: str, draft_data: Dict) -> Optional[Dict]:
+        """Supabase row for one file-cache entry, or None if the cache key is malformed"""
+        # Extract username and campaign from the cache key
+        # Format: "{campaign}_{username}"
+        parts = cache_key.split('_', 1)  # Split on first underscore only
+        if len(parts) != 2:
+            return None
+        campaign, username = parts
+        
+        row = {
+            'username': draft_data.get('username', username),
+            'campaign': draft_data.get('campaign', campaign),
+            'subject': draft_data.get('subject'),
+            'body': draft_data.get('body'),
+            'email': draft_data.get('email'),
+            'personalization': draft_data.get('personalization'),
+            'generated_at': datetime.now().isoformat(),
+            'version': 1
+        }
+        row['content_hash'] = draft_content_hash(row)
+        return row
+    
+    def _existing_hashes(self, rows: List[Dict]) -> Optional[Dict]:
+        """
+        content_hash already stored in Supabase for each (username, campaign) in rows
         
+        Returns None if the lookup fails (e.g. the content_hash column hasn't been added yet).
+        """
+        usernames_by_campaign = {}
+        for row in rows:
+            usernames_by_campaign.setdefault(row['campaign'], []).append(row['username'])
+        
+        existing = {}
         try:
-            for cache_key, draft_data in file_cache_data.items():
-                # Extract username and campaign from the cache key
-                # Format: "{campaign}_{username}"
-                if '_' in cache_key:
-                    parts = cache_key.split('_', 1)  # Split on first underscore only
-                    if len(parts) == 2:
-                        campaign, username = parts
-                        
-                        # Use the existing draft data
-                        success = self.save_draft(
-                            username=draft_data.get('username', username),
-                            campaign=draft_data.get('campaign', campaign),
-                            subject=draft_data.get('subject'),
-                            body=draft_data.get('body'),
-                            email=draft_data.get('email'),
-                            personalization=draft_data.get('personalization')
-                        )
-                        
-                        if success:
-                            migrated_count += 1
-                        else:
-                            failed_count += 1
-                    else:
-                        failed_count += 1
-                else:
+            for campaign, usernames in usernames_by_campaign.items():
+                for i in range(0, len(usernames), HASH_LOOKUP_CHUNK):
+                    result = self.supabase.table('email_draft_cache').select(
+                        'username,content_hash'
+                    ).eq(
+                        'campaign', campaign
+                    ).in_(
+                        'username', usernames[i:i + HASH_LOOKUP_CHUNK]
+                    ).execute()
+                    for stored in result.data or []:
+                        existing[(stored['username'], campaign)] = stored.get('content_hash')
+        except Exception as e:
+            print(f"⚠️ Couldn't read existing draft hashes ({str(e)}) - upserting every draft")
+            return None
+        return existing
+    
+    def upsert_batch(self, rows: List[Dict]) -> int:
+        """
+        Upsert a list of draft rows in one request. Returns the number of rows sent
+        
+        Transient errors are retried with jittered exponential backoff (reconnecting on
+        repeated failures); anything else is raised straight away.
+        """
+        for attempt in range(1, UPSERT_MAX_ATTEMPTS + 1):
+            try:
+                self.supabase.table('email_draft_cache').upsert(
+                    rows,
+                    on_conflict='username,campaign'
+                ).execute()
+                return len(rows)
+            except Exception as e:
+                if attempt == UPSERT_MAX_ATTEMPTS or not _TRANSIENT_ERROR_RE.search(str(e)):
+                    raise
+                delay = backoff_delay(attempt - 1, cap=10.0)
+                print(f"🔄 Upsert of {len(rows)} rows failed ({str(e)}) - retry {attempt}/{UPSERT_MAX_ATTEMPTS - 1} in {delay:.1f}s")
+                time.sleep(delay)
+                if attempt >= RECONNECT_AFTER_ATTEMPTS:
+                    # The pooled connection may be wedged - start over with a fresh client
+                    reset_supabase_clients()
+                    self.supabase = get_supabase_client(self.supabase_url, self.supabase_key)
+    
+    def bulk_migrate(self, file_cache_data: Dict, batch_size: int = 1000, max_workers: int = None) -> Dict:
+        """
+        Upsert file-cache drafts in batches of batch_size rows per request
+        
+        Drafts whose content_hash already matches Supabase are skipped, so re-running a
+        migration only writes the drafts that changed.
+        
+        Batches are sent concurrently (max_workers threads sharing the one Supabase client) to
+        overlap HTTPS round-trips. Transient errors are retried inside upsert_batch; a batch that
+        still fails is retried row by row so one bad draft doesn't sink the other rows.
+        
+        Returns:
+            dict: migrated / skipped / failed / total counts
+        """
+        rows = {}
+        failed_count = 0
+        for cache_key, draft_data in file_cache_data.items():
+            row = self._draft_row(cache_key, draft_data)
+            if row is None:
+                failed_count += 1
+                continue
+            # Postgres rejects an upsert that touches the same (username, campaign) twice - last one wins
+            rows[(row['username'], row['campaign'])] = row
+        rows = list(rows.values())
+        
+        # Only upsert the delta against what's already stored
+        skipped_count = 0
+        existing = self._existing_hashes(rows)
+        if existing is None:
+            for row in rows:
+                row.pop('content_hash', None)
+        elif existing:
+            changed = [row for row in rows
+                       if existing.get((row['username'], row['campaign'])) != row['content_hash']]
+            skipped_count = len(rows) - len(changed)
+            rows = changed
+            if skipped_count:
+                print(f"⏭️ Skipping {skipped_count} drafts already up to date in Supabase")
+        
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        
+        # Stay well under Supabase's concurrent connection budget
+        if max_workers is None:
+            max_workers = min(MAX_MIGRATION_WORKERS, (os.cpu_count() or 1) * 2)
+        
+        migrated_count = 0
+        failed_batches = []
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            future_to_batch = {executor.submit(self.upsert_batch, batch): n for n, batch in enumerate(batches, 1)}
+            for future in as_completed(future_to_batch):
+                n = future_to_batch[future]
+                try:
+                    migrated_count += future.result()
+                except Exception as e:
+                    print(f"⚠️ Batch {n} failed ({str(e)})")
+                    failed_batches.append(n)
+        
+        for n in sorted(failed_batches):
+            batch = batches[n - 1]
+            print(f"⚠️ Retrying batch {n} as {len(batch)} individual rows")
+            for row in batch:
+                try:
+                    migrated_count += self.upsert_batch([row])
+                except Exception:
                     failed_count += 1
-            
-            return {
-                'migrated': migrated_count,
-                'failed': failed_count,
-                'total': len(file_cache_data)
-            }
-            
+        
+        return {
+            'migrated': migrated_count,
+            'skipped': skipped_count,
+            'failed': failed_count,
+            'total': len(file_cache_data)
+        }
+    
+    def verify_migration(self, file_cache_data: Dict) -> Dict:
+        """
+        Compare file-cache drafts with what Supabase holds, fetched in bulk per campaign
+        
+        Returns:
+            Dict with 'matched', 'mismatched' and 'missing' counts, plus 'unverified' for
+            drafts whose campaign lookup failed
+        """
+        local = {}
+        for cache_key, draft_data in file_cache_data.items():
+            row = self._draft_row(cache_key, draft_data)
+            if row:
+                local[(row['username'], row['campaign'])] = row
+        
+        usernames_by_campaign = {}
+        for username, campaign in local:
+            usernames_by_campaign.setdefault(campaign, []).append(username)
+        
+        remote = {}
+        failed_campaigns = set()
+        for campaign, usernames in usernames_by_campaign.items():
+            drafts = self.get_drafts(usernames, campaign, columns='username,subject,body')
+            if drafts is None:
+                failed_campaigns.add(campaign)
+                continue
+            for username, draft in drafts.items():
+                remote[(username, campaign)] = draft
+        
+        result = {'matched': 0, 'mismatched': 0, 'missing': 0, 'unverified': 0}
+        for key, row in local.items():
+            stored = remote.get(key)
+            if key[1] in failed_campaigns:
+                result['unverified'] += 1
+            elif stored is None:
+                result['missing'] += 1
+            elif stored.get('subject') == row['subject'] and stored.get('body') == row['body']:
+                result['matched'] += 1
+            else:
+                result['mismatched'] += 1
+        return result
+    
+    def migrate_from_file_cache(self, file_cache_data: Dict):
+        """Migrate data from file-based cache to Supabase (batched upserts)"""
+        try:
+            return self.bulk_migrate(file_cache_data)
         except Exception as e:
             print(f"Error during migration: {str(e)}")
             return {
-                'migrated': migrated_count,
-                'failed': failed_count + len(file_cache_data) - migrated_count,
+                'migrated': 0,
+                'skipped': 0,
+                'failed': len(file_cache_data),
                 'total': len(file_cache_data)
             }
 
@@ -0,0 +1,61 @@
+"""
+Shared Supabase clients
+One client (and HTTP connection pool) per process instead of a new one per caller
+"""
+import functools
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from supabase import create_client, Client
+
+try:
+    import h2  # noqa: F401 - httpx needs it for http2=True
+    import httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+@functools.lru_cache(maxsize=4)
+def get_supabase_client(url: str, key: str) -> Client:
+    """Process-wide Supabase client for a (url, key) pair"""
+    return create_client(url, key)
+
+
+@functools.lru_cache(maxsize=1)
+def get_supabase_cache():
+    """Process-wide SupabaseEmailDraftCache"""
+    from utils.supabase_email_draft_cache import SupabaseEmailDraftCache
+    return SupabaseEmailDraftCache()
+
+
+def enable_http2(client: Client, max_connections: int = 16) -> bool:
+    """
+    Swap the client's PostgREST session for an HTTP/2 one so concurrent requests
+    (e.g. parallel migration batches) multiplex over a single TLS connection
+    
+    Returns False (client unchanged) if httpx[http2] isn't installed.
+    """
+    if not HTTP2_AVAILABLE:
+        print("⚠️ HTTP/2 unavailable (pip install 'httpx[http2]') - using HTTP/1.1")
+        return False
+    
+    postgrest = client.postgrest
+    old_session = postgrest.session
+    # Same session class (postgrest subclasses httpx.Client), base URL, auth headers and timeout
+    postgrest.session = type(old_session)(
+        base_url=old_session.base_url,
+        headers=old_session.headers,
+        timeout=old_session.timeout,
+        http2=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+    )
+    old_session.close()
+    return True
+
+
+def reset_supabase_clients():
+    """Drop the cached clients so the next call reconnects (e.g. after repeated HTTP errors)"""
+    get_supabase_client.cache_clear()
+    get_supabase_cache.cache_clear()
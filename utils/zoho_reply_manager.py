@@ -13,8 +13,8 @@ import json
 import re
 import anthropic
 from typing import List, Dict, Optional
-import smtplib
 from dotenv import load_dotenv
+from utils.smtp_pool import SMTPPool
 
 load_dotenv()
 
@@ -28,6 +28,8 @@ class ZohoReplyManager:
         self.smtp_host = os.getenv('SMTP_HOST', 'smtp.zoho.com')
         self.smtp_port = int(os.getenv('SMTP_PORT', '587'))
         self.replies_cache = "cache/email_replies.json"
+        # Connected on the first reply, then reused (NOOP-checked) for later ones
+        self.smtp_pool = SMTPPool(self.smtp_host, self.smtp_port, self.email_address, self.password)
         self.ensure_cache_exists()
     
     def ensure_cache_exists(self):
@@ -297,14 +299,8 @@ Generate ONLY the email body text, no subject line or signature.
             # Add body
             message.attach(MIMEText(body, 'plain'))
             
-            # Send via SMTP
-            server = smtplib.SMTP(self.smtp_host, self.smtp_port)
-            server.starttls()
-            server.login(self.email_address, self.password)
-            
-            text = message.as_string()
-            server.sendmail(self.email_address, to_email, text)
-            server.quit()
+            # Send via the shared SMTP connection
+            self.smtp_pool.send(self.email_address, to_email, message.as_string())
             
             return True, "Reply sent successfully"
             